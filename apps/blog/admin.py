@@ -3,7 +3,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
-from .models import Category, Tag, Article, Newsletter
+from .models import Category, Tag, Article, Newsletter, NewsletterCampaign
 
 
 @admin.register(Category)
@@ -94,4 +94,23 @@ class NewsletterAdmin(admin.ModelAdmin):
         emails = list(queryset.filter(is_active=True).values_list('email', flat=True))
         email_list = ', '.join(emails)
         self.message_user(request, f'Active emails ({len(emails)}): {email_list}')
-    export_emails.short_description = 'Export active email addresses'
\ No newline at end of file
+    export_emails.short_description = 'Export active email addresses'
+
+
+@admin.register(NewsletterCampaign)
+class NewsletterCampaignAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'sent_count', 'failed_count', 'started_at', 'completed_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'intro']
+    filter_horizontal = ['articles']
+    readonly_fields = ['status', 'last_subscriber_id', 'sent_count', 'failed_count', 'started_at', 'completed_at']
+    
+    fieldsets = (
+        ('Content', {
+            'fields': ('subject', 'intro', 'articles')
+        }),
+        ('Delivery', {
+            'fields': ('status', 'sent_count', 'failed_count', 'last_subscriber_id', 'started_at', 'completed_at'),
+            'description': 'Send with: python manage.py send_newsletter_campaign <id>'
+        }),
+    )
@@ -0,0 +1,284 @@
+"""
+Bulk sending for newsletter campaigns.
+
+A campaign's digest is rendered once, with a placeholder where the
+unsubscribe link goes, so each recipient only costs a string replace.
+Active subscribers are read in primary key batches (``WHERE id > last``)
+and sent over a small pool of SMTP connections, one per worker thread,
+that stay open for the whole campaign. A shared limiter caps the overall
+send rate.
+
+After each batch, ``last_subscriber_id``, the counters and the ids of
+subscribers whose message failed are saved. A send that is interrupted
+resumes after the last saved batch, so at most one batch is sent twice.
+Once every batch is done the failed subscribers are retried, and
+``CampaignSender.retry_failed`` retries them again for a campaign that was
+already sent.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Article, Newsletter, NewsletterCampaign
+
+logger = logging.getLogger(__name__)
+
+UNSUBSCRIBE_PLACEHOLDER = '__UNSUBSCRIBE_URL__'
+
+
+def render_campaign(campaign):
+    """
+    Render the campaign's HTML and text bodies with the unsubscribe
+    placeholder and store them on the campaign.
+    """
+    articles = list(campaign.articles.filter(is_published=True).order_by('-published_at'))
+    if not articles:
+        digest_size = getattr(settings, 'NEWSLETTER_DIGEST_SIZE', 5)
+        articles = list(
+            Article.objects.filter(
+                is_published=True,
+                published_at__lte=timezone.now()
+            ).order_by('-published_at')[:digest_size]
+        )
+
+    context = {
+        'campaign': campaign,
+        'articles': articles,
+        'site_url': settings.SITE_URL.rstrip('/'),
+        'unsubscribe_url': UNSUBSCRIBE_PLACEHOLDER,
+    }
+    campaign.html_body = render_to_string('blog/emails/newsletter_digest.html', context)
+    campaign.text_body = render_to_string('blog/emails/newsletter_digest.txt', context)
+    campaign.save(update_fields=['html_body', 'text_body', 'updated_at'])
+
+
+def unsubscribe_url(token):
+    return settings.SITE_URL.rstrip('/') + reverse('blog:newsletter_unsubscribe_token', args=[token])
+
+
+def iter_recipient_batches(campaign, batch_size):
+    """
+    Yield lists of ``(pk, email, unsubscribe_token)`` for active
+    subscribers after the campaign's checkpoint, in primary key order.
+    """
+    last_id = campaign.last_subscriber_id
+    while True:
+        batch = list(
+            Newsletter.objects.filter(
+                is_active=True,
+                pk__gt=last_id
+            ).order_by('pk').values_list('pk', 'email', 'unsubscribe_token')[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+
+class RateLimiter:
+    """
+    Spread sends evenly to at most ``rate`` per second across threads
+    (no limit when ``rate`` is 0).
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ConnectionPool:
+    """
+    One open email connection per sending thread, kept for the campaign.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def get(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = get_connection()
+            connection.open()
+            self.local.connection = connection
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+
+    def discard(self):
+        connection = getattr(self.local, 'connection', None)
+        self.local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def close_all(self):
+        with self.lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing email connection: {e}")
+
+
+class CampaignSender:
+    """
+    Send (or resume) one campaign.
+
+    ``connections`` is the number of SMTP connections used in parallel,
+    ``rate`` the overall cap in messages per second (0 for none) and
+    ``batch_size`` the number of subscribers between checkpoints.
+    """
+
+    def __init__(self, campaign, connections=None, rate=None, batch_size=None):
+        self.campaign = campaign
+        self.connections = connections or getattr(settings, 'NEWSLETTER_SEND_CONNECTIONS', 4)
+        self.rate = getattr(settings, 'NEWSLETTER_SEND_RATE', 10) if rate is None else rate
+        self.batch_size = batch_size or getattr(settings, 'NEWSLETTER_SEND_BATCH_SIZE', 200)
+        self.limiter = RateLimiter(self.rate)
+        self.pool = ConnectionPool()
+
+    def build_message(self, email, token, connection):
+        url = unsubscribe_url(token)
+        message = EmailMultiAlternatives(
+            subject=self.campaign.subject,
+            body=self.campaign.text_body.replace(UNSUBSCRIBE_PLACEHOLDER, url),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email],
+            headers={
+                'List-Unsubscribe': f'<{url}>',
+            },
+            connection=connection,
+        )
+        message.attach_alternative(self.campaign.html_body.replace(UNSUBSCRIBE_PLACEHOLDER, url), 'text/html')
+        return message
+
+    def send_one(self, recipient):
+        """
+        Send to one subscriber, reconnecting once if the connection drops.
+        """
+        _, email, token = recipient
+        for attempt in range(2):
+            self.limiter.wait()
+            try:
+                connection = self.pool.get()
+                return bool(self.build_message(email, token, connection).send())
+            except Exception as e:
+                self.pool.discard()
+                if attempt:
+                    logger.error(f"Failed to send campaign {self.campaign.pk} to {email}: {e}")
+        return False
+
+    def send_batch(self, executor, batch):
+        """
+        Send to a batch of recipients; returns ``(sent, failed_ids)``.
+        """
+        results = list(executor.map(self.send_one, batch))
+        failed_ids = [pk for (pk, _, _), sent in zip(batch, results) if not sent]
+        return len(batch) - len(failed_ids), failed_ids
+
+    def checkpoint(self, last_id, sent, failed_ids):
+        failed_subscriber_ids = self.campaign.failed_subscriber_ids + failed_ids
+        NewsletterCampaign.objects.filter(pk=self.campaign.pk).update(
+            last_subscriber_id=last_id,
+            sent_count=F('sent_count') + sent,
+            failed_count=F('failed_count') + len(failed_ids),
+            failed_subscriber_ids=failed_subscriber_ids,
+            updated_at=timezone.now()
+        )
+        self.campaign.last_subscriber_id = last_id
+        self.campaign.sent_count += sent
+        self.campaign.failed_count += len(failed_ids)
+        self.campaign.failed_subscriber_ids = failed_subscriber_ids
+
+    def _retry_failed(self, executor):
+        campaign = self.campaign
+        if not campaign.failed_subscriber_ids:
+            return
+        # Subscribers who have unsubscribed since are dropped from the list
+        recipients = list(
+            Newsletter.objects.filter(
+                pk__in=campaign.failed_subscriber_ids,
+                is_active=True
+            ).order_by('pk').values_list('pk', 'email', 'unsubscribe_token')
+        )
+        sent, failed_ids = self.send_batch(executor, recipients)
+        NewsletterCampaign.objects.filter(pk=campaign.pk).update(
+            sent_count=F('sent_count') + sent,
+            failed_count=len(failed_ids),
+            failed_subscriber_ids=failed_ids,
+            updated_at=timezone.now()
+        )
+        campaign.sent_count += sent
+        campaign.failed_count = len(failed_ids)
+        campaign.failed_subscriber_ids = failed_ids
+
+    def retry_failed(self):
+        """
+        Send once more to the subscribers whose message failed.
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix='newsletter-send') as executor:
+                self._retry_failed(executor)
+        finally:
+            self.pool.close_all()
+        return self.campaign
+
+    def send(self, progress=None):
+        """
+        Send to every remaining subscriber; ``progress(campaign)`` is
+        called after each checkpoint.
+        """
+        campaign = self.campaign
+        if campaign.status == NewsletterCampaign.STATUS_SENT:
+            return campaign
+
+        if campaign.status == NewsletterCampaign.STATUS_DRAFT or not campaign.html_body:
+            render_campaign(campaign)
+            campaign.status = NewsletterCampaign.STATUS_SENDING
+            campaign.started_at = timezone.now()
+            campaign.save(update_fields=['status', 'started_at', 'updated_at'])
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix='newsletter-send') as executor:
+                for batch in iter_recipient_batches(campaign, self.batch_size):
+                    sent, failed_ids = self.send_batch(executor, batch)
+                    self.checkpoint(batch[-1][0], sent, failed_ids)
+                    if progress:
+                        progress(campaign)
+                self._retry_failed(executor)
+        finally:
+            self.pool.close_all()
+
+        campaign.status = NewsletterCampaign.STATUS_SENT
+        campaign.completed_at = timezone.now()
+        campaign.save(update_fields=['status', 'completed_at', 'updated_at'])
+        logger.info(
+            f"Newsletter campaign {campaign.pk} sent to {campaign.sent_count} subscribers "
+            f"({campaign.failed_count} failed)"
+        )
+        return campaign
@@ -0,0 +1,99 @@
+"""
+Django management command to send a newsletter campaign.
+
+Sends the campaign to every active subscriber over a pool of SMTP
+connections at a capped rate, saving progress after each batch. Running it
+again for a campaign that was interrupted resumes where it stopped.
+Subscribers whose message failed are retried at the end; ``--retry-failed``
+retries them again for a campaign that was already sent.
+
+Usage:
+    python manage.py send_newsletter_campaign 3
+    python manage.py send_newsletter_campaign 3 --connections 8 --rate 50
+    python manage.py send_newsletter_campaign 3 --batch-size 500
+    python manage.py send_newsletter_campaign 3 --retry-failed
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog.campaigns import CampaignSender
+from apps.blog.models import Newsletter, NewsletterCampaign
+
+
+class Command(BaseCommand):
+    help = 'Send (or resume) a newsletter campaign to all active subscribers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('campaign_id', type=int, help='ID of the campaign to send')
+        parser.add_argument(
+            '--connections',
+            type=int,
+            help='SMTP connections used in parallel (default: NEWSLETTER_SEND_CONNECTIONS)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            help='Maximum messages per second, 0 for no limit (default: NEWSLETTER_SEND_RATE)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Subscribers sent between checkpoints (default: NEWSLETTER_SEND_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Retry the subscribers whose message failed in a campaign that was already sent'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            campaign = NewsletterCampaign.objects.get(pk=options['campaign_id'])
+        except NewsletterCampaign.DoesNotExist:
+            raise CommandError(f"Newsletter campaign {options['campaign_id']} does not exist")
+
+        sender = CampaignSender(
+            campaign,
+            connections=options['connections'],
+            rate=options['rate'],
+            batch_size=options['batch_size']
+        )
+
+        if options['retry_failed']:
+            if campaign.status != NewsletterCampaign.STATUS_SENT:
+                raise CommandError(
+                    f'Campaign "{campaign.subject}" has not been sent yet; failed subscribers are retried at the end'
+                )
+            self.stdout.write(
+                f'📨 Retrying {len(campaign.failed_subscriber_ids)} failed subscribers of "{campaign.subject}"...'
+            )
+            sender.retry_failed()
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Retry done: {campaign.sent_count} delivered, {campaign.failed_count} still failing'
+            ))
+            return
+
+        if campaign.status == NewsletterCampaign.STATUS_SENT:
+            raise CommandError(f'Campaign "{campaign.subject}" was already sent')
+
+        remaining = Newsletter.objects.filter(is_active=True, pk__gt=campaign.last_subscriber_id).count()
+        action = 'Resuming' if campaign.status == NewsletterCampaign.STATUS_SENDING else 'Sending'
+        self.stdout.write(f'📨 {action} "{campaign.subject}" to {remaining} subscribers...')
+
+        def progress(campaign):
+            self.stdout.write(
+                f'   {campaign.sent_count} sent, {campaign.failed_count} failed '
+                f'(checkpoint at subscriber {campaign.last_subscriber_id})'
+            )
+
+        try:
+            sender.send(progress=progress)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                f'Interrupted; run the command again to resume after subscriber {campaign.last_subscriber_id}'
+            ))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Campaign sent: {campaign.sent_count} delivered, {campaign.failed_count} failed'
+        ))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_newsletter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsletterCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.CharField(max_length=200)),
+                ('intro', models.TextField(blank=True, help_text='Opening paragraph shown above the articles')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('sending', 'Sending'), ('sent', 'Sent')], default='draft', max_length=10)),
+                ('html_body', models.TextField(blank=True, editable=False)),
+                ('text_body', models.TextField(blank=True, editable=False)),
+                ('last_subscriber_id', models.BigIntegerField(default=0, editable=False)),
+                ('sent_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('failed_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('started_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('articles', models.ManyToManyField(blank=True, help_text='Articles in the digest; the latest published articles when left empty', related_name='campaigns', to='blog.article')),
+            ],
+            options={
+                'verbose_name': 'Newsletter Campaign',
+                'verbose_name_plural': 'Newsletter Campaigns',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
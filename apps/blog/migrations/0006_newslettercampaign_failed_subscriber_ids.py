@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newslettercampaign',
+            name='failed_subscriber_ids',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
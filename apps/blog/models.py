@@ -83,6 +83,11 @@ class Article(TimeStampedModel, SEOModel, PublishableModel):
     is_featured = models.BooleanField(default=False)
     view_count = models.PositiveIntegerField(default=0)
     
+    # Filled in from the upload; see apps.core.images
+    featured_image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    featured_image_placeholder = models.TextField(blank=True, editable=False)
+    
     def __str__(self):
         return self.title
     
@@ -90,4 +95,72 @@ class Article(TimeStampedModel, SEOModel, PublishableModel):
         return reverse('blog:article_detail', kwargs={'slug': self.slug})
     
     class Meta:
-        ordering = ['-published_at', '-created_at']
\ No newline at end of file
+        ordering = ['-published_at', '-created_at']
+        # One per public access path. Boolean filters go in the condition (Django
+        # compiles is_published=True to a bare WHERE "is_published", which only a
+        # partial index can match), other equality filters first, then the ORDER BY
+        # columns so rows come out of the index already sorted, then published_at for
+        # the published_at <= now check when it isn't the sort key
+        indexes = [
+            # Blog listing, home page, newsletter digests: newest published first
+            models.Index(
+                fields=['-published_at', '-created_at'],
+                condition=models.Q(is_published=True), name='article_published_idx'
+            ),
+            # Featured articles on the blog pages
+            models.Index(
+                fields=['-published_at', '-created_at'],
+                condition=models.Q(is_published=True, is_featured=True), name='article_featured_idx'
+            ),
+            # Related articles and the ?category= filter
+            models.Index(
+                fields=['category', '-published_at', '-created_at'],
+                condition=models.Q(is_published=True), name='article_category_idx'
+            ),
+        ]
+
+
+class NewsletterCampaign(TimeStampedModel):
+    """
+    A digest email sent to every active newsletter subscriber.
+
+    The body is rendered once when sending starts. ``last_subscriber_id``
+    is the checkpoint: subscribers are sent to in primary key order, so an
+    interrupted send resumes after the last completed batch. Subscribers
+    whose message failed are kept in ``failed_subscriber_ids`` and retried
+    once every batch is done.
+    """
+    STATUS_DRAFT = 'draft'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_CHOICES = [
+        (STATUS_DRAFT, 'Draft'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+    ]
+    
+    subject = models.CharField(max_length=200)
+    intro = models.TextField(blank=True, help_text="Opening paragraph shown above the articles")
+    articles = models.ManyToManyField(
+        Article,
+        blank=True,
+        related_name='campaigns',
+        help_text="Articles in the digest; the latest published articles when left empty"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_DRAFT)
+    html_body = models.TextField(blank=True, editable=False)
+    text_body = models.TextField(blank=True, editable=False)
+    last_subscriber_id = models.BigIntegerField(default=0, editable=False)
+    sent_count = models.PositiveIntegerField(default=0, editable=False)
+    failed_count = models.PositiveIntegerField(default=0, editable=False)
+    failed_subscriber_ids = models.JSONField(default=list, blank=True, editable=False)
+    started_at = models.DateTimeField(blank=True, null=True, editable=False)
+    completed_at = models.DateTimeField(blank=True, null=True, editable=False)
+    
+    def __str__(self):
+        return f"{self.subject} ({self.get_status_display()})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Newsletter Campaign"
+        verbose_name_plural = "Newsletter Campaigns"
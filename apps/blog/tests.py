@@ -1,3 +1,44 @@
-from django.test import TestCase
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from .campaigns import CampaignSender
+from .models import Newsletter, NewsletterCampaign
+
+
+class FlakyEmailBackend(EmailBackend):
+    # Addresses the SMTP server rejects
+    failing = set()
+
+    def send_messages(self, messages):
+        if any(address in self.failing for message in messages for address in message.to):
+            raise ConnectionError('Recipient rejected')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='apps.blog.tests.FlakyEmailBackend', NEWSLETTER_SEND_RATE=0)
+class CampaignSenderTests(TestCase):
+    def setUp(self):
+        for i in range(5):
+            Newsletter.objects.create(email=f'reader{i}@example.com')
+        self.campaign = NewsletterCampaign.objects.create(subject='Digest')
+        self.addCleanup(FlakyEmailBackend.failing.clear)
+
+    def test_failed_subscribers_are_recorded_and_retried(self):
+        FlakyEmailBackend.failing.add('reader1@example.com')
+        CampaignSender(self.campaign, connections=1, batch_size=2).send()
+
+        campaign = NewsletterCampaign.objects.get(pk=self.campaign.pk)
+        failed = Newsletter.objects.get(email='reader1@example.com')
+        self.assertEqual(campaign.status, NewsletterCampaign.STATUS_SENT)
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (4, 1))
+        self.assertEqual(campaign.failed_subscriber_ids, [failed.pk])
+
+        FlakyEmailBackend.failing.clear()
+        mail.outbox = []
+        CampaignSender(campaign, connections=1).retry_failed()
+
+        campaign.refresh_from_db()
+        self.assertEqual((campaign.sent_count, campaign.failed_count), (5, 0))
+        self.assertEqual(campaign.failed_subscriber_ids, [])
+        self.assertEqual([message.to for message in mail.outbox], [['reader1@example.com']])
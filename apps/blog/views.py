@@ -2,16 +2,21 @@ from django.shortcuts import get_object_or_404, render, redirect
 from django.views.generic import DetailView, ListView, View
 from django.http import Http404, JsonResponse
 from django.core.exceptions import ValidationError
-from django.db.models import F, Q
 from django.utils import timezone
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.core.mail import send_mail
 from django.conf import settings
 import logging
 import json
 
+from apps.core.cache import get_detail_payload
+from apps.core.outbox import enqueue_email
+from apps.core.pagination import CursorPaginationMixin
+from apps.core.search import search_queryset
+from apps.core.timing import timed
+from apps.core.view_counters import record_view
+
 from .models import Article, Category, Tag, Newsletter
 from .forms import NewsletterSubscriptionForm, NewsletterUnsubscribeForm
 
@@ -95,19 +100,14 @@ class ArticleDetailView(DetailView):
         """
         context = super().get_context_data(**kwargs)
         article = self.object
+        payload = getattr(self, 'payload', None) or self.build_payload(article)
         
         try:
-            # Safely get related articles with null handling
-            context['related_articles'] = self.get_related_articles(article)
-            
-            # Safely get category information
-            context['category_info'] = self.get_category_info(article)
-            
-            # Safely get author information
-            context['author_info'] = self.get_author_info(article)
-            
-            # Safely get tags
-            context['article_tags'] = self.get_article_tags(article)
+            # Related content comes from the (possibly cached) detail payload
+            context['related_articles'] = payload['related_articles']
+            context['category_info'] = payload['category_info']
+            context['author_info'] = payload['author_info']
+            context['article_tags'] = payload['article_tags']
             
             # Add reading time with fallback
             context['reading_time'] = getattr(article, 'reading_time', 5)
@@ -121,6 +121,27 @@ class ArticleDetailView(DetailView):
             
         return context
     
+    def build_payload(self, article):
+        """
+        Build the cacheable detail payload: the article with its prefetched
+        relations plus evaluated related content.
+        """
+        with timed('article.related'):
+            related_articles = list(self.get_related_articles(article))
+        with timed('article.category'):
+            category_info = self.get_category_info(article)
+        with timed('article.author'):
+            author_info = self.get_author_info(article)
+        with timed('article.tags'):
+            article_tags = list(self.get_article_tags(article))
+        return {
+            'article': article,
+            'related_articles': related_articles,
+            'category_info': category_info,
+            'author_info': author_info,
+            'article_tags': article_tags,
+        }
+    
     def get_related_articles(self, article):
         """
         Get related articles with proper error handling.
@@ -196,19 +217,19 @@ class ArticleDetailView(DetailView):
     
     def get(self, request, *args, **kwargs):
         """
-        Override get method to increment view count safely.
+        Override get method to record the view without writing on the hot path.
         """
         try:
-            # Get the object first
-            self.object = self.get_object()
+            # Get the article and its related content, from cache when possible
+            slug = self.kwargs.get(self.slug_url_kwarg)
+            self.payload = get_detail_payload(
+                'article', slug, lambda: self.build_payload(self.get_object())
+            )
+            self.object = self.payload['article']
             
-            # Increment view count atomically
+            # Buffer the view; counts are written back in batches
             try:
-                Article.objects.filter(id=self.object.id).update(
-                    view_count=F('view_count') + 1
-                )
-                # Refresh the object to get updated view count
-                self.object.refresh_from_db(fields=['view_count'])
+                self.object.view_count = record_view(self.object, refresh=True)
             except Exception as e:
                 logger.warning(f"Failed to increment view count for article {self.object.id}: {e}")
                 # Continue without incrementing view count
@@ -226,7 +247,7 @@ class ArticleDetailView(DetailView):
             raise Http404("Article could not be displayed")
 
 
-class ArticleListView(ListView):
+class ArticleListView(CursorPaginationMixin, ListView):
     """
     Class-based view for listing blog articles with pagination and filtering.
     """
@@ -253,11 +274,7 @@ class ArticleListView(ListView):
         # Handle search
         search_query = self.request.GET.get('search', '').strip()
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(excerpt__icontains=search_query) |
-                Q(content__icontains=search_query)
-            )
+            queryset = search_queryset(queryset, search_query)
         
         # Handle category filter
         category_slug = self.request.GET.get('category', '').strip()
@@ -354,7 +371,7 @@ class NewsletterSubscriptionView(View):
                     try:
                         self.send_welcome_email(email)
                     except Exception as e:
-                        logger.error(f"Failed to send welcome email to {email}: {e}")
+                        logger.error(f"Failed to queue welcome email to {email}: {e}")
                 
                 if is_ajax:
                     return JsonResponse({
@@ -401,7 +418,7 @@ class NewsletterSubscriptionView(View):
     
     def send_welcome_email(self, email):
         """
-        Send welcome email to new subscriber
+        Queue welcome email to new subscriber
         """
         try:
             subject = "Welcome to Pulcova Newsletter!"
@@ -422,15 +439,14 @@ class NewsletterSubscriptionView(View):
             Pulcova Team
             """
             
-            send_mail(
+            enqueue_email(
                 subject=subject,
                 message=message,
                 from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@pulcova.com'),
                 recipient_list=[email],
-                fail_silently=False,
             )
         except Exception as e:
-            logger.error(f"Failed to send welcome email: {e}")
+            logger.error(f"Failed to queue welcome email: {e}")
             raise
 
 
@@ -494,7 +510,7 @@ class NewsletterUnsubscribeView(View):
     
     def send_unsubscribe_confirmation(self, email):
         """
-        Send unsubscribe confirmation email
+        Queue unsubscribe confirmation email
         """
         try:
             subject = "Unsubscribed from Pulcova Newsletter"
@@ -511,13 +527,12 @@ class NewsletterUnsubscribeView(View):
             Pulcova Team
             """
             
-            send_mail(
+            enqueue_email(
                 subject=subject,
                 message=message,
                 from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@pulcova.com'),
                 recipient_list=[email],
-                fail_silently=False,
             )
         except Exception as e:
-            logger.error(f"Failed to send unsubscribe confirmation: {e}")
+            logger.error(f"Failed to queue unsubscribe confirmation: {e}")
             raise
\ No newline at end of file
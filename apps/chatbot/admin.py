@@ -1,3 +1,28 @@
 from django.contrib import admin
+from django.utils.html import format_html_join
 
-# Register your models here.
+from .models import ChatLead, ChatConversation
+
+
+@admin.register(ChatLead)
+class ChatLeadAdmin(admin.ModelAdmin):
+    list_display = ['email', 'phone', 'is_converted', 'created_at', 'last_interaction']
+    list_filter = ['is_converted', 'created_at']
+    search_fields = ['email', 'phone', 'notes']
+
+
+@admin.register(ChatConversation)
+class ChatConversationAdmin(admin.ModelAdmin):
+    list_display = ['lead', 'message_count', 'created_at']
+    list_select_related = ['lead']
+    search_fields = ['lead__email']
+    readonly_fields = ['lead', 'message_count', 'created_at', 'transcript']
+    
+    def transcript(self, obj):
+        # Read the messages in chunks rather than loading one big list
+        return format_html_join(
+            '\n',
+            '<pre style="white-space: pre-wrap;">{}</pre>',
+            ((message,) for message in obj.iter_messages())
+        )
+    transcript.short_description = 'Messages'
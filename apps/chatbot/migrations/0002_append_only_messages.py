@@ -0,0 +1,65 @@
+# Generated by Django 5.2.2 on 2026-10-18 07:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_message_blobs(apps, schema_editor):
+    """
+    Move each conversation's ``messages`` list into ChatMessage rows.
+    """
+    ChatConversation = apps.get_model('chatbot', 'ChatConversation')
+    ChatMessage = apps.get_model('chatbot', 'ChatMessage')
+    
+    for pk in list(ChatConversation.objects.values_list('pk', flat=True)):
+        messages = ChatConversation.objects.values_list('messages', flat=True).get(pk=pk) or []
+        ChatMessage.objects.bulk_create([
+            ChatMessage(conversation_id=pk, sequence=sequence, data=message)
+            for sequence, message in enumerate(messages)
+        ], batch_size=500)
+        ChatConversation.objects.filter(pk=pk).update(message_count=len(messages))
+
+
+def join_message_rows(apps, schema_editor):
+    ChatConversation = apps.get_model('chatbot', 'ChatConversation')
+    ChatMessage = apps.get_model('chatbot', 'ChatMessage')
+    
+    for pk in list(ChatConversation.objects.values_list('pk', flat=True)):
+        messages = list(
+            ChatMessage.objects.filter(conversation_id=pk).order_by('sequence').values_list('data', flat=True)
+        )
+        ChatConversation.objects.filter(pk=pk).update(messages=messages)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatconversation',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of messages stored for the conversation'),
+        ),
+        migrations.CreateModel(
+            name='ChatMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField(help_text='Position of the message in the conversation, from 0')),
+                ('data', models.JSONField(default=dict, help_text='The message as sent by the chat widget')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_messages', to='chatbot.chatconversation')),
+            ],
+            options={
+                'ordering': ['conversation', 'sequence'],
+                'constraints': [models.UniqueConstraint(fields=('conversation', 'sequence'), name='chatbot_message_sequence_unique')],
+            },
+        ),
+        migrations.RunPython(split_message_blobs, join_message_rows),
+        migrations.RemoveField(
+            model_name='chatconversation',
+            name='messages',
+        ),
+    ]
@@ -1,4 +1,13 @@
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import models, transaction
+from django.db.models import F
+
+class MessageCountMismatch(Exception):
+    """
+    Raised when appending to a conversation that has a different number of
+    messages than the client expected; ``args[0]`` is the stored count.
+    """
+
 
 class ChatLead(models.Model):
     email = models.EmailField(unique=True)
@@ -17,11 +26,84 @@ class ChatLead(models.Model):
 
 class ChatConversation(models.Model):
     lead = models.ForeignKey(ChatLead, on_delete=models.CASCADE, related_name='conversations')
-    messages = models.JSONField(default=list, blank=True, help_text="List of messages in the conversation")
+    message_count = models.PositiveIntegerField(default=0, help_text="Number of messages stored for the conversation")
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"Conversation with {self.lead.email} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"Conversation with {self.lead.email} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+    
+    def append_messages(self, messages, expected_count=None):
+        """
+        Store ``messages`` after the ones already saved and return the new
+        message count. Only the new rows are written.
+        
+        With ``expected_count``, raises ``MessageCountMismatch`` (and
+        writes nothing) unless exactly that many messages were stored.
+        """
+        messages = list(messages)
+        if not messages and expected_count is None:
+            return self.message_count
+        
+        with transaction.atomic():
+            # Bump the counter first: the row lock (or SQLite's write lock)
+            # serialises concurrent appends to the same conversation
+            ChatConversation.objects.filter(pk=self.pk).update(
+                message_count=F('message_count') + len(messages)
+            )
+            message_count = ChatConversation.objects.values_list(
+                'message_count', flat=True
+            ).get(pk=self.pk)
+            start = message_count - len(messages)
+            if expected_count is not None and start != expected_count:
+                raise MessageCountMismatch(start)
+            ChatMessage.objects.bulk_create([
+                ChatMessage(conversation=self, sequence=start + offset, data=message)
+                for offset, message in enumerate(messages)
+            ])
+        self.message_count = message_count
+        return message_count
+    
+    async def aappend_messages(self, messages, expected_count=None):
+        """
+        Async version of ``append_messages``; the async ORM has no
+        transactions, so the append runs in a worker thread.
+        """
+        return await sync_to_async(self.append_messages)(messages, expected_count=expected_count)
+    
+    def iter_messages(self, after=0, chunk_size=200):
+        """
+        Yield the conversation's messages in order, starting after the
+        first ``after``, reading ``chunk_size`` rows at a time.
+        """
+        return self.chat_messages.filter(
+            sequence__gte=after
+        ).order_by('sequence').values_list('data', flat=True).iterator(chunk_size=chunk_size)
+    
+    @property
+    def messages(self):
+        """
+        The whole conversation as a list, as it used to be stored.
+        """
+        return list(self.iter_messages())
+
+
+class ChatMessage(models.Model):
+    """
+    One message of a conversation; conversations grow by appending rows.
+    """
+    conversation = models.ForeignKey(ChatConversation, on_delete=models.CASCADE, related_name='chat_messages')
+    sequence = models.PositiveIntegerField(help_text="Position of the message in the conversation, from 0")
+    data = models.JSONField(default=dict, help_text="The message as sent by the chat widget")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['conversation', 'sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['conversation', 'sequence'], name='chatbot_message_sequence_unique'),
+        ]
+    
+    def __str__(self):
+        return f"Message {self.sequence} of conversation {self.conversation_id}"
\ No newline at end of file
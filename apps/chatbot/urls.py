@@ -7,4 +7,5 @@ urlpatterns = [
     # API endpoints
     path('lead/', views.save_chatbot_lead, name='save_lead'),
     path('conversation/', views.save_conversation, name='save_conversation'),
+    path('conversation/messages/', views.append_messages, name='append_messages'),
 ]
\ No newline at end of file
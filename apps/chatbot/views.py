@@ -1,20 +1,24 @@
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
-from django.core.mail import send_mail
 from django.conf import settings
 import json
 from datetime import datetime
-from .models import ChatLead, ChatConversation
+from apps.core.outbox import aenqueue_email
+from .models import ChatLead, ChatConversation, MessageCountMismatch
+
+# The views are async so that, under ASGI (pulcova.asgi), a burst of chat
+# traffic waits on the database and the outbox without holding the sync
+# worker threads that render pages.
 
 @csrf_exempt
-def save_chatbot_lead(request):
+async def save_chatbot_lead(request):
     """Save chatbot lead information"""
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
             
             # Create or update lead
-            lead, created = ChatLead.objects.update_or_create(
+            lead, created = await ChatLead.objects.aupdate_or_create(
                 email=data['email'],
                 defaults={
                     'phone': data.get('phone', ''),
@@ -24,30 +28,31 @@ def save_chatbot_lead(request):
             )
             
             # Save conversation history
-            ChatConversation.objects.create(
-                lead=lead,
-                messages=data.get('conversation_history', [])
-            )
+            conversation = await ChatConversation.objects.acreate(lead=lead)
+            await conversation.aappend_messages(data.get('conversation_history', []))
             
-            # Send notification email to admin
-            send_mail(
+            # Queue notification email to admin; run_outbox sends it
+            await aenqueue_email(
                 f'New Chat Lead: {data["email"]}',
                 f'A new lead has started a conversation:\n\nEmail: {data["email"]}\nPhone: {data.get("phone", "Not provided")}\nPage: {data.get("page_url", "")}\n\nCheck the admin panel for full conversation.',
                 settings.DEFAULT_FROM_EMAIL,
                 [settings.DEFAULT_FROM_EMAIL],
-                fail_silently=True,
             )
             
-            # Send welcome email to lead
-            send_mail(
+            # Queue welcome email to lead
+            await aenqueue_email(
                 'Welcome to Pulcova - We\'ll be in touch!',
                 f'Hi there!\n\nThank you for reaching out to Pulcova. We\'ve received your message and someone from our team will get back to you within 24 hours.\n\nIn the meantime, feel free to:\n- Check out our portfolio: https://pulcova.store/portfolio\n- Read our blog: https://pulcova.store/blog\n- Learn about our services: https://pulcova.store/services\n\nBest regards,\nThe Pulcova Team',
                 settings.DEFAULT_FROM_EMAIL,
                 [data['email']],
-                fail_silently=True,
             )
             
-            return JsonResponse({'status': 'success', 'lead_id': lead.id})
+            return JsonResponse({
+                'status': 'success',
+                'lead_id': lead.id,
+                'conversation_id': conversation.id,
+                'message_count': conversation.message_count,
+            })
             
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
@@ -55,23 +60,57 @@ def save_chatbot_lead(request):
     return JsonResponse({'status': 'error', 'message': 'Method not allowed'}, status=405)
 
 @csrf_exempt
-def save_conversation(request):
-    """Save ongoing conversation"""
+async def save_conversation(request):
+    """Save ongoing conversation from the full message list"""
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
             
-            lead = ChatLead.objects.get(email=data['email'])
+            lead = await ChatLead.objects.aget(email=data['email'])
+            messages = data['messages']
             
-            # Update last conversation
-            conversation = ChatConversation.objects.filter(lead=lead).last()
+            # Append only what the latest conversation does not have yet
+            conversation = await ChatConversation.objects.filter(lead=lead).order_by('-created_at', '-pk').afirst()
             if conversation:
-                conversation.messages = data['messages']
-                conversation.save()
+                if len(messages) < conversation.message_count:
+                    # The widget started over; keep the old transcript
+                    conversation = await ChatConversation.objects.acreate(lead=lead)
+                await conversation.aappend_messages(messages[conversation.message_count:])
             
             return JsonResponse({'status': 'success'})
             
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
     
-    return JsonResponse({'status': 'error', 'message': 'Method not allowed'}, status=405)
\ No newline at end of file
+    return JsonResponse({'status': 'error', 'message': 'Method not allowed'}, status=405)
+
+@csrf_exempt
+async def append_messages(request):
+    """Append new messages to a conversation"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            
+            conversation = await ChatConversation.objects.aget(
+                pk=data['conversation_id'],
+                lead__email=data['email']
+            )
+            
+            # Clients may send how many messages they think are stored, so
+            # a retried request does not append the same messages twice
+            expected = data.get('message_count')
+            message_count = await conversation.aappend_messages(
+                data.get('messages', []),
+                expected_count=int(expected) if expected is not None else None
+            )
+            
+            return JsonResponse({'status': 'success', 'message_count': message_count})
+            
+        except MessageCountMismatch as e:
+            return JsonResponse({'status': 'conflict', 'message_count': e.args[0]}, status=409)
+        except ChatConversation.DoesNotExist:
+            return JsonResponse({'status': 'error', 'message': 'Conversation not found'}, status=404)
+        except Exception as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
+    
+    return JsonResponse({'status': 'error', 'message': 'Method not allowed'}, status=405)
@@ -0,0 +1,116 @@
+import zlib
+
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+
+from .models import EmailOutbox, RequestProfile
+from .profiling import build_flame_graph, parse_collapsed
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'recipient_list', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at']
+    list_filter = ['status', 'created_at', 'sent_at']
+    search_fields = ['subject', 'recipients', 'last_error']
+    readonly_fields = ['attempts', 'last_error', 'sent_at', 'created_at', 'updated_at']
+    date_hierarchy = 'created_at'
+    actions = ['retry_now']
+
+    def recipient_list(self, obj):
+        return ', '.join(obj.recipients)
+    recipient_list.short_description = 'Recipients'
+
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=EmailOutbox.STATUS_SENT).update(
+            status=EmailOutbox.STATUS_PENDING,
+            next_attempt_at=timezone.now(),
+            attempts=0
+        )
+        self.message_user(request, f'{updated} email(s) queued to send again.')
+    retry_now.short_description = 'Send selected emails again'
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Stored request profiles; opening one shows its flame graph.
+    """
+    list_display = ['path', 'view_name', 'mode', 'duration_display', 'queries', 'status_code', 'requested_by', 'created_at']
+    list_filter = ['mode', 'view_name', 'created_at']
+    search_fields = ['path', 'view_name']
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def duration_display(self, obj):
+        return f'{obj.duration_ms:.0f} ms'
+    duration_display.short_description = 'Duration'
+    duration_display.admin_order_field = 'duration_ms'
+
+    def get_urls(self):
+        urls = [
+            path('<int:pk>/collapsed/', self.admin_site.admin_view(self.collapsed_view), name='core_requestprofile_collapsed'),
+        ]
+        return urls + super().get_urls()
+
+    def read_stacks(self, profile):
+        with profile.stacks.open('rb') as f:
+            return f.read().decode()
+
+    def collapsed_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            return HttpResponse(status=403)
+        response = HttpResponse(self.read_stacks(profile), content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile.pk}.collapsed"'
+        return response
+
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        profile = get_object_or_404(RequestProfile, pk=object_id)
+        if not self.has_view_permission(request, profile):
+            return HttpResponse(status=403)
+
+        try:
+            stacks = parse_collapsed(self.read_stacks(profile))
+        except OSError as e:
+            self.message_user(request, f'Could not read the profile file: {e}', level='error')
+            stacks = {}
+        rows, total = build_flame_graph(stacks)
+
+        unit = profile.weight_unit
+        flame_rows = []
+        for row in rows:
+            boxes = []
+            for start, width, name, weight in row:
+                amount = f'{weight / 1000:.1f} ms' if unit == 'µs' else f'{weight} {unit}'
+                boxes.append({
+                    'left': f'{start * 100:.4f}',
+                    'width': f'{width * 100:.4f}',
+                    'name': name,
+                    'title': f'{name}\n{amount} ({width:.1%})',
+                    # Warm colours, stable per frame
+                    'hue': zlib.crc32(name.encode()) % 60,
+                })
+            flame_rows.append(boxes)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': str(profile),
+            'opts': self.model._meta,
+            'original': profile,
+            'profile': profile,
+            'flame_rows': list(reversed(flame_rows)),
+            'total': total,
+            'download_url': reverse('admin:core_requestprofile_collapsed', args=[profile.pk]),
+            'has_view_permission': True,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, 'admin/core/requestprofile/flame_graph.html', context)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
+
+        from django.conf import settings
+        if getattr(settings, 'SLOW_QUERY_LOG_ENABLED', True):
+            from .slow_queries import install_slow_query_log
+            install_slow_query_log()
@@ -0,0 +1,102 @@
+"""
+Object-level cache for detail page payloads.
+
+Detail views store their fully hydrated object graph (the object itself
+with prefetched relations, plus evaluated related-content lists) under a
+key built from the content kind, the slug and a per-kind version number.
+Saving or deleting any model that appears in a payload bumps the version
+of the affected kinds (see ``apps.core.signals``), which orphans every
+old entry at once without having to know which slugs were cached.
+
+Related-content lists only hold objects that are already live, so a
+payload also expires when the next scheduled object of its kind's
+collections is due to go live.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import inc
+from .page_cache import scheduled_timeout
+
+logger = logging.getLogger(__name__)
+
+# Payload kind -> collections its related-content lists are drawn from
+DETAIL_COLLECTIONS = {
+    'article': ('blog.article',),
+    'project': ('portfolio.project',),
+    'solution': ('solutions.solution',),
+}
+
+
+def _version_key(kind):
+    return f'detail:version:{kind}'
+
+
+def get_version(kind):
+    """
+    Return the current payload version for ``kind``.
+
+    Versions start from a timestamp rather than 1 so that a version key
+    evicted from the cache never comes back with a number that older,
+    still-cached payloads were stored under.
+    """
+    return cache.get_or_set(_version_key(kind), time.time_ns, timeout=None)
+
+
+def bump_version(*kinds):
+    """
+    Invalidate every cached payload of the given kinds.
+    """
+    for kind in kinds:
+        try:
+            cache.incr(_version_key(kind))
+        except ValueError:
+            cache.set(_version_key(kind), time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.error(f"Failed to bump detail cache version for '{kind}': {e}")
+
+
+def payload_key(kind, slug):
+    return f'detail:{kind}:{slug}:v{get_version(kind)}'
+
+
+def payload_timeout(kind):
+    """
+    ``DETAIL_CACHE_TIMEOUT``, cut short at the next scheduled publication
+    in the collections ``kind`` draws related content from.
+    """
+    return scheduled_timeout(
+        getattr(settings, 'DETAIL_CACHE_TIMEOUT', 3600), DETAIL_COLLECTIONS.get(kind, ())
+    )
+
+
+def get_detail_payload(kind, slug, builder):
+    """
+    Return the cached payload for ``kind``/``slug``, building it on a miss.
+
+    ``builder`` is called with no arguments and may raise (e.g. ``Http404``);
+    nothing is cached in that case. Cache errors are logged and the payload
+    is built directly so a broken cache backend never takes pages down.
+    """
+    try:
+        key = payload_key(kind, slug)
+        payload = cache.get(key)
+    except Exception as e:
+        logger.error(f"Detail cache lookup failed for {kind} '{slug}': {e}")
+        return builder()
+
+    if payload is not None:
+        inc('pulcova_cache_requests_total', cache='detail', result='hit')
+        return payload
+
+    inc('pulcova_cache_requests_total', cache='detail', result='miss')
+    payload = builder()
+    try:
+        cache.set(key, payload, timeout=payload_timeout(kind))
+    except Exception as e:
+        logger.error(f"Failed to cache detail payload for {kind} '{slug}': {e}")
+    return payload
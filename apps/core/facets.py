@@ -0,0 +1,170 @@
+"""
+In-memory bitmap facet engine for the public listings.
+
+A ``FacetIndex`` loads every published row of one listing once and keeps,
+for each facet value (project type, technology, year, ...), a bitset of
+the rows that carry it. Python integers serve as bitsets: bit ``i`` is
+set when row ``i`` has the value, so filtering is a chain of ``&`` and
+counting is ``int.bit_count()``.
+
+``FacetIndex.query`` answers a whole filter panel at once: for every
+facet it intersects the other active filters (so counts reflect what a
+click would return) and counts each value against that mask, without
+issuing any SQL. Indexes are rebuilt lazily when content changes (see
+``invalidate_facets``) or when a scheduled item's publish time passes.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(name):
+    return f'facets:version:{name}'
+
+
+def invalidate_facets(*names):
+    """
+    Mark the named indexes stale in every process.
+    """
+    for name in names:
+        try:
+            cache.set(_version_key(name), time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.error(f"Failed to invalidate facet index '{name}': {e}")
+
+
+class FacetSnapshot:
+    """
+    Immutable bitmap view of one listing at build time.
+    """
+
+    def __init__(self, rows, labels, version, valid_until=None):
+        self.version = version
+        self.valid_until = valid_until
+        self.labels = labels
+        self.pks = []
+        self.positions = {}
+        self.bitsets = defaultdict(lambda: defaultdict(int))
+
+        for position, (pk, facets) in enumerate(rows):
+            self.pks.append(pk)
+            self.positions[pk] = position
+            bit = 1 << position
+            for facet, values in facets.items():
+                for value in values:
+                    self.bitsets[facet][value] |= bit
+
+        self.all = (1 << len(self.pks)) - 1
+
+    def mask_for_pks(self, pks):
+        """
+        Build a mask from primary keys, e.g. the result of a search.
+        """
+        mask = 0
+        for pk in pks:
+            position = self.positions.get(pk)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def mask_for(self, facet, values):
+        """
+        Rows carrying any of ``values`` for ``facet``.
+        """
+        bitsets = self.bitsets.get(facet, {})
+        mask = 0
+        for value in values:
+            mask |= bitsets.get(value, 0)
+        return mask
+
+    def count(self, mask):
+        return mask.bit_count()
+
+    def pks_for(self, mask):
+        return [pk for position, pk in enumerate(self.pks) if mask >> position & 1]
+
+    def values(self, facet):
+        return list(self.bitsets.get(facet, {}).keys())
+
+    def query(self, filters=None, base=None):
+        """
+        Apply ``filters`` (facet -> iterable of accepted values) on top of
+        ``base`` and return ``(mask, counts)``. Only pass active filters:
+        a facet mapped to no values matches nothing.
+
+        ``mask`` selects the rows matching every filter. ``counts`` maps
+        each facet to ``{value: count}`` where the count ignores that
+        facet's own filter but honours all the others.
+        """
+        base = self.all if base is None else base & self.all
+        filter_masks = {
+            facet: self.mask_for(facet, values)
+            for facet, values in (filters or {}).items()
+        }
+
+        mask = base
+        for facet_mask in filter_masks.values():
+            mask &= facet_mask
+
+        counts = {}
+        for facet, bitsets in self.bitsets.items():
+            facet_base = base
+            for other, facet_mask in filter_masks.items():
+                if other != facet:
+                    facet_base &= facet_mask
+            counts[facet] = {value: (facet_base & bits).bit_count() for value, bits in bitsets.items()}
+        return mask, counts
+
+
+class FacetIndex:
+    """
+    Lazily built, self-refreshing facet index for one listing.
+
+    ``loader`` returns ``(rows, labels, valid_until)``: ``rows`` is a list
+    of ``(pk, {facet: [values]})`` in listing order, ``labels`` maps facet
+    values to display data, and ``valid_until`` is the next time the set
+    of visible rows changes on its own (a scheduled publish date) or None.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def _current_version(self):
+        try:
+            return cache.get_or_set(_version_key(self.name), time.time_ns, timeout=None)
+        except Exception as e:
+            logger.error(f"Failed to read facet index version for '{self.name}': {e}")
+            return None
+
+    def _is_fresh(self, snapshot, version):
+        if snapshot is None or snapshot.version != version:
+            return False
+        return snapshot.valid_until is None or timezone.now() < snapshot.valid_until
+
+    def get(self):
+        """
+        Return a current snapshot, rebuilding it if content has changed.
+        """
+        version = self._current_version()
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, version):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot, version):
+                return snapshot
+            rows, labels, valid_until = self.loader()
+            snapshot = FacetSnapshot(rows, labels, version, valid_until)
+            self._snapshot = snapshot
+            return snapshot
@@ -0,0 +1,323 @@
+"""
+Resized WebP/JPEG variants of uploaded images.
+
+For every image in ``IMAGE_FIELDS``, Pillow writes a copy at each width in
+``IMAGE_VARIANT_WIDTHS`` narrower than the original (plus the original
+width when it is not larger than the widest variant). Each width is written
+once as WebP and once as JPEG (PNG when the image has transparency).
+Variants live next to the upload::
+
+    projects/featured/shot.png
+    projects/featured/variants/shot.png/640w.webp
+    projects/featured/variants/shot.png/640w.png
+    projects/featured/variants/shot.png/manifest.json
+
+The manifest records the source hash, the original size and the variants.
+It is cached so ``{% responsive_image %}`` can build a ``srcset`` without
+touching storage.
+
+Models that declare ``<field>_width``, ``<field>_height`` and
+``<field>_placeholder`` next to an image field get them filled when a new
+file is uploaded (see ``record_image_metadata`` in ``apps.core.signals``).
+The placeholder is a tiny blurred WebP data URI shown while the image
+loads.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import posixpath
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+# Model label -> image fields that get variants
+IMAGE_FIELDS = {
+    'blog.article': ('featured_image', 'og_image'),
+    'portfolio.project': ('featured_image', 'og_image'),
+    'portfolio.galleryimage': ('image',),
+    'portfolio.technology': ('icon',),
+    'services.service': ('icon',),
+    'solutions.solution': ('og_image',),
+}
+
+VARIANTS_DIR = 'variants'
+MANIFEST_NAME = 'manifest.json'
+
+PLACEHOLDER_WIDTH = 16
+
+# Cached "no manifest" marker, kept briefly so new uploads show up soon
+MISSING = 'missing'
+MISSING_TIMEOUT = 300
+
+
+def variant_widths():
+    return sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', [320, 640, 960, 1280, 1920]))
+
+
+def variants_dir(name):
+    directory, filename = posixpath.split(name)
+    return posixpath.join(directory, VARIANTS_DIR, filename)
+
+
+def manifest_path(name):
+    return posixpath.join(variants_dir(name), MANIFEST_NAME)
+
+
+def _manifest_cache_key(name):
+    return f"images:manifest:{hashlib.md5(name.encode('utf-8')).hexdigest()}"
+
+
+def source_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def target_widths(width):
+    """
+    Widths to render for an image ``width`` pixels wide; never upscales.
+    """
+    widths = variant_widths()
+    targets = [w for w in widths if w < width]
+    if not targets or width <= widths[-1]:
+        targets.append(width)
+    return targets
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def _encode(image, fmt, quality):
+    buffer = io.BytesIO()
+    if fmt == 'jpeg':
+        image.convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+    elif fmt == 'png':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        mode = 'RGBA' if _has_alpha(image) else 'RGB'
+        image.convert(mode).save(buffer, 'WEBP', quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def placeholder_data_uri(image):
+    """
+    A blurred ``PLACEHOLDER_WIDTH`` pixel WebP of ``image`` as a data URI,
+    or '' for transparent images (the placeholder would show through).
+    """
+    from PIL import Image, ImageFilter
+
+    if _has_alpha(image):
+        return ''
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    thumbnail = image.convert('RGB').resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BOX)
+    buffer = io.BytesIO()
+    thumbnail.filter(ImageFilter.GaussianBlur(1)).save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def image_metadata(file):
+    """
+    ``{'width', 'height', 'placeholder'}`` of an image file object.
+    """
+    from PIL import Image, ImageOps
+
+    file.seek(0)
+    with Image.open(file) as original:
+        image = ImageOps.exif_transpose(original)
+        metadata = {
+            'width': image.width,
+            'height': image.height,
+            'placeholder': placeholder_data_uri(image),
+        }
+    file.seek(0)
+    return metadata
+
+
+def has_metadata_fields(model, field):
+    return hasattr(model, f'{field}_placeholder')
+
+
+def set_metadata(instance, field, metadata):
+    """
+    Copy ``metadata`` (or blanks for None) onto the instance's
+    ``<field>_width/_height/_placeholder`` attributes.
+    """
+    metadata = metadata or {}
+    setattr(instance, f'{field}_width', metadata.get('width'))
+    setattr(instance, f'{field}_height', metadata.get('height'))
+    setattr(instance, f'{field}_placeholder', metadata.get('placeholder', ''))
+
+
+def save_metadata(model, field, name, manifest):
+    """
+    Store the size and placeholder from ``manifest`` on every row whose
+    ``field`` is ``name``; returns the number of rows updated.
+    """
+    return model._default_manager.filter(**{field: name}).update(**{
+        f'{field}_width': manifest['width'],
+        f'{field}_height': manifest['height'],
+        f'{field}_placeholder': manifest.get('placeholder', ''),
+    })
+
+
+def _write(storage, path, content):
+    # Overwrite in place; storage.save() would pick a new name instead
+    if storage.exists(path):
+        storage.delete(path)
+    return storage.save(path, ContentFile(content))
+
+
+def build_variants(name, data, storage=None):
+    """
+    Render and store the variants of image ``name`` (whose bytes are
+    ``data``) and return its manifest.
+    """
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    quality = getattr(settings, 'IMAGE_VARIANT_QUALITY', 80)
+
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+        fallback = 'png' if _has_alpha(image) else 'jpeg'
+
+        variants = {'webp': [], fallback: []}
+        directory = variants_dir(name)
+        for width in target_widths(image.width):
+            if width == image.width:
+                resized = image
+            else:
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            for fmt in variants:
+                extension = 'jpg' if fmt == 'jpeg' else fmt
+                path = _write(storage, posixpath.join(directory, f'{width}w.{extension}'), _encode(resized, fmt, quality))
+                variants[fmt].append([width, path])
+
+        manifest = {
+            'source': name,
+            'hash': source_hash(data),
+            'width': image.width,
+            'height': image.height,
+            'fallback': fallback,
+            'placeholder': placeholder_data_uri(image),
+            'variants': variants,
+        }
+
+    _write(storage, manifest_path(name), json.dumps(manifest).encode('utf-8'))
+    cache.set(_manifest_cache_key(name), manifest, timeout=None)
+    return manifest
+
+
+def generate_variants(name, storage=None):
+    """
+    Read image ``name`` from storage and build its variants.
+    """
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as f:
+        data = f.read()
+    return build_variants(name, data, storage)
+
+
+def read_manifest(name, storage=None):
+    """
+    The stored manifest for image ``name``, or None; skips the cache.
+    """
+    storage = storage or default_storage
+    path = manifest_path(name)
+    try:
+        if not storage.exists(path):
+            return None
+        with storage.open(path, 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read image manifest {path}: {e}")
+        return None
+
+
+def get_manifest(name):
+    """
+    The manifest for image ``name``, or None if it has no variants yet.
+    """
+    if not name:
+        return None
+    key = _manifest_cache_key(name)
+    manifest = cache.get(key)
+    if manifest is None:
+        manifest = read_manifest(name)
+        if manifest is None:
+            cache.set(key, MISSING, timeout=MISSING_TIMEOUT)
+        else:
+            cache.set(key, manifest, timeout=None)
+    return None if manifest == MISSING else manifest
+
+
+def ensure_variants(name):
+    """
+    Build variants for image ``name`` unless it already has them.
+    """
+    if not name or get_manifest(name) is not None:
+        return None
+    try:
+        return generate_variants(name)
+    except Exception as e:
+        logger.error(f"Failed to generate image variants for {name}: {e}")
+        return None
+
+
+def image_names(labels=None):
+    """
+    Map the stored file name of every image in ``IMAGE_FIELDS`` (or the
+    given model labels) to the ``(label, field)`` pairs that use it.
+    """
+    from django.apps import apps
+
+    names = {}
+    for label in labels or IMAGE_FIELDS:
+        model = apps.get_model(label)
+        for field in IMAGE_FIELDS[label]:
+            stored = model._default_manager.exclude(**{field: ''}).exclude(
+                **{f'{field}__isnull': True}
+            ).values_list(field, flat=True).distinct()
+            for name in stored:
+                names.setdefault(name, []).append((label, field))
+    return dict(sorted(names.items()))
+
+
+def refresh_variants(name, force=False):
+    """
+    Build the variants of image ``name`` unless its stored manifest was
+    made from the same bytes. Safe to run in a worker process.
+
+    Returns ``(status, source_bytes, manifest)`` where status is
+    'generated', 'skipped' or 'missing'.
+    """
+    storage = default_storage
+    if not storage.exists(name):
+        return 'missing', 0, None
+    with storage.open(name, 'rb') as f:
+        data = f.read()
+
+    if not force:
+        manifest = read_manifest(name, storage)
+        # Manifests from before placeholders were added are rebuilt
+        if manifest is not None and 'placeholder' in manifest and manifest.get('hash') == source_hash(data):
+            return 'skipped', len(data), manifest
+
+    return 'generated', len(data), build_variants(name, data, storage)
+
+
+def cache_manifest(name, manifest):
+    """
+    Cache a manifest built elsewhere (e.g. in a worker process).
+    """
+    cache.set(_manifest_cache_key(name), manifest if manifest is not None else MISSING,
+              timeout=None if manifest is not None else MISSING_TIMEOUT)
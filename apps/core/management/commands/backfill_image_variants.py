@@ -0,0 +1,104 @@
+"""
+Django management command to build responsive variants for existing images.
+
+Walks every image field in ``apps.core.images.IMAGE_FIELDS`` (blog,
+portfolio, services and the SEO ``og_image`` fields) and renders missing
+or outdated variants in a pool of worker processes. Images whose stored
+manifest was built from the same bytes are skipped, so re-running after
+an interrupted deploy only does the remaining work. Width, height and
+placeholder columns are filled in from the manifests as well.
+
+Usage:
+    python manage.py backfill_image_variants
+    python manage.py backfill_image_variants --workers 8
+    python manage.py backfill_image_variants --model portfolio.project --force
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.core.images import (
+    IMAGE_FIELDS, cache_manifest, has_metadata_fields, image_names, refresh_variants, save_metadata
+)
+
+
+def _init_worker():
+    # Needed when the pool spawns rather than forks its workers
+    import django
+    django.setup()
+
+
+def _refresh(name, force):
+    try:
+        status, size, manifest = refresh_variants(name, force=force)
+        return name, status, size, manifest, None
+    except Exception as e:
+        return name, 'failed', 0, None, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Generate missing responsive image variants for all uploaded images, in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (default: number of CPUs)'
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=list(IMAGE_FIELDS),
+            help='Only process images of this model label (repeatable)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild variants even when the source image is unchanged'
+        )
+
+    def handle(self, *args, **options):
+        names = image_names(options['model'])
+        total = len(names)
+        self.stdout.write(f"🖼️  Checking {total} images with {options['workers']} workers...")
+        if not total:
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+
+        counts = {'generated': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+        source_bytes = 0
+        started = time.monotonic()
+
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as executor:
+            futures = [executor.submit(_refresh, name, options['force']) for name in names]
+            for done, future in enumerate(as_completed(futures), start=1):
+                name, status, size, manifest, error = future.result()
+                counts[status] += 1
+                source_bytes += size
+                if status == 'failed':
+                    self.stderr.write(f'   Failed {name}: {error}')
+                elif manifest is not None:
+                    # Workers may not share this process's cache
+                    cache_manifest(name, manifest)
+                    for label, field in names[name]:
+                        model = apps.get_model(label)
+                        if has_metadata_fields(model, field):
+                            save_metadata(model, field, name, manifest)
+                if done % 100 == 0 or done == total:
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f'   {done}/{total} images ({done / elapsed:.1f}/s)')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {counts['generated']} generated, {counts['skipped']} unchanged, "
+            f"{counts['missing']} missing, {counts['failed']} failed in {elapsed:.1f}s "
+            f"({total / elapsed:.1f} images/s, {source_bytes / elapsed / 1024 / 1024:.1f} MB/s read)"
+        ))
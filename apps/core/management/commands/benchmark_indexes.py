@@ -0,0 +1,225 @@
+"""
+Django management command to benchmark the listing queries with and
+without the access-path indexes.
+
+Inside one transaction it adds ``--rows`` articles, projects, solutions,
+services and code snippets, then runs each public listing query (as the
+views build it) with the indexes from the models' ``Meta.indexes`` in
+place and again after dropping them, printing the best time of
+``--repeat`` runs and the query plan of each. The transaction is rolled
+back at the end, so the database is left as it was; it is still a write
+transaction holding locks for the whole run, so point ``DATABASE_URL`` at
+a copy rather than the live database.
+
+Usage:
+    python manage.py benchmark_indexes
+    python manage.py benchmark_indexes --rows 10000 --repeat 10
+    DATABASE_URL=sqlite:////tmp/bench.db python manage.py benchmark_indexes --force
+"""
+
+import random
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.blog.models import Article, Category
+from apps.core.slow_queries import explain
+from apps.portfolio.models import Project, Technology
+from apps.services.models import Service
+from apps.solutions.models import CodeSnippet, Solution
+
+BENCHMARK_MODELS = [Article, Project, Solution, Service, CodeSnippet]
+BATCH_SIZE = 2000
+PREFIX = 'bench-idx-'
+
+
+def access_paths(now, technology, category):
+    """
+    ``(name, queryset)`` for each listing query, built the way the views
+    build them.
+    """
+    articles = Article.objects.filter(is_published=True, published_at__lte=now)
+    projects = Project.objects.filter(is_published=True, published_at__lte=now)
+    solutions = Solution.objects.filter(is_published=True, published_at__lte=now)
+    return [
+        ('Recent articles (home, blog)', articles.order_by('-published_at')[:9]),
+        ('Articles in a category', articles.filter(category=category).order_by('-published_at')[:9]),
+        ('Featured articles', articles.filter(is_featured=True)[:2]),
+        ('Portfolio listing', projects.order_by('-order_priority', '-is_featured', '-created_at')[:12]),
+        ('Featured projects (home)', projects.filter(is_featured=True).order_by('-order_priority', '-created_at')[:5]),
+        ('Related projects', projects.filter(project_type='api').order_by('-is_featured', '-created_at')[:3]),
+        ('Portfolio ?year=2023', projects.filter(
+            start_date__gte=date(2023, 1, 1), start_date__lt=date(2024, 1, 1)
+        ).order_by('-order_priority', '-is_featured', '-created_at')[:12]),
+        ('Earliest project (home stats)', Project.objects.filter(
+            is_published=True, start_date__isnull=False
+        ).order_by('start_date')[:1]),
+        ('Solutions listing (most helpful)', solutions.order_by('-helpful_count', '-created_at')[:12]),
+        ('Solutions ?sort=newest', solutions.order_by('-created_at')[:12]),
+        ('Solutions ?sort=popular', solutions.order_by('-view_count', '-created_at')[:12]),
+        ('Related solutions', solutions.filter(technology=technology).order_by('-helpful_count', '-created_at')[:6]),
+        ('Services listing', Service.objects.filter(
+            is_active=True, is_published=True, published_at__lte=now
+        ).order_by('-order_priority', '-created_at')[:12]),
+        ('Recent code snippets', CodeSnippet.objects.order_by('-created_at')[:6]),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Time the listing queries on generated data with and without the access-path indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100000,
+            help='Rows to generate per model (default: 100000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per query; the best time is reported (default: 5)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run even with DEBUG off'
+        )
+
+    def handle(self, *args, **options):
+        if not connection.features.can_rollback_ddl:
+            raise CommandError(f'{connection.vendor} cannot roll back DROP INDEX; use SQLite or PostgreSQL')
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('This writes to the database inside a long transaction; pass --force to run with DEBUG off')
+
+        self.rows = options['rows']
+        self.repeat = max(options['repeat'], 1)
+        with transaction.atomic():
+            self.run()
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark finished; generated rows and dropped indexes rolled back'))
+
+    def run(self):
+        self.stdout.write(f'🧪 Generating {self.rows} rows per model...')
+        started = time.perf_counter()
+        technology, category = self.generate()
+        self.analyze()
+        self.stdout.write(f'   done in {time.perf_counter() - started:.1f}s')
+
+        paths = access_paths(timezone.now(), technology, category)
+        with_indexes = [self.measure(queryset) for _, queryset in paths]
+
+        dropped = self.drop_indexes()
+        self.analyze()
+        self.stdout.write(f'🗑️  Dropped {dropped} access-path indexes (rolled back at the end)')
+        without_indexes = [self.measure(queryset) for _, queryset in paths]
+
+        self.stdout.write('')
+        self.stdout.write(f"{'Query':<36} {'no index':>10} {'indexed':>10} {'speedup':>8}")
+        for (name, _), (before_ms, before_plan), (after_ms, after_plan) in zip(paths, without_indexes, with_indexes):
+            speedup = before_ms / after_ms if after_ms else 0
+            self.stdout.write(f'{name:<36} {before_ms:>8.2f}ms {after_ms:>8.2f}ms {speedup:>7.1f}x')
+            self.stdout.write(f'    before: {before_plan}')
+            self.stdout.write(f'    after:  {after_plan}')
+
+    def generate(self):
+        rng = random.Random(42)
+        now = timezone.now()
+        user = User.objects.create(username=f'{PREFIX}author')
+        technologies = Technology.objects.bulk_create([
+            Technology(name=f'Bench tech {i}', slug=f'{PREFIX}tech-{i}') for i in range(20)
+        ])
+        categories = Category.objects.bulk_create([
+            Category(name=f'Bench category {i}', slug=f'{PREFIX}category-{i}') for i in range(10)
+        ])
+
+        def published_at():
+            # Mostly published in the past three years, a few drafts and scheduled posts
+            roll = rng.random()
+            if roll < 0.1:
+                return None
+            if roll < 0.15:
+                return now + timedelta(days=rng.randint(1, 60))
+            return now - timedelta(minutes=rng.randint(1, 3 * 365 * 24 * 60))
+
+        def common(i):
+            moment = published_at()
+            return {
+                'slug': f'{PREFIX}{i}',
+                'title': f'Benchmark row {i}',
+                'is_published': moment is not None,
+                'published_at': moment,
+                'created_at': now - timedelta(minutes=rng.randint(1, 3 * 365 * 24 * 60)),
+            }
+
+        builders = {
+            Article: lambda i: Article(
+                **common(i), excerpt='', content='', author=user, category=rng.choice(categories),
+                is_featured=rng.random() < 0.02, view_count=rng.randint(0, 10000),
+            ),
+            Project: lambda i: Project(
+                **common(i), description='', detailed_content='',
+                project_type=rng.choice(Project.PROJECT_TYPE_CHOICES)[0],
+                start_date=date(2015, 1, 1) + timedelta(days=rng.randint(0, 3650)),
+                is_featured=rng.random() < 0.02, order_priority=rng.randint(0, 10), view_count=rng.randint(0, 10000),
+            ),
+            Solution: lambda i: Solution(
+                **common(i), problem_description='', root_cause='', solution_content='',
+                technology=rng.choice(technologies), difficulty_level=rng.choice(Solution.DIFFICULTY_CHOICES)[0],
+                helpful_count=rng.randint(0, 500), view_count=rng.randint(0, 10000),
+            ),
+            Service: lambda i: Service(
+                **common(i), description='', detailed_content='',
+                is_active=rng.random() < 0.9, order_priority=rng.randint(0, 10),
+            ),
+            CodeSnippet: lambda i: CodeSnippet(
+                title=f'Benchmark snippet {i}', description='', code='', language='python',
+                created_at=now - timedelta(minutes=rng.randint(1, 3 * 365 * 24 * 60)),
+            ),
+        }
+
+        # Spread created_at like real data instead of stamping every row with now
+        created_at = [model._meta.get_field('created_at') for model in BENCHMARK_MODELS]
+        for field in created_at:
+            field.auto_now_add = False
+        try:
+            for model, build in builders.items():
+                model.objects.bulk_create((build(i) for i in range(self.rows)), batch_size=BATCH_SIZE)
+        finally:
+            for field in created_at:
+                field.auto_now_add = True
+
+        return technologies[0], categories[0]
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def drop_indexes(self):
+        dropped = 0
+        with connection.cursor() as cursor:
+            for model in BENCHMARK_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+                    dropped += 1
+        return dropped
+
+    def measure(self, queryset):
+        """
+        Best time in ms over ``repeat`` runs, and the query plan on one line.
+        """
+        best = None
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            list(queryset._chain())
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        plan = ' | '.join(line.strip() for line in explain(connection, *queryset.query.sql_with_params()).splitlines())
+        return best * 1000, plan
@@ -0,0 +1,88 @@
+"""
+Django management command to build the production static files.
+
+Downloads the third-party assets in ``STATIC_VENDOR_ASSETS`` into
+``static/vendor/`` (skipping ones already there), builds the Tailwind
+stylesheet with ``build_tailwind``, then runs ``collectstatic`` so every
+file gets a content-hashed name and text files get ``.gz``/``.br``
+copies. Needs ``STATIC_BUILD=True``.
+
+Usage:
+    STATIC_BUILD=True python manage.py build_static
+    STATIC_BUILD=True python manage.py build_static --refresh-vendor
+    STATIC_BUILD=True python manage.py build_static --skip-vendor --skip-tailwind
+"""
+
+import os
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.staticfiles import brotli, vendor_assets, vendor_path
+
+DOWNLOAD_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = 'Vendor CDN assets and collect fingerprinted, precompressed static files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh-vendor',
+            action='store_true',
+            help='Download vendor assets again even if they are already present'
+        )
+        parser.add_argument(
+            '--skip-vendor',
+            action='store_true',
+            help='Do not download vendor assets (use the copies already in static/vendor/)'
+        )
+        parser.add_argument(
+            '--skip-tailwind',
+            action='store_true',
+            help='Do not rebuild the Tailwind stylesheet'
+        )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'STATIC_BUILD', False):
+            raise CommandError('Set STATIC_BUILD=True so collectstatic uses the fingerprinting storage')
+        if not settings.STATICFILES_DIRS:
+            raise CommandError('STATICFILES_DIRS is empty; there is nowhere to put vendor assets')
+
+        if not options['skip_vendor']:
+            self.vendor(Path(settings.STATICFILES_DIRS[0]), options['refresh_vendor'])
+
+        if not options['skip_tailwind']:
+            call_command('build_tailwind', stdout=self.stdout)
+
+        if brotli is None:
+            self.stdout.write(self.style.WARNING('brotli is not installed; only .gz copies will be written'))
+
+        self.stdout.write('📦 Collecting static files...')
+        call_command('collectstatic', interactive=False, verbosity=max(options['verbosity'] - 1, 0))
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Static files built in {settings.STATIC_ROOT}'))
+
+    def vendor(self, static_dir, refresh):
+        for name, url in vendor_assets().items():
+            target = static_dir / vendor_path(name)
+            if target.exists() and not refresh:
+                self.stdout.write(f'   {name} already vendored')
+                continue
+
+            self.stdout.write(f'⬇️  Downloading {url}')
+            try:
+                with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                    content = response.read()
+            except Exception as e:
+                raise CommandError(f'Failed to download {url}: {e}')
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so an interrupted download never leaves half a file
+            partial = target.with_name(target.name + '.part')
+            partial.write_bytes(content)
+            os.replace(partial, target)
+            self.stdout.write(f'   {name}: {len(content) / 1024:.0f} KB')
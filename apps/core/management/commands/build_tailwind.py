@@ -0,0 +1,49 @@
+"""
+Django management command to build the site stylesheet from the classes
+the project actually uses.
+
+Scans templates, JavaScript and Python string literals for Tailwind class
+names and writes only the matching utilities (plus preflight) to
+``static/<TAILWIND_OUTPUT>``. ``build_static`` runs it before collecting,
+and ``base.html`` links the result instead of the Tailwind CDN script
+when ``STATIC_BUILD`` is on.
+
+Usage:
+    python manage.py build_tailwind
+    python manage.py build_tailwind --list-unknown
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.tailwind import build_stylesheet, extract_candidates, output_path, source_files
+
+
+class Command(BaseCommand):
+    help = 'Write a purged Tailwind stylesheet with only the utilities used by the project'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--list-unknown',
+            action='store_true',
+            help='List class-like tokens that are not Tailwind utilities (custom classes, plugin classes, typos)'
+        )
+
+    def handle(self, *args, **options):
+        output = output_path()
+        files = source_files(output)
+        self.stdout.write(f'🔎 Scanning {len(files)} files for class names...')
+
+        stylesheet = build_stylesheet(extract_candidates(files))
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(stylesheet.css, encoding='utf-8')
+
+        if options['list_unknown']:
+            # Most tokens are plain words; only show the ones shaped like classes
+            for name in stylesheet.unknown:
+                if '-' in name and name.replace('-', '').replace(':', '').replace('/', '').isalnum():
+                    self.stdout.write(f'   {name}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Wrote {len(stylesheet.utilities)} utilities to {output} ({len(stylesheet.css.encode()) / 1024:.1f} KB)'
+        ))
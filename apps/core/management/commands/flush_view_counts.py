@@ -0,0 +1,22 @@
+"""
+Django management command to write buffered view counts to the database.
+
+Worker processes flush their own buffers on a timer, so this is mainly
+useful with ``VIEW_COUNTER_BUFFER = 'cache'`` from a cron job, or before
+a deploy to make sure nothing is left in the shared buffer.
+
+Usage:
+    python manage.py flush_view_counts
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.view_counters import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = 'Write buffered article, project and solution view counts to the database'
+
+    def handle(self, *args, **options):
+        flushed = flush_view_counts()
+        self.stdout.write(self.style.SUCCESS(f'✅ Flushed {flushed} buffered views'))
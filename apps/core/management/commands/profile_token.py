@@ -0,0 +1,40 @@
+"""
+Django management command to print a signed X-Profile header value.
+
+Requests sent with the header are profiled and stored like staff
+``?profile=`` requests, without needing a staff session. The token is
+valid for ``PROFILING_TOKEN_MAX_AGE`` seconds.
+
+Usage:
+    python manage.py profile_token
+    python manage.py profile_token --mode cprofile
+    curl -H "X-Profile: $(python manage.py profile_token)" https://example.com/portfolio/
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.profiling import MODES, TOKEN_HEADER, default_mode, make_token
+
+
+class Command(BaseCommand):
+    help = 'Print a signed token that makes a request run under the profiler'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            choices=MODES,
+            default=None,
+            help='Profiler to use (default: PROFILING_DEFAULT_MODE)'
+        )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            raise CommandError('PROFILING_ENABLED is off; profiling tokens would be ignored')
+
+        mode = options['mode'] or default_mode()
+        token = make_token(mode)
+        if options['verbosity'] > 1:
+            max_age = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+            self.stderr.write(f'🔐 {TOKEN_HEADER} token for {mode} profiling, valid for {max_age} seconds:')
+        self.stdout.write(token)
@@ -0,0 +1,36 @@
+"""
+Django management command to rebuild the full-text search index tables.
+
+Signals keep the index current for normal saves; run this after bulk
+imports or ``QuerySet.update()`` calls that bypass them, or to recreate
+missing tables.
+
+Usage:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --model blog.article
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.search import SEARCH_INDEXES, create_index_tables, rebuild_index, search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for articles, projects, solutions, services and code snippets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=list(SEARCH_INDEXES),
+            help='Only rebuild the index for this model label (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        if search_backend() is None:
+            raise CommandError('Full-text search needs SQLite (FTS5) or PostgreSQL')
+
+        create_index_tables()
+        for label in options['model'] or SEARCH_INDEXES:
+            count = rebuild_index(label)
+            self.stdout.write(self.style.SUCCESS(f'✅ Indexed {count} {label} rows'))
@@ -0,0 +1,117 @@
+"""
+Django management command to backfill stored HTML for rendered content fields.
+
+Rendering runs in a process pool so Markdown and Pygments work is spread
+across CPU cores; the results are written back with bulk updates.
+
+Usage:
+    python manage.py render_content_html
+    python manage.py render_content_html --force  # Re-render every row
+    python manage.py render_content_html --workers 8 --batch-size 200
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.core.markdown_renderer import render_content
+from apps.portfolio.models import Project
+from apps.solutions.models import Solution
+
+RENDERED_MODELS = [Solution, Project]
+
+
+def render_row(row):
+    """
+    Render one row's sources in a worker process.
+
+    ``row`` is ``(pk, [(renderer, source), ...])``; returns
+    ``(pk, [html, ...])`` in the same order.
+    """
+    pk, sources = row
+    return pk, [render_content(renderer, source) for renderer, source in sources]
+
+
+class Command(BaseCommand):
+    help = 'Render and store HTML for solution and project content fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of rendering processes (default: number of CPUs)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Rows rendered and saved per batch (default: 100)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render all rows, not only those missing stored HTML'
+        )
+
+    def handle(self, *args, **options):
+        """Main command handler"""
+        self.stdout.write(self.style.SUCCESS('🚀 Rendering stored content HTML...\n'))
+        started = time.perf_counter()
+        total = 0
+
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            for model in RENDERED_MODELS:
+                total += self._render_model(model, executor, options['batch_size'], options['force'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✅ Rendered {total} rows in {elapsed:.1f}s')
+        )
+
+    def _render_model(self, model, executor, batch_size, force):
+        """Render every row of ``model`` that needs it, one batch at a time"""
+        fields = list(model.rendered_fields.items())
+        html_fields = [f'{field}_html' for field, _ in fields]
+
+        queryset = model.objects.all()
+        if not force:
+            missing = Q()
+            for field, _ in fields:
+                missing |= Q(**{f'{field}_html': ''}) & ~Q(**{field: ''})
+            queryset = queryset.filter(missing)
+
+        # Collect primary keys up front so writing results back doesn't
+        # disturb an open cursor over the same table
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        label = model._meta.verbose_name_plural
+        self.stdout.write(f'📝 Rendering {len(pks)} {label}...')
+
+        rendered = 0
+        source_fields = [field for field, _ in fields]
+        for start in range(0, len(pks), batch_size):
+            rows = model.objects.filter(pk__in=pks[start:start + batch_size]).values_list('pk', *source_fields)
+            batch = [
+                (row[0], [(renderer, source) for (_, renderer), source in zip(fields, row[1:])])
+                for row in rows
+            ]
+            rendered += self._render_batch(model, executor, batch, html_fields)
+
+        self.stdout.write(self.style.SUCCESS(f'   ✅ {label}: {rendered} rendered'))
+        return rendered
+
+    def _render_batch(self, model, executor, batch, html_fields):
+        """Render a batch in the pool and bulk update the results"""
+        instances = []
+        for pk, html_values in executor.map(render_row, batch):
+            instance = model(pk=pk)
+            for html_field, html in zip(html_fields, html_values):
+                setattr(instance, html_field, html)
+            instances.append(instance)
+
+        # bulk_update bypasses save(), so only the _html columns are touched
+        model.objects.bulk_update(instances, html_fields)
+        return len(instances)
@@ -0,0 +1,68 @@
+"""
+Django management command to deliver queued transactional email.
+
+Sends due messages from the email outbox in batches, one SMTP connection
+per batch. Run it from cron, or keep it running with ``--loop``.
+
+Usage:
+    python manage.py run_outbox
+    python manage.py run_outbox --batch-size 100
+    python manage.py run_outbox --loop --interval 5
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send pending emails from the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50),
+            help='Messages sent per SMTP connection'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new messages instead of exiting when the queue is empty'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=getattr(settings, 'EMAIL_OUTBOX_POLL_INTERVAL', 5),
+            help='Seconds to wait between polls with --loop'
+        )
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retrying': 0, 'failed': 0}
+
+        try:
+            while True:
+                stats = process_outbox(options['batch_size'])
+                for key, value in stats.items():
+                    totals[key] += value
+
+                if any(stats.values()):
+                    self.stdout.write(
+                        f"📧 Sent {stats['sent']}, retrying {stats['retrying']}, failed {stats['failed']}"
+                    )
+                    # A full batch means more may be waiting
+                    if sum(stats.values()) >= options['batch_size']:
+                        continue
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping outbox worker')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Outbox done: {totals['sent']} sent, {totals['retrying']} to retry, {totals['failed']} failed"
+        ))
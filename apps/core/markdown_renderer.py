@@ -0,0 +1,182 @@
+"""
+Shared Markdown rendering service.
+
+Building a ``markdown.Markdown`` instance with codehilite and Pygments is
+expensive, so each thread keeps one configured engine and resets it
+between documents. Rendered HTML is kept in a bounded in-process LRU
+keyed by a hash of the source text, and optionally in a shared Django
+cache (``MARKDOWN_SHARED_CACHE``) so other workers can reuse it.
+
+``render_content`` exposes the same renderers to models that store
+pre-rendered HTML alongside their source text.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import markdown as md_module
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.html import linebreaks
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_EXTENSIONS = [
+    'markdown.extensions.fenced_code',
+    'markdown.extensions.codehilite',
+    'markdown.extensions.tables',
+    'markdown.extensions.toc',
+    'markdown.extensions.nl2br',
+]
+
+MARKDOWN_EXTENSION_CONFIGS = {
+    'markdown.extensions.codehilite': {
+        'css_class': 'highlight',
+        'use_pygments': True,
+    }
+}
+
+# Bump when the extensions or their configuration change so cached
+# HTML rendered with the old settings is not reused.
+RENDERER_VERSION = 1
+
+_local = threading.local()
+
+
+def get_engine():
+    """
+    Return this thread's Markdown engine, creating it on first use.
+    """
+    engine = getattr(_local, 'engine', None)
+    if engine is None:
+        engine = md_module.Markdown(
+            extensions=MARKDOWN_EXTENSIONS,
+            extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+        )
+        _local.engine = engine
+    return engine
+
+
+def render_markdown_uncached(text):
+    """
+    Convert Markdown to HTML without consulting any cache.
+    """
+    engine = get_engine()
+    try:
+        return engine.reset().convert(text)
+    finally:
+        engine.reset()
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    Thread-safe, size-bounded LRU of rendered HTML.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return None
+            return self._items[key]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+render_cache = RenderCache(maxsize=getattr(settings, 'MARKDOWN_CACHE_SIZE', 256))
+
+
+def _shared_cache():
+    alias = getattr(settings, 'MARKDOWN_SHARED_CACHE', None)
+    if not alias:
+        return None
+    try:
+        return caches[alias]
+    except Exception as e:
+        logger.warning(f"Markdown shared cache '{alias}' is unavailable: {e}")
+        return None
+
+
+def render_markdown(text):
+    """
+    Convert Markdown to HTML, reusing previously rendered output.
+
+    Lookups go to the in-process LRU first, then the shared cache if one
+    is configured; only a miss in both runs Markdown and Pygments.
+    """
+    if not text:
+        return ''
+
+    key = f'markdown:v{RENDERER_VERSION}:{content_hash(text)}'
+    html = render_cache.get(key)
+    if html is not None:
+        return html
+
+    shared = _shared_cache()
+    if shared is not None:
+        try:
+            html = shared.get(key)
+        except Exception as e:
+            logger.warning(f"Markdown shared cache lookup failed: {e}")
+            html = None
+
+    if html is None:
+        html = render_markdown_uncached(text)
+        if shared is not None:
+            try:
+                shared.set(key, html, timeout=None)
+            except Exception as e:
+                logger.warning(f"Markdown shared cache store failed: {e}")
+
+    render_cache.set(key, html)
+    return html
+
+
+def render_linebreaks(text):
+    """
+    Convert plain text to HTML paragraphs, like the ``linebreaks`` filter.
+    """
+    return linebreaks(text or '', autoescape=True)
+
+
+# Renderers available to models that store pre-rendered HTML. They are
+# plain module-level functions so they can run in a process pool.
+CONTENT_RENDERERS = {
+    'markdown': render_markdown_uncached,
+    'linebreaks': render_linebreaks,
+}
+
+
+def render_content(renderer, text):
+    """
+    Render ``text`` with the named renderer from ``CONTENT_RENDERERS``.
+    """
+    if not text:
+        return ''
+    return CONTENT_RENDERERS[renderer](text)
@@ -0,0 +1,314 @@
+"""
+Prometheus metrics for the ``/metrics`` endpoint.
+
+``MetricsMiddleware`` records request latency (a histogram per URL name),
+request counts and the query counts gathered by ``QueryBudgetMiddleware``;
+the page cache and the detail payload cache count their hits and misses
+with ``inc``. Everything is kept as plain sample values in process memory.
+
+Prefork servers run several worker processes and a scrape reaches only
+one of them, so with ``METRICS_DIR`` set each process also writes its
+samples to its own file in that directory (at most every
+``METRICS_FLUSH_INTERVAL`` seconds, and at exit), and ``collect`` sums the
+files of every process. Counters of workers that have exited stay in the
+totals, as Prometheus expects of counters; process gauges only count live
+workers. Empty the directory when the server starts.
+
+Outbox depth and the shared view-counter buffer are read once per scrape
+rather than recorded per process.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Family name -> (type, help). Histogram families also get _bucket, _sum and _count samples.
+METRICS = {
+    'pulcova_http_requests_total': ('counter', 'Requests handled, by URL name, method and status class.'),
+    'pulcova_http_request_duration_seconds': ('histogram', 'Request latency by URL name.'),
+    'pulcova_db_queries_total': ('counter', 'Database queries run while handling requests, by URL name.'),
+    'pulcova_db_query_duration_seconds_total': ('counter', 'Time spent in database queries, by URL name.'),
+    'pulcova_template_render_seconds_total': ('counter', 'Time spent rendering templates, by URL name.'),
+    'pulcova_cache_requests_total': ('counter', 'Page and detail payload cache lookups, by result.'),
+    'pulcova_cache_hit_ratio': ('gauge', 'Share of cache lookups that were hits since the metrics were reset.'),
+    'pulcova_view_counter_pending': ('gauge', 'Detail page views buffered and not yet written to the database.'),
+    'pulcova_outbox_emails': ('gauge', 'Emails in the outbox, by status.'),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class MetricStore:
+    """
+    Sample values of this process, optionally mirrored to a file in
+    ``METRICS_DIR``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._process_gauges = {}
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        # (sample name, labels) -> value
+        self._samples = defaultdict(float)
+        self._last_write = 0.0
+        self._path = None
+        directory = getattr(settings, 'METRICS_DIR', '')
+        if directory:
+            # A new name per process start, so a reused pid never overwrites an earlier worker's counters
+            self._path = Path(directory) / f'{self.pid}-{uuid.uuid4().hex[:8]}.json'
+
+    def _check_fork(self):
+        # Forked workers inherit the parent's samples; start them from zero
+        if os.getpid() != self.pid:
+            with self._lock:
+                if os.getpid() != self.pid:
+                    self._reset()
+
+    def inc(self, name, amount=1, **labels):
+        self._check_fork()
+        with self._lock:
+            self._samples[(name, _labels_key(labels))] += amount
+        self._maybe_write()
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        self._check_fork()
+        key = _labels_key(labels)
+        with self._lock:
+            for bound in buckets:
+                if value <= bound:
+                    self._samples[(f'{name}_bucket', key + (('le', _format_value(bound)),))] += 1
+            self._samples[(f'{name}_bucket', key + (('le', '+Inf'),))] += 1
+            self._samples[(f'{name}_sum', key)] += value
+            self._samples[(f'{name}_count', key)] += 1
+        self._maybe_write()
+
+    def register_process_gauge(self, name, func, **labels):
+        """
+        Report ``func()`` as the gauge ``name`` of this process; values of
+        all live processes are added up.
+        """
+        self._process_gauges[(name, _labels_key(labels))] = func
+
+    def _gauge_values(self):
+        values = {}
+        for key, func in self._process_gauges.items():
+            try:
+                values[key] = float(func())
+            except Exception as e:
+                logger.error(f"Failed to read metric gauge {key[0]}: {e}")
+        return values
+
+    def _snapshot(self):
+        with self._lock:
+            samples = dict(self._samples)
+        return samples, self._gauge_values()
+
+    def _maybe_write(self):
+        if self._path is None:
+            return
+        if time.monotonic() - self._last_write >= getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            self.write()
+
+    def write(self):
+        """
+        Write this process's samples to its file in ``METRICS_DIR``.
+        """
+        if self._path is None:
+            return
+        with self._write_lock:
+            self._last_write = time.monotonic()
+            samples, gauges = self._snapshot()
+            data = {
+                'pid': self.pid,
+                'samples': [[name, list(labels), value] for (name, labels), value in samples.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in gauges.items()],
+            }
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so a scrape never reads half a file
+                partial = self._path.with_name(self._path.name + '.part')
+                partial.write_text(json.dumps(data), encoding='utf-8')
+                os.replace(partial, self._path)
+            except Exception as e:
+                logger.error(f"Failed to write metrics file {self._path}: {e}")
+
+    def aggregate(self):
+        """
+        ``(samples, gauges)`` summed over every process; just this one
+        without ``METRICS_DIR``.
+        """
+        self._check_fork()
+        if self._path is None:
+            return self._snapshot()
+
+        self.write()
+        samples = defaultdict(float)
+        gauges = defaultdict(float)
+        for path in self._path.parent.glob('*.json'):
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable metrics file {path}: {e}")
+                continue
+            for name, labels, value in data['samples']:
+                samples[(name, tuple(tuple(pair) for pair in labels))] += value
+            if _pid_alive(data['pid']):
+                for name, labels, value in data['gauges']:
+                    gauges[(name, tuple(tuple(pair) for pair in labels))] += value
+        return dict(samples), dict(gauges)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+store = MetricStore()
+atexit.register(store.write)
+
+
+def inc(name, amount=1, **labels):
+    store.inc(name, amount, **labels)
+
+
+def observe(name, value, **labels):
+    store.observe(name, value, **labels)
+
+
+def record_request(request, response, duration):
+    """
+    Record a finished request: its latency, status and, when
+    ``QueryBudgetMiddleware`` measured it, its queries and render time.
+    """
+    match = getattr(request, 'resolver_match', None)
+    # URL names only: raw paths of unmatched requests would make a label per 404
+    view = match.view_name if match is not None and match.view_name else 'unresolved'
+    status = f'{response.status_code // 100}xx'
+
+    observe('pulcova_http_request_duration_seconds', duration, view=view)
+    inc('pulcova_http_requests_total', view=view, method=request.method, status=status)
+
+    metrics = getattr(request, 'query_metrics', None)
+    if metrics is not None:
+        inc('pulcova_db_queries_total', metrics.queries, view=view)
+        inc('pulcova_db_query_duration_seconds_total', metrics.db_time, view=view)
+        inc('pulcova_template_render_seconds_total', metrics.template_time, view=view)
+
+
+def _scrape_gauges():
+    """
+    Gauges read once per scrape: outbox depth, and the view-counter buffer
+    when it is shared through the cache.
+    """
+    from .models import EmailOutbox
+    from .view_counters import MemoryViewCounterBuffer, view_counter
+
+    gauges = {}
+    try:
+        counts = dict(EmailOutbox.objects.values_list('status').annotate(count=Count('id')))
+        for status, _ in EmailOutbox.STATUS_CHOICES:
+            gauges[('pulcova_outbox_emails', (('status', status),))] = counts.get(status, 0)
+    except Exception as e:
+        logger.error(f"Failed to count outbox emails for metrics: {e}")
+
+    if not isinstance(view_counter.buffer, MemoryViewCounterBuffer):
+        try:
+            gauges[('pulcova_view_counter_pending', ())] = view_counter.buffer.size()
+        except Exception as e:
+            logger.error(f"Failed to read view counter buffer size for metrics: {e}")
+    return gauges
+
+
+def _cache_ratios(samples):
+    lookups = defaultdict(lambda: [0.0, 0.0])
+    for (name, labels), value in samples.items():
+        if name != 'pulcova_cache_requests_total':
+            continue
+        labels = dict(labels)
+        lookups[labels.get('cache', '')][0 if labels.get('result') == 'hit' else 1] += value
+    return {
+        ('pulcova_cache_hit_ratio', (('cache', cache_name),)): hits / (hits + misses)
+        for cache_name, (hits, misses) in lookups.items() if hits + misses
+    }
+
+
+def _family(sample_name):
+    if sample_name in METRICS:
+        return sample_name
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix) and sample_name[:-len(suffix)] in METRICS:
+            return sample_name[:-len(suffix)]
+    return sample_name
+
+
+def _sample_order(item):
+    (name, labels), _ = item
+    other = tuple(pair for pair in labels if pair[0] != 'le')
+    le = dict(labels).get('le')
+    bound = float('inf') if le in (None, '+Inf') else float(le)
+    return other, name.endswith('_count'), name.endswith('_sum'), bound
+
+
+def collect():
+    """
+    All metrics in the Prometheus text exposition format.
+    """
+    samples, gauges = store.aggregate()
+    gauges.update(_scrape_gauges())
+    gauges.update(_cache_ratios(samples))
+    samples.update(gauges)
+
+    families = defaultdict(dict)
+    for key, value in samples.items():
+        families[_family(key[0])][key] = value
+
+    lines = []
+    for family in sorted(families):
+        metric_type, help_text = METRICS.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {metric_type}')
+        for (name, labels), value in sorted(families[family].items(), key=_sample_order):
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
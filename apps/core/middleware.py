@@ -0,0 +1,426 @@
+import logging
+import mimetypes
+import os
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .metrics import inc, record_request
+from .page_cache import get_cached_page, page_cache_key, store_page
+from .profiling import PROFILERS, aprofiled_call, asks_for_profile, profiled_call, requested_mode, save_profile
+from .query_budget import current_metrics, end_request, enforce_budget, install_query_recorder, start_request
+from .staticfiles import hashed_names
+from .timing import server_timing_enabled, server_timing_header
+
+logger = logging.getLogger(__name__)
+
+ACCEPTS_BR = re.compile(r'\bbr\b')
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class AnonymousPageCacheMiddleware:
+    """
+    Serve anonymous GET requests for the URL names in ``PAGE_CACHE_VIEWS``
+    from the full-page cache.
+
+    Must come after the session, CSRF, authentication and message
+    middleware so it can check who is asking and whether the page carries
+    per-visitor state.
+
+    Works in both sync and async stacks, so async views under ASGI are not
+    forced through a worker thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self._finish_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if getattr(request, 'page_cache_key', None) is None:
+            return response
+        return await sync_to_async(self._finish_response)(request, response)
+
+    def _finish_response(self, request, response):
+        cache_key = getattr(request, 'page_cache_key', None)
+        if cache_key is not None:
+            if self._should_store(request, response):
+                try:
+                    store_page(
+                        cache_key,
+                        response,
+                        request.surrogate_keys,
+                        uses_csrf=request.META.get('CSRF_COOKIE_NEEDS_UPDATE', False),
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to store page {request.path} in page cache: {e}")
+            response['X-Page-Cache'] = 'MISS'
+            response['Surrogate-Key'] = ' '.join(sorted(request.surrogate_keys))
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._is_cacheable_request(request):
+            return None
+
+        cache_key = page_cache_key(request)
+        try:
+            response = get_cached_page(request, cache_key)
+        except Exception as e:
+            logger.error(f"Page cache lookup failed for {request.path}: {e}")
+            response = None
+
+        if response is not None:
+            inc('pulcova_cache_requests_total', cache='page', result='hit')
+            response['X-Page-Cache'] = 'HIT'
+            return response
+
+        inc('pulcova_cache_requests_total', cache='page', result='miss')
+        request.page_cache_key = cache_key
+        request.surrogate_keys = set()
+        return None
+
+    def _is_cacheable_request(self, request):
+        if not getattr(settings, 'PAGE_CACHE_ENABLED', True):
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        match = request.resolver_match
+        if match is None or match.view_name not in getattr(settings, 'PAGE_CACHE_VIEWS', []):
+            return False
+        # Pending flash messages are rendered into the page for one visitor only
+        if 'messages' in request.COOKIES:
+            return False
+        # A profile of a cached page would only show the cache lookup
+        if getattr(request, 'profiling_mode', None):
+            return False
+        return not request.user.is_authenticated
+
+    def _should_store(self, request, response):
+        if request.method != 'GET' or response.status_code != 200:
+            return False
+        if response.streaming or response.cookies:
+            return False
+        if getattr(request, 'session', None) is not None and request.session.modified:
+            return False
+        messages = getattr(request, '_messages', None)
+        if messages is not None and messages.used:
+            return False
+        return True
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Serve collected static files from ``STATIC_ROOT``, using the ``.br`` or
+    ``.gz`` copy written by ``collectstatic`` when the client accepts it.
+
+    Content-hashed names from the static manifest are cached for a year
+    as immutable; anything else must be revalidated. Enabled by
+    ``STATIC_SERVE`` and should sit right after ``SecurityMiddleware``.
+    Files that are not in ``STATIC_ROOT`` fall through to the rest of the
+    stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        static_url = settings.STATIC_URL or ''
+        # A STATIC_URL on another host (a CDN) is not ours to serve
+        if not getattr(settings, 'STATIC_SERVE', False) or not settings.STATIC_ROOT or not static_url.startswith('/'):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.prefix = static_url
+        self.root = str(settings.STATIC_ROOT)
+        self.immutable = hashed_names()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self._is_static_request(request):
+            response = self.serve(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._is_static_request(request):
+            response = await sync_to_async(self.serve)(request)
+            if response is not None:
+                return response
+        return await self.get_response(request)
+
+    def _is_static_request(self, request):
+        return request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix)
+
+    def _pick_encoding(self, request, path):
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if ACCEPTS_BR.search(accept_encoding) and os.path.isfile(path + '.br'):
+            return path + '.br', 'br'
+        if ACCEPTS_GZIP.search(accept_encoding) and os.path.isfile(path + '.gz'):
+            return path + '.gz', 'gzip'
+        return path, None
+
+    def serve(self, request):
+        name = request.path[len(self.prefix):]
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        served_path, encoding = self._pick_encoding(request, path)
+        try:
+            stat = os.stat(served_path)
+            if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+                response = HttpResponseNotModified()
+            else:
+                content_type, _ = mimetypes.guess_type(path)
+                response = FileResponse(open(served_path, 'rb'), content_type=content_type or 'application/octet-stream')
+                # FileResponse names the file inline; a download would keep the .gz/.br name
+                del response['Content-Disposition']
+                if encoding:
+                    response['Content-Encoding'] = encoding
+        except OSError as e:
+            logger.error(f"Failed to serve static file {name}: {e}")
+            return None
+
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if name in self.immutable:
+            response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response['Cache-Control'] = 'public, no-cache'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record each request's latency, status and query counts for the
+    ``/metrics`` endpoint (see ``apps.core.metrics``).
+
+    Goes right before ``QueryBudgetMiddleware`` so the query metrics it
+    leaves on the request are complete by the time they are recorded.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    def _record(self, request, response, duration):
+        try:
+            record_request(request, response, duration)
+        except Exception as e:
+            logger.error(f"Failed to record metrics for {request.path}: {e}")
+
+
+class ProfilingMiddleware:
+    """
+    Run requests that ask for it (see ``apps.core.profiling``) under a
+    profiler and store the result as a ``RequestProfile``; its id is sent
+    back in ``X-Profile-Id``.
+
+    Goes after ``AuthenticationMiddleware`` (the query flag is for staff)
+    and before ``AnonymousPageCacheMiddleware``, which lets profiled
+    requests through to the view.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        mode = requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        request.profiling_mode = mode
+        profiler = PROFILERS[mode]()
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            response = profiled_call(self.get_response, request)
+        finally:
+            profiler.stop()
+        return self._store(request, response, mode, profiler, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        # Checking a staff session needs the database, so only look when asked
+        if not asks_for_profile(request):
+            return await self.get_response(request)
+        mode = await sync_to_async(requested_mode)(request)
+        if mode is None:
+            return await self.get_response(request)
+
+        # Profiles the event loop thread: code run in sync_to_async threads shows up as waiting
+        request.profiling_mode = mode
+        profiler = PROFILERS[mode]()
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            response = await aprofiled_call(self.get_response, request)
+        finally:
+            profiler.stop()
+        return await sync_to_async(self._store)(request, response, mode, profiler, time.perf_counter() - started)
+
+    def _store(self, request, response, mode, profiler, duration):
+        try:
+            profile = save_profile(request, response, mode, profiler, duration)
+            response['X-Profile-Id'] = str(profile.pk)
+        except Exception as e:
+            logger.error(f"Failed to store profile of {request.path}: {e}")
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries, DB time and template time of each request and
+    check them against the resolved view's budget (see
+    ``apps.core.query_budget``). The metrics are left on
+    ``request.query_metrics``.
+
+    Should come early in ``MIDDLEWARE`` so the page cache and the other
+    middleware are measured too. Being outside the page cache also keeps
+    the ``Server-Timing`` header it adds (see ``apps.core.timing``) out of
+    cached pages.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_query_recorder()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', True):
+            return self.get_response(request)
+
+        metrics, token = start_request()
+        metrics.request = request
+        request.query_metrics = metrics
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish()
+            end_request(token)
+        enforce_budget(request, metrics)
+        self._add_server_timing(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', True):
+            return await self.get_response(request)
+
+        metrics, token = start_request()
+        metrics.request = request
+        request.query_metrics = metrics
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish()
+            end_request(token)
+        enforce_budget(request, metrics)
+        self._add_server_timing(request, response, metrics)
+        return response
+
+    def _add_server_timing(self, request, response, metrics):
+        if server_timing_enabled(request):
+            response['Server-Timing'] = server_timing_header(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Time the view and its template render (``app`` in the
+    ``Server-Timing`` header) so the middleware share of a request can be
+    told apart from it.
+
+    Goes last in ``MIDDLEWARE``, with ``QueryBudgetMiddleware`` providing
+    the request metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if getattr(settings, 'SERVER_TIMING', 'off') == 'off':
+            raise MiddlewareNotUsed
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = current_metrics()
+        started = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            if metrics is not None:
+                metrics.app_time = time.perf_counter() - started
+
+    async def __acall__(self, request):
+        metrics = current_metrics()
+        started = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            if metrics is not None:
+                metrics.app_time = time.perf_counter() - started
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.db import migrations
+
+# The index definitions as of this migration; apps.core.search may change later
+SEARCH_INDEXES = {
+    'blog.article': ('title', ['excerpt', 'content']),
+    'portfolio.project': ('title', ['description', 'detailed_content']),
+    'solutions.solution': ('title', ['problem_description', 'solution_content', 'technology__name']),
+    'services.service': ('title', ['description', 'detailed_content']),
+}
+BATCH_SIZE = 500
+
+
+def index_table(label):
+    return 'search_' + label.replace('.', '_')
+
+
+def create_table(cursor, vendor, table):
+    if vendor == 'sqlite':
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+    else:
+        config = getattr(settings, 'SEARCH_TEXT_CONFIG', 'english')
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"object_id bigint PRIMARY KEY, "
+            f"title text NOT NULL DEFAULT '', "
+            f"body text NOT NULL DEFAULT '', "
+            f"document tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{config}'::regconfig, title), 'A') || "
+            f"setweight(to_tsvector('{config}'::regconfig, body), 'B')) STORED)"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_document ON {table} USING GIN (document)")
+
+
+def fill_table(cursor, vendor, table, model, title, body):
+    key = 'rowid' if vendor == 'sqlite' else 'object_id'
+    rows = model._default_manager.order_by('pk').values_list('pk', title, *body)
+    documents = [
+        (pk, title_text or '', '\n'.join(part for part in parts if part))
+        for pk, title_text, *parts in rows.iterator(chunk_size=BATCH_SIZE)
+    ]
+    cursor.executemany(f"INSERT INTO {table} ({key}, title, body) VALUES (%s, %s, %s)", documents)
+    if vendor == 'sqlite':
+        cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+
+def create_search_index(apps, schema_editor):
+    # Full-text tables exist for SQLite (FTS5) and PostgreSQL only
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for label, (title, body) in SEARCH_INDEXES.items():
+            table = index_table(label)
+            create_table(cursor, vendor, table)
+            fill_table(cursor, vendor, table, apps.get_model(label), title, body)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('sqlite', 'postgresql'):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for label in SEARCH_INDEXES:
+            cursor.execute(f"DROP TABLE IF EXISTS {index_table(label)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_newsletter'),
+        ('portfolio', '0002_project_detailed_content_html'),
+        ('services', '0001_initial'),
+        ('solutions', '0003_solution_rendered_html'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import migrations
+
+# The code snippet index as of this migration; apps.core.search may change later
+LABEL = 'solutions.codesnippet'
+TABLE = 'search_solutions_codesnippet'
+TITLE = 'title'
+BODY = ['description', 'language', 'code']
+BATCH_SIZE = 500
+
+
+def index_code_snippets(apps, schema_editor):
+    # Full-text tables exist for SQLite (FTS5) and PostgreSQL only
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+                f"title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+            )
+        else:
+            config = getattr(settings, 'SEARCH_TEXT_CONFIG', 'english')
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+                f"object_id bigint PRIMARY KEY, "
+                f"title text NOT NULL DEFAULT '', "
+                f"body text NOT NULL DEFAULT '', "
+                f"document tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('{config}'::regconfig, title), 'A') || "
+                f"setweight(to_tsvector('{config}'::regconfig, body), 'B')) STORED)"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_document ON {TABLE} USING GIN (document)")
+
+        key = 'rowid' if vendor == 'sqlite' else 'object_id'
+        rows = apps.get_model(LABEL)._default_manager.order_by('pk').values_list('pk', TITLE, *BODY)
+        documents = [
+            (pk, title or '', '\n'.join(part for part in parts if part))
+            for pk, title, *parts in rows.iterator(chunk_size=BATCH_SIZE)
+        ]
+        cursor.executemany(f"INSERT INTO {TABLE} ({key}, title, body) VALUES (%s, %s, %s)", documents)
+        if vendor == 'sqlite':
+            cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+
+def drop_code_snippet_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('sqlite', 'postgresql'):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_code_snippets, drop_code_snippet_index),
+    ]
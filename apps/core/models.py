@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class TimeStampedModel(models.Model):
@@ -19,6 +20,60 @@ class SEOModel(models.Model):
         abstract = True
 
 
+class RenderedContentModel(models.Model):
+    """
+    Stores rendered HTML next to source text fields.
+
+    Subclasses map each source field to a renderer name from
+    ``apps.core.markdown_renderer.CONTENT_RENDERERS`` and declare a
+    ``<field>_html`` companion field. The HTML is regenerated on save only
+    when the source text has changed since it was loaded.
+    """
+    rendered_fields = {}
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rendered_sources = {
+            field: instance.__dict__[field]
+            for field in cls.rendered_fields
+            if field in instance.__dict__
+        }
+        return instance
+
+    def refresh_rendered_fields(self, fields=None, force=False):
+        """
+        Re-render companion HTML for changed sources and return the names
+        of the ``_html`` fields that were updated.
+        """
+        from apps.core.markdown_renderer import render_content
+
+        loaded = getattr(self, '_rendered_sources', {})
+        updated = []
+        for field, renderer in self.rendered_fields.items():
+            if fields is not None and field not in fields:
+                continue
+            source = getattr(self, field) or ''
+            html_field = f'{field}_html'
+            stale = field not in loaded or loaded[field] != source
+            if force or stale or (source and not getattr(self, html_field)):
+                setattr(self, html_field, render_content(renderer, source))
+                updated.append(html_field)
+            loaded[field] = source
+        self._rendered_sources = loaded
+        return updated
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        updated = self.refresh_rendered_fields(fields=update_fields)
+        if update_fields is not None and updated:
+            kwargs['update_fields'] = set(update_fields) | set(updated)
+        super().save(*args, **kwargs)
+
+
 class PublishableModel(models.Model):
     is_published = models.BooleanField(default=False)
     published_at = models.DateTimeField(blank=True, null=True)
@@ -26,3 +81,84 @@ class PublishableModel(models.Model):
     
     class Meta:
         abstract = True
+
+
+class EmailOutbox(TimeStampedModel):
+    """
+    An outgoing email waiting for (or done with) the ``run_outbox`` worker.
+
+    Views call ``apps.core.outbox.enqueue_email`` instead of ``send_mail``
+    so a slow SMTP server never holds up a request.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Outgoing email'
+        verbose_name_plural = 'Email outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+
+def _profile_storage():
+    from .profiling import profile_storage
+    return profile_storage()
+
+
+class RequestProfile(TimeStampedModel):
+    """
+    One profiled request (see ``apps.core.profiling``), with its stacks
+    in a collapsed-stack file kept outside ``MEDIA_ROOT``.
+    """
+    MODE_CHOICES = [
+        ('sample', 'Sampling'),
+        ('cprofile', 'cProfile'),
+    ]
+    
+    path = models.CharField(max_length=500)
+    method = models.CharField(max_length=10)
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES)
+    duration_ms = models.FloatField()
+    queries = models.PositiveIntegerField(blank=True, null=True)
+    requested_by = models.CharField(max_length=150, blank=True)
+    stacks = models.FileField(upload_to='', storage=_profile_storage)
+    total_weight = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f}ms, {self.get_mode_display()})"
+    
+    @property
+    def weight_unit(self):
+        return 'samples' if self.mode == 'sample' else 'µs'
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Request profile'
+        verbose_name_plural = 'Request profiles'
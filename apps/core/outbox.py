@@ -0,0 +1,188 @@
+"""
+Durable outbox for transactional email.
+
+``enqueue_email`` stores a message in ``EmailOutbox`` and returns at once;
+the ``run_outbox`` management command delivers pending messages in
+batches. Each batch shares one SMTP connection. A failed message is
+retried with exponential backoff (``EMAIL_OUTBOX_RETRY_DELAY`` seconds,
+doubled per attempt) until ``EMAIL_OUTBOX_MAX_ATTEMPTS``, then marked
+failed with the last error kept for the admin.
+"""
+
+import logging
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def _build_message(subject, body, from_email, recipients, html_body='', headers=None, connection=None):
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=body,
+        from_email=from_email,
+        to=recipients,
+        headers=headers or None,
+        connection=connection,
+    )
+    if html_body:
+        message.attach_alternative(html_body, 'text/html')
+    return message
+
+
+def enqueue_email(subject, message, recipient_list, from_email=None, html_message=None, headers=None):
+    """
+    Queue an email for the outbox worker; takes the same arguments as
+    ``send_mail``.
+
+    Raises ``BadHeaderError`` straight away for headers that could never
+    be sent, as ``send_mail`` would.
+    """
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    recipients = list(recipient_list)
+
+    # Build the MIME message once so header injection fails here, not in the worker
+    _build_message(subject, message, from_email, recipients, html_message or '', headers).message()
+
+    return EmailOutbox.objects.create(
+        subject=subject,
+        body=message,
+        html_body=html_message or '',
+        from_email=from_email,
+        recipients=recipients,
+        headers=headers or {},
+    )
+
+
+async def aenqueue_email(subject, message, recipient_list, from_email=None, html_message=None, headers=None):
+    """
+    Async version of ``enqueue_email`` for async views.
+    """
+    return await sync_to_async(enqueue_email)(
+        subject, message, recipient_list,
+        from_email=from_email, html_message=html_message, headers=headers
+    )
+
+
+def retry_delay(attempts):
+    """
+    Seconds to wait before the next try after ``attempts`` failures.
+    """
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_DELAY', 60)
+    ceiling = getattr(settings, 'EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600)
+    return min(base * 2 ** (attempts - 1), ceiling)
+
+
+def release_stale_claims():
+    """
+    Put messages back in the queue whose worker died mid-batch.
+    """
+    timeout = getattr(settings, 'EMAIL_OUTBOX_CLAIM_TIMEOUT', 600)
+    return EmailOutbox.objects.filter(
+        status=EmailOutbox.STATUS_SENDING,
+        updated_at__lt=timezone.now() - timedelta(seconds=timeout)
+    ).update(status=EmailOutbox.STATUS_PENDING, updated_at=timezone.now())
+
+
+def claim_batch(batch_size):
+    """
+    Mark up to ``batch_size`` due messages as sending and return them.
+
+    Rows locked by another worker are skipped where the database supports
+    it; the status check on the update keeps two workers from sending the
+    same message elsewhere.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True).filter(
+                status=EmailOutbox.STATUS_PENDING,
+                next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'pk').values_list('pk', flat=True)[:batch_size]
+        )
+        EmailOutbox.objects.filter(
+            pk__in=ids,
+            status=EmailOutbox.STATUS_PENDING
+        ).update(status=EmailOutbox.STATUS_SENDING, updated_at=now)
+    return list(EmailOutbox.objects.filter(pk__in=ids, status=EmailOutbox.STATUS_SENDING, updated_at=now).order_by('pk'))
+
+
+def _record_failure(email, error):
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"
+    if email.attempts >= max_attempts:
+        email.status = EmailOutbox.STATUS_FAILED
+        logger.error(f"Giving up on outbox email {email.pk} after {email.attempts} attempts: {error}")
+    else:
+        email.status = EmailOutbox.STATUS_PENDING
+        email.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay(email.attempts))
+        logger.warning(f"Outbox email {email.pk} failed (attempt {email.attempts}), retrying: {error}")
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at', 'updated_at'])
+
+
+def process_outbox(batch_size=None):
+    """
+    Send one batch of due messages over a single connection.
+
+    Returns a dict with the number of messages ``sent``, ``retrying``
+    and ``failed``.
+    """
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+    stats = {'sent': 0, 'retrying': 0, 'failed': 0}
+
+    release_stale_claims()
+    batch = claim_batch(batch_size)
+    if not batch:
+        return stats
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # The server is unreachable; every message in the batch waits for the next try
+        logger.error(f"Could not open email connection for outbox batch: {e}")
+        for email in batch:
+            _record_failure(email, e)
+            stats['failed' if email.status == EmailOutbox.STATUS_FAILED else 'retrying'] += 1
+        return stats
+
+    try:
+        for email in batch:
+            try:
+                message = _build_message(
+                    email.subject, email.body, email.from_email, email.recipients,
+                    email.html_body, email.headers, connection=connection
+                )
+                message.send()
+            except Exception as e:
+                _record_failure(email, e)
+                stats['failed' if email.status == EmailOutbox.STATUS_FAILED else 'retrying'] += 1
+                # The connection may have been dropped; reconnect for the rest of the batch
+                try:
+                    connection.close()
+                    connection.open()
+                except Exception as reconnect_error:
+                    logger.error(f"Could not reopen email connection: {reconnect_error}")
+                continue
+
+            email.status = EmailOutbox.STATUS_SENT
+            email.attempts += 1
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.save(update_fields=['status', 'attempts', 'sent_at', 'last_error', 'updated_at'])
+            stats['sent'] += 1
+    finally:
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing email connection: {e}")
+
+    return stats
@@ -0,0 +1,237 @@
+"""
+Full-page cache for anonymous visitors, with surrogate-key purging.
+
+``AnonymousPageCacheMiddleware`` (see ``apps.core.middleware``) stores the
+rendered response of the URL names listed in ``PAGE_CACHE_VIEWS``. While
+rendering, views tag the request with the surrogate keys of the content
+it shows:
+
+* ``<app_label>.<model>`` for a whole collection (membership, ordering
+  and facet counts), e.g. ``portfolio.project``;
+* ``<app_label>.<model>:<pk>`` for one object shown on the page.
+
+Every key has a version number in the cache. A cached page remembers the
+versions it was rendered against and is treated as a miss as soon as any
+of them moves, so purging a key is a single ``incr`` no matter how many
+pages carry it.
+
+Scheduled content (``published_at`` in the future) becomes visible without
+a save to purge anything, so a page tagged with a publishable collection
+is stored only until that collection's next ``published_at``, or
+``PAGE_CACHE_TIMEOUT`` if that is sooner.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import time
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils import timezone
+
+from .models import PublishableModel
+
+logger = logging.getLogger(__name__)
+
+CSRF_PLACEHOLDER = '__PAGE_CACHE_CSRF_TOKEN__'
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+DEFAULT_QUERY_PARAMS = ['type', 'tech', 'year', 'search', 'q', 'page', 'cursor', 'sort', 'difficulty', 'category', 'tag', 'price', 'format']
+
+# Query values that mean "no filter" and therefore share a cache entry
+# with the bare URL
+NEUTRAL_QUERY_VALUES = {
+    'page': {'1'},
+    'type': {'all'},
+    'difficulty': {'all'},
+    'price': {'all'},
+}
+
+
+def collection_key(model):
+    return model._meta.label_lower
+
+
+def object_key(obj):
+    return f'{obj._meta.label_lower}:{obj.pk}'
+
+
+def add_surrogate_keys(request, *keys):
+    """
+    Tag the page being rendered with surrogate keys.
+
+    Safe to call on any request: it is a no-op unless the page cache
+    middleware is going to store the response.
+    """
+    surrogate_keys = getattr(request, 'surrogate_keys', None)
+    if surrogate_keys is not None:
+        surrogate_keys.update(keys)
+
+
+def tag_objects(request, objects):
+    """
+    Tag the page with the object key of each item in ``objects``.
+    """
+    if getattr(request, 'surrogate_keys', None) is None:
+        return
+    add_surrogate_keys(request, *(object_key(obj) for obj in objects))
+
+
+def canonical_query_string(query_dict):
+    """
+    Reduce a QueryDict to the parameters that affect page content, in a
+    stable order, dropping empty and neutral values.
+    """
+    allowed = getattr(settings, 'PAGE_CACHE_QUERY_PARAMS', DEFAULT_QUERY_PARAMS)
+    parts = []
+    for param in sorted(allowed):
+        value = query_dict.get(param, '').strip()
+        if not value or value in NEUTRAL_QUERY_VALUES.get(param, ()):
+            continue
+        parts.append((param, value))
+    # Encoded, so a value containing '&' or '=' can't pose as other parameters
+    return urlencode(parts)
+
+
+def page_cache_key(request):
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{canonical_query_string(request.GET)}'
+    return f'page:{hashlib.sha256(url.encode("utf-8")).hexdigest()}'
+
+
+def _version_key(surrogate_key):
+    return f'page:surrogate:{surrogate_key}'
+
+
+def get_surrogate_versions(keys):
+    """
+    Return current versions for ``keys``, initialising missing ones.
+    """
+    version_keys = {_version_key(key): key for key in keys}
+    found = cache.get_many(version_keys.keys())
+    versions = {version_keys[vk]: version for vk, version in found.items()}
+
+    missing = {vk: time.time_ns() for vk in version_keys if vk not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update({version_keys[vk]: version for vk, version in missing.items()})
+    return versions
+
+
+def purge_surrogate_keys(*keys):
+    """
+    Invalidate every cached page tagged with any of ``keys``.
+    """
+    for key in keys:
+        try:
+            cache.incr(_version_key(key))
+        except ValueError:
+            # Never stored, so no page depends on it yet
+            pass
+        except Exception as e:
+            logger.error(f"Failed to purge page cache surrogate key '{key}': {e}")
+
+
+def next_publication(surrogate_keys):
+    """
+    The earliest future ``published_at`` of a published object in the
+    collections among ``surrogate_keys``, or None.
+    """
+    now = timezone.now()
+    upcoming = []
+    for key in surrogate_keys:
+        if ':' in key:
+            continue
+        try:
+            model = apps.get_model(key)
+        except (LookupError, ValueError):
+            continue
+        if not issubclass(model, PublishableModel):
+            continue
+        moment = model._default_manager.filter(
+            is_published=True,
+            published_at__gt=now
+        ).order_by('published_at').values_list('published_at', flat=True).first()
+        if moment is not None:
+            upcoming.append(moment)
+    return min(upcoming, default=None)
+
+
+def scheduled_timeout(timeout, surrogate_keys):
+    """
+    ``timeout``, cut short so it runs out when the next scheduled object
+    in the collections among ``surrogate_keys`` goes live.
+    """
+    try:
+        publication = next_publication(surrogate_keys)
+    except Exception as e:
+        logger.error(f"Failed to look up scheduled content: {e}")
+        return timeout
+    if publication is not None:
+        timeout = min(timeout, max(math.ceil((publication - timezone.now()).total_seconds()), 1))
+    return timeout
+
+
+def page_timeout(surrogate_keys):
+    """
+    ``PAGE_CACHE_TIMEOUT``, cut short so the page expires when the next
+    scheduled object in its collections goes live.
+    """
+    return scheduled_timeout(getattr(settings, 'PAGE_CACHE_TIMEOUT', 600), surrogate_keys)
+
+
+def get_cached_page(request, cache_key):
+    """
+    Return a response for ``cache_key`` if its entry is still current.
+    """
+    entry = cache.get(cache_key)
+    if entry is None:
+        return None
+
+    tags = entry['surrogate_keys']
+    if tags:
+        current = cache.get_many([_version_key(key) for key in tags])
+        for key, version in tags.items():
+            if current.get(_version_key(key)) != version:
+                return None
+
+    content = entry['content']
+    if entry['csrf']:
+        content = content.replace(CSRF_PLACEHOLDER.encode(), get_token(request).encode())
+
+    response = HttpResponse(content, status=entry['status'])
+    for header, value in entry['headers']:
+        response[header] = value
+    return response
+
+
+def store_page(cache_key, response, surrogate_keys, uses_csrf):
+    """
+    Store a rendered response with the versions of its surrogate keys.
+
+    Per-visitor CSRF tokens are replaced by a placeholder and filled in
+    again for each visitor when the page is served from cache.
+    """
+    content = response.content
+    if uses_csrf:
+        content = CSRF_INPUT_RE.sub(
+            lambda match: f'{match.group(1)}{CSRF_PLACEHOLDER}{match.group(2)}',
+            content.decode(response.charset)
+        ).encode(response.charset)
+
+    entry = {
+        'content': content,
+        'status': response.status_code,
+        'headers': [
+            (header, value) for header, value in response.items()
+            if header.lower() not in ('set-cookie', 'content-length')
+        ],
+        'csrf': uses_csrf,
+        'surrogate_keys': get_surrogate_versions(surrogate_keys),
+    }
+    cache.set(cache_key, entry, timeout=page_timeout(surrogate_keys))
@@ -0,0 +1,294 @@
+"""
+Keyset (cursor) pagination for the public listings.
+
+``CursorPaginator`` pages through a queryset using its own ordering
+(``-order_priority, -created_at``, ``-helpful_count, -created_at``,
+``-published_at`` ...) plus the primary key as a tie-breaker. Each page
+ends with an opaque, signed cursor holding the sort keys of its last row.
+The next page is fetched with ``WHERE (keys) < (cursor)``, so every page
+costs the same however deep it is and no OFFSET is ever issued.
+
+Totals are cached per filter signature (``cached_count``) and refreshed
+in a background thread once they get old, so a page hit does not pay
+for a ``COUNT(*)``.
+
+Cursor pagination is opt-in: set ``CURSOR_PAGINATION = True`` or pass a
+``?cursor=`` parameter; otherwise views keep their numbered pages.
+"""
+
+import datetime
+import decimal
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Q
+from django.views.generic.list import MultipleObjectMixin
+
+from .page_cache import canonical_query_string, collection_key, get_surrogate_versions
+
+logger = logging.getLogger(__name__)
+
+CURSOR_SALT = 'apps.core.pagination.cursor'
+
+# Query parameters that do not change which rows a listing contains
+NON_FILTER_PARAMS = ('page', 'cursor', 'sort')
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def cursor_pagination_enabled(request):
+    return getattr(settings, 'CURSOR_PAGINATION', False) or 'cursor' in request.GET
+
+
+def listing_signature(request, name):
+    """
+    Identify a listing and its active filters, ignoring paging and sorting.
+    """
+    params = request.GET.copy()
+    for param in NON_FILTER_PARAMS:
+        params.pop(param, None)
+    return f'{name}?{canonical_query_string(params)}'
+
+
+# Totals
+
+def _refresh_count(queryset, key, timeout):
+    try:
+        cache.set(key, (queryset.count(), time.time()), timeout=timeout)
+    except Exception as e:
+        logger.error(f"Failed to refresh cached listing count {key}: {e}")
+    finally:
+        cache.delete(f'{key}:refreshing')
+        if not connection.in_atomic_block:
+            # Runs on its own thread, which owns this connection
+            connection.close()
+
+
+def cached_count(queryset, signature):
+    """
+    Return ``queryset.count()`` cached under ``signature``.
+
+    The cache key also carries the collection's surrogate-key version, so
+    saving or deleting content recounts on the next request. Counts older
+    than ``PAGINATION_COUNT_STALE_AFTER`` seconds are served as they are
+    while one background thread recounts.
+    """
+    version = get_surrogate_versions([collection_key(queryset.model)])[collection_key(queryset.model)]
+    digest = hashlib.md5(f'{signature}:{version}'.encode('utf-8')).hexdigest()
+    key = f'pagination:count:{digest}'
+    timeout = getattr(settings, 'PAGINATION_COUNT_TIMEOUT', 3600)
+
+    entry = cache.get(key)
+    if entry is None:
+        count = queryset.count()
+        cache.set(key, (count, time.time()), timeout=timeout)
+        return count
+
+    count, computed_at = entry
+    stale_after = getattr(settings, 'PAGINATION_COUNT_STALE_AFTER', 60)
+    if time.time() - computed_at > stale_after and cache.add(f'{key}:refreshing', True, timeout=stale_after):
+        if connection.in_atomic_block:
+            # A new connection would not see this transaction's rows
+            _refresh_count(queryset, key, timeout)
+        else:
+            threading.Thread(
+                target=_refresh_count,
+                args=(queryset.all(), key, timeout),
+                name='pagination-count-refresh',
+                daemon=True
+            ).start()
+    return count
+
+
+# Cursors
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class CursorPage:
+    """
+    One page of a ``CursorPaginator``; quacks enough like a ``Page`` for
+    templates (iteration, ``has_next``, ``has_previous``, ``paginator``).
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over ``queryset`` in its current ordering.
+
+    Ordering keys must be plain field or annotation names and must not be
+    NULL on the rows being paged (all the public listings satisfy this).
+    """
+
+    def __init__(self, queryset, per_page, count_key=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_key = count_key
+        self.ordering = self._resolve_ordering(queryset)
+
+    def _resolve_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        for key in ordering:
+            if not isinstance(key, str) or '__' in key or key.lstrip('-') == '?':
+                raise ValueError(f"Cursor pagination cannot order by {key!r}")
+        names = {key.lstrip('-') for key in ordering}
+        if not names & {'pk', 'id', queryset.model._meta.pk.name}:
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    @property
+    def count(self):
+        if not hasattr(self, '_count'):
+            if self.count_key:
+                self._count = cached_count(self.queryset, self.count_key)
+            else:
+                self._count = self.queryset.count()
+        return self._count
+
+    def _keys(self, obj):
+        return [_encode_value(getattr(obj, key.lstrip('-'))) for key in self.ordering]
+
+    def encode_cursor(self, obj, backwards=False):
+        return signing.dumps({'k': self._keys(obj), 'b': backwards}, salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+            values, backwards = data['k'], data['b']
+        except (signing.BadSignature, KeyError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {e}")
+        if len(values) != len(self.ordering):
+            raise InvalidCursor("Cursor does not match this listing's ordering")
+        return [self._to_python(key, value) for key, value in zip(self.ordering, values)], backwards
+
+    def _to_python(self, key, value):
+        name = key.lstrip('-')
+        meta = self.queryset.model._meta
+        try:
+            field = meta.pk if name == 'pk' else meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as search_rank are stored as-is
+            return value
+        return field.to_python(value)
+
+    def _keyset_filter(self, values, backwards):
+        """
+        Rows strictly after ``values`` in the listing order (before them
+        when paging backwards), as a lexicographic OR of ANDs.
+        """
+        condition = Q()
+        for index, key in enumerate(self.ordering):
+            name = key.lstrip('-')
+            descending = key.startswith('-')
+            operator = 'lt' if descending != backwards else 'gt'
+            clause = Q(**{f'{name}__{operator}': values[index]})
+            for previous_key, previous_value in zip(self.ordering[:index], values[:index]):
+                clause &= Q(**{previous_key.lstrip('-'): previous_value})
+            condition |= clause
+        return condition
+
+    def page(self, cursor=None):
+        """
+        Return the page after (or, for a backwards cursor, before) ``cursor``.
+        """
+        queryset = self.queryset.order_by(*self.ordering)
+        backwards = False
+        if cursor:
+            values, backwards = self.decode_cursor(cursor)
+            if backwards:
+                queryset = queryset.reverse()
+            queryset = queryset.filter(self._keyset_filter(values, backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+
+        return CursorPage(
+            rows,
+            self,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self.encode_cursor(rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode_cursor(rows[0], backwards=True) if has_previous and rows else None,
+        )
+
+
+def paginate_listing(request, queryset, per_page, name):
+    """
+    Cursor-paginate ``queryset`` for ``request``, falling back to the
+    first page on a bad cursor.
+    """
+    paginator = CursorPaginator(queryset, per_page, count_key=listing_signature(request, name))
+    try:
+        return paginator.page(request.GET.get('cursor'))
+    except InvalidCursor as e:
+        logger.warning(f"{e}; showing the first page of {name}")
+        return paginator.page()
+
+
+class CursorPaginationMixin(MultipleObjectMixin):
+    """
+    ListView mixin that switches to cursor pagination when enabled.
+    """
+    cursor_listing_name = None
+
+    def paginate_queryset(self, queryset, page_size):
+        if not cursor_pagination_enabled(self.request):
+            return super().paginate_queryset(queryset, page_size)
+        name = self.cursor_listing_name or queryset.model._meta.label_lower
+        page = paginate_listing(self.request, queryset, page_size, name)
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cursor_pagination'] = cursor_pagination_enabled(self.request)
+        return context
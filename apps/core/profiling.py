@@ -0,0 +1,329 @@
+"""
+On-demand profiling of single requests.
+
+A request is profiled when it carries either
+
+* ``?profile=sample`` (or ``cprofile``, or ``1`` for
+  ``PROFILING_DEFAULT_MODE``) and comes from a logged-in staff user, or
+* an ``X-Profile`` header holding a token from ``manage.py
+  profile_token``, signed with ``SECRET_KEY`` and valid for
+  ``PROFILING_TOKEN_MAX_AGE`` seconds, so production pages can be
+  profiled with curl without a session.
+
+``ProfilingMiddleware`` runs the rest of the request under the chosen
+profiler and stores the result as a ``RequestProfile``: the request
+details plus a collapsed-stack file (one ``frame;frame;frame weight`` line
+per stack, as read by flamegraph.pl and speedscope) in ``PROFILING_DIR``.
+The admin lists stored profiles and draws each one as a flame graph.
+
+Two profilers are available:
+
+* ``sample`` records the stack of the request's thread every
+  ``PROFILING_SAMPLE_INTERVAL`` seconds. Low overhead and exact stacks;
+  weights are sample counts.
+* ``cprofile`` runs ``cProfile`` and turns its caller/callee totals into
+  stacks by splitting each function's time between its callers. Every
+  call is counted, at a large overhead; weights are microseconds.
+"""
+
+import cProfile
+import logging
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+logger = logging.getLogger(__name__)
+
+MODES = ('sample', 'cprofile')
+TOKEN_HEADER = 'X-Profile'
+TOKEN_SALT = 'apps.core.profiling'
+QUERY_FLAG = 'profile'
+
+# Deepest stack kept when turning cProfile totals into stacks, and the
+# smallest share of the total time worth following (the number of call
+# paths grows quickly with depth)
+MAX_CPROFILE_DEPTH = 64
+MIN_CPROFILE_SHARE = 0.001
+
+
+def profile_storage():
+    return FileSystemStorage(location=getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def make_token(mode=None):
+    """
+    A signed ``X-Profile`` header value asking for ``mode``.
+    """
+    return signing.dumps({'mode': mode or default_mode()}, salt=TOKEN_SALT)
+
+
+def default_mode():
+    return getattr(settings, 'PROFILING_DEFAULT_MODE', 'sample')
+
+
+def asks_for_profile(request):
+    return TOKEN_HEADER in request.headers or QUERY_FLAG in request.GET
+
+
+def requested_mode(request):
+    """
+    The profiler ``request`` asked for and may use, or None.
+    """
+    if not getattr(settings, 'PROFILING_ENABLED', True) or not asks_for_profile(request):
+        return None
+
+    token = request.headers.get(TOKEN_HEADER)
+    if token:
+        try:
+            data = signing.loads(
+                token, salt=TOKEN_SALT, max_age=getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600)
+            )
+        except signing.BadSignature:
+            logger.warning(f"Ignoring invalid or expired profiling token for {request.path}")
+            return None
+        mode = data.get('mode')
+        return mode if mode in MODES else default_mode()
+
+    flag = request.GET.get(QUERY_FLAG)
+    if flag:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated or not user.is_staff:
+            return None
+        return flag if flag in MODES else default_mode()
+    return None
+
+
+_ADDRESS = re.compile(r' at 0x[0-9a-f]+')
+
+
+def _short_path(filename):
+    path = str(filename)
+    base = str(settings.BASE_DIR) + '/'
+    if path.startswith(base):
+        return path[len(base):]
+    for marker in ('site-packages/', 'lib/python'):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    return Path(path).name
+
+
+def frame_label(filename, lineno, name):
+    # ';' separates frames in the collapsed format; addresses in cProfile's names for builtins vary per run
+    name = _ADDRESS.sub('', name)
+    return f'{name} ({_short_path(filename)}:{lineno})'.replace(';', ':')
+
+
+def profiled_call(get_response, request):
+    # Where profiles start: frames above this one belong to the server
+    return get_response(request)
+
+
+async def aprofiled_call(get_response, request):
+    return await get_response(request)
+
+
+ROOT_CODES = (profiled_call.__code__, aprofiled_call.__code__)
+
+
+class SamplingProfiler:
+    """
+    Count the stacks of one thread from a background thread.
+    """
+
+    # The switch interval is process-wide: lowered by the first running
+    # sampler and restored when the last one stops
+    _active = 0
+    _active_lock = threading.Lock()
+    _saved_switch_interval = None
+
+    def __init__(self, interval=None):
+        self.interval = interval or getattr(settings, 'PROFILING_SAMPLE_INTERVAL', 0.001)
+        self.stacks = Counter()
+        self._labels = {}
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        # The request thread only gives up the GIL every switch interval (5ms by default)
+        cls = type(self)
+        with cls._active_lock:
+            if cls._active == 0:
+                cls._saved_switch_interval = sys.getswitchinterval()
+            cls._active += 1
+            sys.setswitchinterval(min(sys.getswitchinterval(), self.interval))
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        cls = type(self)
+        with cls._active_lock:
+            cls._active -= 1
+            if cls._active == 0:
+                sys.setswitchinterval(cls._saved_switch_interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = frame_label(code.co_filename, code.co_firstlineno, code.co_qualname)
+                stack.append(label)
+                if code in ROOT_CODES:
+                    break
+                frame = frame.f_back
+            else:
+                # Not inside the request (yet, or any more), or an event loop between steps
+                continue
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return dict(self.stacks)
+
+
+class CProfileProfiler:
+    """
+    ``cProfile``, with its totals spread over call stacks.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def collapsed(self):
+        stats = pstats.Stats(self.profile).stats
+        callees = {}
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((func, edge[3]))
+
+        stacks = Counter()
+        root_keys = {(code.co_filename, code.co_firstlineno, code.co_name) for code in ROOT_CODES}
+        roots = [func for func in stats if func in root_keys]
+        self._min_time = sum(stats[root][3] for root in roots) * MIN_CPROFILE_SHARE
+        for root in roots:
+            self._walk(stats, callees, root, [], stats[root][3], stacks)
+        return {stack: weight for stack, weight in stacks.items() if weight > 0}
+
+    def _walk(self, stats, callees, func, path, time_here, stacks):
+        if time_here < self._min_time:
+            return
+        _, _, own_time, total_time, _ = stats[func]
+        share = time_here / total_time if total_time else 0
+        path = path + [func]
+        label = ';'.join(frame_label(*f) for f in path)
+        stacks[label] += int(own_time * share * 1_000_000)
+        if len(path) >= MAX_CPROFILE_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            # Recursion: the time is already counted in the outer call
+            if callee in path:
+                continue
+            self._walk(stats, callees, callee, path, edge_time * share, stacks)
+
+
+PROFILERS = {
+    'sample': SamplingProfiler,
+    'cprofile': CProfileProfiler,
+}
+
+
+def collapsed_text(stacks):
+    return ''.join(f'{stack} {weight}\n' for stack, weight in sorted(stacks.items()))
+
+
+def parse_collapsed(text):
+    """
+    ``{stack: weight}`` from collapsed-stack text.
+    """
+    stacks = {}
+    for line in text.splitlines():
+        stack, _, weight = line.rpartition(' ')
+        if stack and weight.isdigit():
+            stacks[stack] = stacks.get(stack, 0) + int(weight)
+    return stacks
+
+
+def save_profile(request, response, mode, profiler, duration):
+    """
+    Store ``profiler``'s stacks for ``request`` and prune old profiles.
+    """
+    from .models import RequestProfile
+
+    metrics = getattr(request, 'query_metrics', None)
+    match = getattr(request, 'resolver_match', None)
+    user = getattr(request, 'user', None)
+    profile = RequestProfile(
+        path=request.get_full_path()[:500],
+        method=request.method,
+        view_name=(match.view_name if match is not None else '')[:200],
+        status_code=response.status_code,
+        mode=mode,
+        duration_ms=duration * 1000,
+        queries=metrics.queries if metrics is not None else None,
+        requested_by=(user.get_username() if user is not None and user.is_authenticated else 'token')[:150],
+    )
+    stacks = profiler.collapsed()
+    profile.total_weight = sum(stacks.values())
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{mode}.collapsed"
+    profile.stacks.save(name, ContentFile(collapsed_text(stacks).encode()), save=False)
+    profile.save()
+
+    keep = getattr(settings, 'PROFILING_KEEP', 50)
+    for old in RequestProfile.objects.order_by('-created_at')[keep:]:
+        old.delete()
+    return profile
+
+
+def build_flame_graph(stacks, min_width=0.001):
+    """
+    Lay out a flame graph: ``(rows, total)`` where each row is a list of
+    ``(start, width, name, weight)`` boxes, root row first; start and width
+    are fractions of the whole. Boxes narrower than ``min_width`` are left
+    out along with everything above them.
+    """
+    root = {'weight': 0, 'children': {}}
+    for stack, weight in stacks.items():
+        node = root
+        node['weight'] += weight
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'weight': 0, 'children': {}})
+            node['weight'] += weight
+
+    total = root['weight']
+    rows = []
+
+    def place(node, depth, start):
+        offset = start
+        for name, child in sorted(node['children'].items()):
+            width = child['weight'] / total
+            if width >= min_width:
+                if depth == len(rows):
+                    rows.append([])
+                rows[depth].append((offset / total, width, name, child['weight']))
+                place(child, depth + 1, offset)
+            offset += child['weight']
+
+    if total:
+        place(root, 0, 0)
+    return rows, total
@@ -0,0 +1,253 @@
+"""
+Per-view query and timing budgets.
+
+``QueryBudgetMiddleware`` gives each request a ``RequestMetrics``, kept in
+a context variable so it follows the request into ``sync_to_async``
+threads. Two hooks fill it in:
+
+* ``record_query``, an execute wrapper installed on every database
+  connection, counts queries and the time spent in them.
+* ``TimedDjangoTemplates``, the template backend in ``TEMPLATES``, times
+  top-level template renders and the queries run while rendering (lazy
+  querysets, ``{{ project.tech_stack.count }}`` in a loop).
+
+When the response is ready the metrics are compared with the budget for
+the resolved URL name: ``QUERY_BUDGET_DEFAULT`` updated with the view's
+entry in ``QUERY_BUDGETS``. An overrun is logged, or raised as
+``QueryBudgetExceeded`` when ``QUERY_BUDGET_ACTION`` is 'raise'.
+Totals per view are kept in-process for ``view_report()``.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.template.exceptions import TemplateDoesNotExist
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('query_budget_metrics', default=None)
+
+# Budget keys, each limiting the RequestMetrics attribute of the same name
+BUDGET_KEYS = ('queries', 'db_ms', 'template_ms')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """
+    Queries, DB time and template time for one request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_queries = 0
+        self.started = time.perf_counter()
+        self.total_time = None
+        # View and render time, set by ServerTimingMiddleware
+        self.app_time = None
+        # Section name -> time, queries and calls, filled in by apps.core.timing.timed
+        self.sections = {}
+        self.view_name = None
+        # The request being measured, for code that only has the metrics (the slow-query log)
+        self.request = None
+        self._rendering = False
+
+    @property
+    def db_ms(self):
+        return self.db_time * 1000
+
+    @property
+    def template_ms(self):
+        return self.template_time * 1000
+
+    @property
+    def total_ms(self):
+        end = self.total_time if self.total_time is not None else time.perf_counter() - self.started
+        return end * 1000
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def __str__(self):
+        return (
+            f"{self.queries} queries ({self.template_queries} from templates), "
+            f"{self.db_ms:.1f}ms DB, {self.template_ms:.1f}ms templates, {self.total_ms:.1f}ms total"
+        )
+
+
+def current_metrics():
+    """
+    The ``RequestMetrics`` of the request being handled, or None.
+    """
+    return _current.get()
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+def _install_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorder():
+    """
+    Add ``record_query`` to every database connection, now and as they
+    are opened. Idempotent.
+    """
+    connection_created.connect(_install_wrapper, dispatch_uid='query_budget_install_wrapper')
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        # Templates rendered from inside another template count once, as part of the outer one
+        if metrics is None or metrics._rendering:
+            return super().render(context, request)
+
+        metrics._rendering = True
+        queries_before = metrics.queries
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+            metrics.template_queries += metrics.queries - queries_before
+            metrics._rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, with render times recorded in the
+    current request's metrics.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def get_budget(view_name):
+    """
+    ``{'queries': n, 'db_ms': n, 'template_ms': n}`` for a URL name; a
+    None value means no limit.
+    """
+    budget = dict(getattr(settings, 'QUERY_BUDGET_DEFAULT', {}))
+    budget.update(getattr(settings, 'QUERY_BUDGETS', {}).get(view_name, {}))
+    return budget
+
+
+def check_budget(view_name, metrics, keys=None):
+    """
+    Descriptions of every limit in the view's budget that ``metrics``
+    exceeds; only the budget ``keys`` given are checked if any.
+    """
+    overruns = []
+    for key, limit in get_budget(view_name).items():
+        if limit is None or key not in BUDGET_KEYS or (keys is not None and key not in keys):
+            continue
+        value = getattr(metrics, key)
+        if value > limit:
+            overruns.append(f"{key} {value:.0f} > {limit}")
+    return overruns
+
+
+# URL name -> running totals, for this process
+_view_stats = {}
+_view_stats_lock = threading.Lock()
+
+
+def record_view(view_name, metrics):
+    with _view_stats_lock:
+        stats = _view_stats.setdefault(view_name, {
+            'requests': 0, 'queries': 0, 'max_queries': 0, 'db_ms': 0.0, 'template_ms': 0.0, 'over_budget': 0,
+        })
+        stats['requests'] += 1
+        stats['queries'] += metrics.queries
+        stats['max_queries'] = max(stats['max_queries'], metrics.queries)
+        stats['db_ms'] += metrics.db_ms
+        stats['template_ms'] += metrics.template_ms
+        if check_budget(view_name, metrics):
+            stats['over_budget'] += 1
+
+
+def view_report():
+    """
+    Per-view averages since the process started, busiest first.
+    """
+    with _view_stats_lock:
+        rows = []
+        for view_name, stats in _view_stats.items():
+            requests = stats['requests']
+            rows.append({
+                'view': view_name,
+                'requests': requests,
+                'avg_queries': stats['queries'] / requests,
+                'max_queries': stats['max_queries'],
+                'avg_db_ms': stats['db_ms'] / requests,
+                'avg_template_ms': stats['template_ms'] / requests,
+                'over_budget': stats['over_budget'],
+            })
+    return sorted(rows, key=lambda row: row['requests'], reverse=True)
+
+
+def reset_view_stats():
+    with _view_stats_lock:
+        _view_stats.clear()
+
+
+def enforce_budget(request, metrics):
+    """
+    Record the finished request and log or raise if it went over budget.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.view_name:
+        return
+    metrics.view_name = match.view_name
+    record_view(match.view_name, metrics)
+
+    overruns = check_budget(match.view_name, metrics)
+    if not overruns:
+        logger.debug(f"{match.view_name}: {metrics}")
+        return
+
+    message = f"{match.view_name} ({request.path}) over budget: {', '.join(overruns)}; {metrics}"
+    if getattr(settings, 'QUERY_BUDGET_ACTION', 'log') == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
@@ -0,0 +1,474 @@
+"""
+Full-text search over the site's content.
+
+Every searchable model gets its own index table, ``search_<app>_<model>``,
+with one row per object holding its title and a body built from the
+fields listed in ``SEARCH_INDEXES``:
+
+* SQLite: an FTS5 virtual table keyed by the object's pk (``rowid``),
+  ranked with ``bm25()`` (titles weigh ten times as much as the body);
+* PostgreSQL: a table with a generated, GIN-indexed ``tsvector`` column,
+  ranked with ``ts_rank_cd()``.
+
+Signals (see ``apps.core.signals``) keep the tables current one object at
+a time; ``python manage.py rebuild_search_index`` rebuilds them in bulk.
+On any other database, or before the tables exist, searches fall back to
+``icontains`` over the same fields.
+
+``search_hits`` and ``search_excerpts`` serve the site-wide search: one
+query ranks matches across every index, a second one cuts highlighted
+excerpts for the page being shown.
+"""
+
+import logging
+import re
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+logger = logging.getLogger(__name__)
+
+# Model label -> title field and body fields (related lookups allowed)
+SEARCH_INDEXES = {
+    'blog.article': {
+        'title': 'title',
+        'body': ['excerpt', 'content'],
+    },
+    'portfolio.project': {
+        'title': 'title',
+        'body': ['description', 'detailed_content'],
+    },
+    'solutions.solution': {
+        'title': 'title',
+        'body': ['problem_description', 'solution_content', 'technology__name'],
+    },
+    'services.service': {
+        'title': 'title',
+        'body': ['description', 'detailed_content'],
+    },
+    'solutions.codesnippet': {
+        'title': 'title',
+        'body': ['description', 'language', 'code'],
+    },
+}
+
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+BATCH_SIZE = 500
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_existing_tables = None
+
+
+def index_table(label):
+    return 'search_' + label.replace('.', '_')
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _text_config():
+    return getattr(settings, 'SEARCH_TEXT_CONFIG', 'english')
+
+
+def _max_results():
+    return getattr(settings, 'SEARCH_MAX_RESULTS', 500)
+
+
+def search_backend(conn=None):
+    """
+    Return 'fts5', 'postgres' or None for the given connection.
+    """
+    conn = conn or connection
+    if conn.vendor == 'sqlite':
+        return 'fts5'
+    if conn.vendor == 'postgresql':
+        return 'postgres'
+    return None
+
+
+def index_available(model):
+    """
+    Whether ``model`` can be searched through its index table.
+    """
+    global _existing_tables
+    label = _label(model)
+    if label not in SEARCH_INDEXES or search_backend() is None:
+        return False
+    if _existing_tables is None:
+        try:
+            _existing_tables = set(connection.introspection.table_names())
+        except Exception as e:
+            logger.error(f"Failed to inspect search index tables: {e}")
+            return False
+    return index_table(label) in _existing_tables
+
+
+def _reset_table_cache():
+    global _existing_tables
+    _existing_tables = None
+
+
+# Schema
+
+def create_index_tables(conn=None):
+    backend = search_backend(conn)
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        for label in SEARCH_INDEXES:
+            table = index_table(label)
+            if backend == 'fts5':
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                    f"title, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+                )
+            elif backend == 'postgres':
+                config = _text_config()
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"object_id bigint PRIMARY KEY, "
+                    f"title text NOT NULL DEFAULT '', "
+                    f"body text NOT NULL DEFAULT '', "
+                    f"document tsvector GENERATED ALWAYS AS ("
+                    f"setweight(to_tsvector('{config}'::regconfig, title), 'A') || "
+                    f"setweight(to_tsvector('{config}'::regconfig, body), 'B')) STORED)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_document ON {table} USING GIN (document)"
+                )
+    _reset_table_cache()
+
+
+def drop_index_tables(conn=None):
+    conn = conn or connection
+    if search_backend(conn) is None:
+        return
+    with conn.cursor() as cursor:
+        for label in SEARCH_INDEXES:
+            cursor.execute(f"DROP TABLE IF EXISTS {index_table(label)}")
+    _reset_table_cache()
+
+
+# Indexing
+
+def _documents(model, pks):
+    """
+    Return ``(pk, title, body)`` rows for the given objects of ``model``.
+    """
+    config = SEARCH_INDEXES[_label(model)]
+    fields = [config['title'], *config['body']]
+    rows = model._default_manager.filter(pk__in=pks).values_list('pk', *fields)
+    return [
+        (pk, title or '', '\n'.join(part for part in body if part))
+        for pk, title, *body in rows
+    ]
+
+
+def _write_documents(cursor, table, documents, replace=True):
+    if search_backend() == 'fts5':
+        # FTS5 tables have no upsert; drop any previous row first
+        if replace:
+            _delete_rows(cursor, table, [pk for pk, _, _ in documents])
+        cursor.executemany(f"INSERT INTO {table} (rowid, title, body) VALUES (%s, %s, %s)", documents)
+    else:
+        cursor.executemany(
+            f"INSERT INTO {table} (object_id, title, body) VALUES (%s, %s, %s) "
+            f"ON CONFLICT (object_id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body",
+            documents
+        )
+
+
+def update_index(model, pks):
+    """
+    Re-index the given objects of ``model``.
+    """
+    if not pks or not index_available(model):
+        return
+    table = index_table(_label(model))
+    documents = _documents(model, pks)
+    found = {pk for pk, _, _ in documents}
+    missing = [pk for pk in pks if pk not in found]
+    with connection.cursor() as cursor:
+        if documents:
+            _write_documents(cursor, table, documents)
+        if missing:
+            _delete_rows(cursor, table, missing)
+
+
+def remove_from_index(model, pks):
+    if not pks or not index_available(model):
+        return
+    with connection.cursor() as cursor:
+        _delete_rows(cursor, index_table(_label(model)), pks)
+
+
+def _delete_rows(cursor, table, pks):
+    key = 'rowid' if search_backend() == 'fts5' else 'object_id'
+    cursor.executemany(f"DELETE FROM {table} WHERE {key} = %s", [(pk,) for pk in pks])
+
+
+def rebuild_index(label, get_model=None):
+    """
+    Replace the whole index table for ``label``; returns the row count.
+    """
+    get_model = get_model or django_apps.get_model
+    model = get_model(label)
+    table = index_table(label)
+    backend = search_backend()
+    pks = list(model._default_manager.order_by('pk').values_list('pk', flat=True))
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        for start in range(0, len(pks), BATCH_SIZE):
+            documents = _documents(model, pks[start:start + BATCH_SIZE])
+            _write_documents(cursor, table, documents, replace=False)
+            count += len(documents)
+        if backend == 'fts5':
+            cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+    return count
+
+
+# Querying
+
+def fts5_query(query):
+    """
+    Turn free text into an FTS5 expression: every word must match, the
+    last one as a prefix so partial words still find results.
+    """
+    tokens = TOKEN_RE.findall(query)
+    if not tokens:
+        return ''
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _fallback_filter(model, query):
+    config = SEARCH_INDEXES[_label(model)]
+    condition = Q()
+    for field in [config['title'], *config['body']]:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def search_ids(model, query, limit=None):
+    """
+    Primary keys of ``model`` objects matching ``query``, best first.
+
+    Without an index table the matches come from ``icontains`` and are
+    unranked.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    if not index_available(model):
+        return list(
+            model._default_manager.filter(_fallback_filter(model, query)).values_list('pk', flat=True)
+        )
+
+    table = index_table(_label(model))
+    limit = limit or _max_results()
+    try:
+        with connection.cursor() as cursor:
+            if search_backend() == 'fts5':
+                expression = fts5_query(query)
+                if not expression:
+                    return []
+                cursor.execute(
+                    f"SELECT rowid FROM {table} WHERE {table} MATCH %s "
+                    f"ORDER BY bm25({table}, {TITLE_WEIGHT}, {BODY_WEIGHT}) LIMIT %s",
+                    [expression, limit]
+                )
+            else:
+                config = _text_config()
+                cursor.execute(
+                    f"SELECT object_id FROM {table}, websearch_to_tsquery(%s::regconfig, %s) query "
+                    f"WHERE document @@ query ORDER BY ts_rank_cd(document, query) DESC LIMIT %s",
+                    [config, query, limit]
+                )
+            return [row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Full-text search on {table} failed for '{query}': {e}")
+        return list(
+            model._default_manager.filter(_fallback_filter(model, query)).values_list('pk', flat=True)
+        )
+
+
+def search_queryset(queryset, query, ids=None):
+    """
+    Narrow ``queryset`` to objects matching ``query``, ordered by
+    relevance when the full-text index is available.
+
+    ``ids`` may pass in the result of an earlier ``search_ids`` call for
+    the same query.
+    """
+    model = queryset.model
+    if not index_available(model):
+        return queryset.filter(_fallback_filter(model, query))
+
+    if ids is None:
+        ids = search_ids(model, query)
+    if not ids:
+        return queryset.none()
+
+    rank = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+        output_field=IntegerField()
+    )
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank).order_by('search_rank')
+
+
+# Site-wide search
+
+def _get_model(label):
+    return django_apps.get_model(label)
+
+
+def search_hits(query, labels=None, limit=None):
+    """
+    Search several indexes at once and merge the matches by relevance.
+
+    Returns ``(label, pk)`` pairs, best first. Indexed models are ranked
+    together in a single ``UNION ALL`` query; models without an index
+    table follow, unranked.
+    """
+    query = query.strip()
+    labels = list(labels or SEARCH_INDEXES)
+    if not query:
+        return []
+    limit = limit or _max_results()
+    indexed = [label for label in labels if index_available(_get_model(label))]
+    fallback = [label for label in labels if label not in indexed]
+
+    hits = []
+    expression = fts5_query(query)
+    if indexed and (expression or search_backend() == 'postgres'):
+        arms, params = [], []
+        for label in indexed:
+            table = index_table(label)
+            if search_backend() == 'fts5':
+                arms.append(
+                    f"SELECT CAST(%s AS text), rowid, bm25({table}, {TITLE_WEIGHT}, {BODY_WEIGHT}) "
+                    f"FROM {table} WHERE {table} MATCH %s"
+                )
+                params += [label, expression]
+            else:
+                arms.append(
+                    f"SELECT CAST(%s AS text), object_id, -ts_rank_cd(document, query) "
+                    f"FROM {table}, websearch_to_tsquery(%s::regconfig, %s) query WHERE document @@ query"
+                )
+                params += [label, _text_config(), query]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(' UNION ALL '.join(arms) + ' ORDER BY 3 LIMIT %s', params + [limit])
+                hits = [(label, pk) for label, pk, _ in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Site-wide full-text search failed for '{query}': {e}")
+            fallback = labels
+
+    for label in fallback:
+        hits.extend((label, pk) for pk in search_ids(_get_model(label), query))
+    return hits[:limit]
+
+
+# Private-use characters mark matches until the text has been escaped
+HIGHLIGHT_START = '\ue000'
+HIGHLIGHT_END = '\ue001'
+EXCERPT_WORDS = 32
+
+
+def _highlight_html(text):
+    """
+    Escape ``text`` and turn the highlight markers into ``<mark>`` tags.
+    """
+    html = escape(text).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+    return mark_safe(html)
+
+
+def _highlight_python(text, tokens, excerpt=False):
+    """
+    Mark ``tokens`` in ``text``; for an excerpt, cut a window of words
+    around the first match. Used when there is no index to do it.
+    """
+    if excerpt:
+        words = text.split()
+        lowered = [word.lower() for word in words]
+        start = next(
+            (i for i, word in enumerate(lowered) if any(token in word for token in tokens)),
+            0
+        )
+        start = max(0, start - EXCERPT_WORDS // 4)
+        window = words[start:start + EXCERPT_WORDS]
+        text = ('… ' if start else '') + ' '.join(window) + (' …' if start + EXCERPT_WORDS < len(words) else '')
+    if tokens:
+        pattern = re.compile('|'.join(re.escape(token) for token in tokens), re.IGNORECASE)
+        text = pattern.sub(lambda match: f'{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_END}', text)
+    return text
+
+
+def search_excerpts(query, hits):
+    """
+    Highlighted ``(title, excerpt)`` HTML for each ``(label, pk)`` hit.
+
+    Excerpts of indexed models come from ``snippet()``/``ts_headline()``
+    in one query; matched words are wrapped in ``<mark>``.
+    """
+    by_label = {}
+    for label, pk in hits:
+        by_label.setdefault(label, []).append(pk)
+
+    excerpts = {}
+    indexed = {label: pks for label, pks in by_label.items() if index_available(_get_model(label))}
+    if indexed:
+        arms, params = [], []
+        for label, pks in indexed.items():
+            table = index_table(label)
+            placeholders = ', '.join(['%s'] * len(pks))
+            if search_backend() == 'fts5':
+                arms.append(
+                    f"SELECT CAST(%s AS text), rowid, "
+                    f"highlight({table}, 0, %s, %s), snippet({table}, 1, %s, %s, '…', {EXCERPT_WORDS}) "
+                    f"FROM {table} WHERE {table} MATCH %s AND rowid IN ({placeholders})"
+                )
+                markers = [HIGHLIGHT_START, HIGHLIGHT_END]
+                params += [label, *markers, *markers, fts5_query(query), *pks]
+            else:
+                options = (
+                    f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}", '
+                    f'MaxWords={EXCERPT_WORDS}, MinWords={EXCERPT_WORDS // 2}, '
+                    f'MaxFragments=2, FragmentDelimiter=" … "'
+                )
+                arms.append(
+                    f"SELECT CAST(%s AS text), object_id, "
+                    f"ts_headline(%s::regconfig, title, query, %s), ts_headline(%s::regconfig, body, query, %s) "
+                    f"FROM {table}, websearch_to_tsquery(%s::regconfig, %s) query "
+                    f"WHERE object_id IN ({placeholders})"
+                )
+                config = _text_config()
+                title_options = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}", HighlightAll=true'
+                params += [label, config, title_options, config, options, config, query, *pks]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(' UNION ALL '.join(arms), params)
+                for label, pk, title, excerpt in cursor.fetchall():
+                    excerpts[(label, pk)] = (_highlight_html(title), _highlight_html(excerpt))
+        except Exception as e:
+            logger.error(f"Failed to build search excerpts for '{query}': {e}")
+
+    tokens = [token.lower() for token in TOKEN_RE.findall(query)]
+    for label, pks in by_label.items():
+        missing = [pk for pk in pks if (label, pk) not in excerpts]
+        if not missing:
+            continue
+        for pk, title, body in _documents(_get_model(label), missing):
+            excerpts[(label, pk)] = (
+                _highlight_html(_highlight_python(title, tokens)),
+                _highlight_html(_highlight_python(body, tokens, excerpt=True)),
+            )
+    return excerpts
@@ -0,0 +1,254 @@
+"""
+Signal handlers that keep cached content in step with the database.
+
+Detail payloads: each model is mapped to the payload kinds it can appear
+in; any save, delete or many-to-many change bumps the version of those
+kinds.
+
+Full pages: saving a content object purges the pages that show it (its
+object surrogate key). Creating or deleting it, or changing a field that
+decides where it is listed, also purges its collection key so listings,
+counts and facets are rebuilt. Taxonomy models are shown across many
+pages and always purge their collection key.
+
+Facet indexes: saving or deleting anything that feeds a listing's facets
+marks that index stale so it is rebuilt on the next request.
+
+Search index: searchable objects are re-indexed on save and dropped on
+delete; renaming a technology re-indexes its solutions.
+
+Request profiles: deleting a profile deletes its collapsed-stack file.
+
+Images: new uploads to the fields in ``apps.core.images.IMAGE_FIELDS`` are
+measured before save (size and placeholder) and get their resized variants
+after it.
+"""
+
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+
+from apps.blog.models import Article, Category, Tag
+from apps.portfolio.models import GalleryImage, Project, Technology
+from apps.services.models import Service, ServiceInquiry
+from apps.solutions.models import CodeSnippet, Solution
+
+from .cache import bump_version
+from .facets import invalidate_facets
+from .models import RequestProfile
+from .images import (
+    IMAGE_FIELDS, ensure_variants, get_manifest, has_metadata_fields, image_metadata, save_metadata, set_metadata
+)
+from .search import remove_from_index, update_index
+from .page_cache import collection_key, object_key, purge_surrogate_keys
+
+logger = logging.getLogger(__name__)
+
+# Model -> detail payload kinds that embed it
+DETAIL_DEPENDENCIES = {
+    Article: ('article',),
+    Category: ('article',),
+    Tag: ('article', 'solution'),
+    Project: ('project',),
+    GalleryImage: ('project',),
+    Technology: ('project', 'solution'),
+    Solution: ('solution',),
+    CodeSnippet: ('solution',),
+}
+
+# Many-to-many through models -> detail payload kinds
+M2M_DEPENDENCIES = {
+    Article.tags.through: ('article',),
+    Project.tech_stack.through: ('project',),
+    Project.gallery_images.through: ('project',),
+    Solution.related_solutions.through: ('solution',),
+    CodeSnippet.tags.through: ('solution',),
+}
+
+
+# Models listed on cached pages, tagged per object
+PAGE_CONTENT_MODELS = [Article, Project, Solution, Service, CodeSnippet]
+
+# Models shown across many cached pages, tagged per collection only
+PAGE_TAXONOMY_MODELS = [Technology, Tag, Category, ServiceInquiry]
+
+# Fields that decide whether and where an object appears in a listing
+LISTING_FIELDS = [
+    'is_published', 'published_at', 'is_featured', 'is_active',
+    'order_priority', 'helpful_count', 'project_type', 'difficulty_level',
+    'start_date', 'category_id', 'technology_id', 'price_range',
+]
+
+# Model -> facet indexes built from it
+FACET_DEPENDENCIES = {
+    Project: ('projects',),
+    Technology: ('projects', 'solutions'),
+    Solution: ('solutions',),
+    Article: ('articles',),
+    Category: ('articles',),
+    Tag: ('articles',),
+}
+
+# Many-to-many through models -> facet indexes
+M2M_FACET_DEPENDENCIES = {
+    Article.tags.through: ('articles',),
+    Project.tech_stack.through: ('projects',),
+}
+
+# Models with a full-text search index (see apps.core.search.SEARCH_INDEXES)
+SEARCH_MODELS = [Article, Project, Solution, Service, CodeSnippet]
+
+
+def invalidate_detail_cache(sender, **kwargs):
+    bump_version(*DETAIL_DEPENDENCIES[sender])
+
+
+def invalidate_detail_cache_m2m(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version(*M2M_DEPENDENCIES[sender])
+
+
+def invalidate_facet_index(sender, **kwargs):
+    invalidate_facets(*FACET_DEPENDENCIES[sender])
+
+
+def invalidate_facet_index_m2m(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_facets(*M2M_FACET_DEPENDENCIES[sender])
+
+
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_index(sender, [instance.pk])
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_from_index(sender, [instance.pk])
+
+
+def reindex_technology_solutions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_index(Solution, list(instance.solutions.values_list('pk', flat=True)))
+
+
+def record_image_metadata(sender, instance, raw=False, **kwargs):
+    """
+    Measure new uploads (not yet written to storage at pre_save) and keep
+    their size and placeholder on the instance.
+    """
+    if raw:
+        return
+    for field in IMAGE_FIELDS[sender._meta.label_lower]:
+        if not has_metadata_fields(sender, field):
+            continue
+        file = getattr(instance, field)
+        if not file:
+            set_metadata(instance, field, None)
+        elif not file._committed:
+            try:
+                set_metadata(instance, field, image_metadata(file.file))
+            except Exception as e:
+                logger.error(f"Failed to read image metadata for {file.name}: {e}")
+
+
+def generate_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    images = [
+        (field, getattr(instance, field).name)
+        for field in IMAGE_FIELDS[sender._meta.label_lower]
+        if getattr(instance, field)
+    ]
+
+    def build():
+        for field, name in images:
+            manifest = ensure_variants(name) or get_manifest(name)
+            if not manifest or not has_metadata_fields(sender, field):
+                continue
+            # Files saved to storage before the model (FieldFile.save) or
+            # assigned by name were not measured at pre_save
+            stored = tuple(getattr(instance, f'{field}{suffix}') for suffix in ('_width', '_height', '_placeholder'))
+            if stored != (manifest['width'], manifest['height'], manifest.get('placeholder', '')):
+                save_metadata(sender, field, name, manifest)
+
+    # After commit, so a rolled back upload is not processed
+    if images:
+        transaction.on_commit(build)
+
+
+def _listing_state(instance):
+    return {field: getattr(instance, field) for field in LISTING_FIELDS if hasattr(instance, field)}
+
+
+def snapshot_listing_state(sender, instance, raw=False, **kwargs):
+    """
+    Remember the stored listing fields so post_save can tell whether the
+    object moved between listings.
+    """
+    if raw or instance.pk is None:
+        return
+    fields = [field for field in LISTING_FIELDS if hasattr(instance, field)]
+    instance._listing_state = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+
+
+def purge_page_cache(sender, instance, created=False, **kwargs):
+    keys = [object_key(instance)]
+    previous = getattr(instance, '_listing_state', None)
+    if created or previous is None or previous != _listing_state(instance):
+        keys.append(collection_key(sender))
+    purge_surrogate_keys(*keys)
+
+
+def purge_page_cache_collection(sender, **kwargs):
+    purge_surrogate_keys(collection_key(sender))
+
+
+def purge_page_cache_m2m(sender, instance, action, model, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # Filters such as ?tech= and ?tag= depend on these relations
+    purge_surrogate_keys(object_key(instance), collection_key(type(instance)), collection_key(model))
+
+
+def delete_profile_file(sender, instance, **kwargs):
+    if instance.stacks:
+        try:
+            instance.stacks.delete(save=False)
+        except Exception as e:
+            logger.error(f"Failed to delete profile file {instance.stacks.name}: {e}")
+
+
+def connect_signals():
+    for model in DETAIL_DEPENDENCIES:
+        post_save.connect(invalidate_detail_cache, sender=model, dispatch_uid=f'detail_cache_save_{model._meta.label_lower}')
+        post_delete.connect(invalidate_detail_cache, sender=model, dispatch_uid=f'detail_cache_delete_{model._meta.label_lower}')
+    for through in M2M_DEPENDENCIES:
+        m2m_changed.connect(invalidate_detail_cache_m2m, sender=through, dispatch_uid=f'detail_cache_m2m_{through._meta.label_lower}')
+        m2m_changed.connect(purge_page_cache_m2m, sender=through, dispatch_uid=f'page_cache_m2m_{through._meta.label_lower}')
+
+    for model in PAGE_CONTENT_MODELS:
+        pre_save.connect(snapshot_listing_state, sender=model, dispatch_uid=f'page_cache_snapshot_{model._meta.label_lower}')
+        post_save.connect(purge_page_cache, sender=model, dispatch_uid=f'page_cache_save_{model._meta.label_lower}')
+        post_delete.connect(purge_page_cache, sender=model, dispatch_uid=f'page_cache_delete_{model._meta.label_lower}')
+    for model in PAGE_TAXONOMY_MODELS:
+        post_save.connect(purge_page_cache_collection, sender=model, dispatch_uid=f'page_cache_save_{model._meta.label_lower}')
+        post_delete.connect(purge_page_cache_collection, sender=model, dispatch_uid=f'page_cache_delete_{model._meta.label_lower}')
+
+    for model in FACET_DEPENDENCIES:
+        post_save.connect(invalidate_facet_index, sender=model, dispatch_uid=f'facets_save_{model._meta.label_lower}')
+        post_delete.connect(invalidate_facet_index, sender=model, dispatch_uid=f'facets_delete_{model._meta.label_lower}')
+    for through in M2M_FACET_DEPENDENCIES:
+        m2m_changed.connect(invalidate_facet_index_m2m, sender=through, dispatch_uid=f'facets_m2m_{through._meta.label_lower}')
+
+    for model in SEARCH_MODELS:
+        post_save.connect(update_search_index, sender=model, dispatch_uid=f'search_save_{model._meta.label_lower}')
+        post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f'search_delete_{model._meta.label_lower}')
+    post_save.connect(reindex_technology_solutions, sender=Technology, dispatch_uid='search_save_portfolio.technology')
+
+    post_delete.connect(delete_profile_file, sender=RequestProfile, dispatch_uid='profile_file_delete')
+
+    for label in IMAGE_FIELDS:
+        pre_save.connect(record_image_metadata, sender=apps.get_model(label), dispatch_uid=f'image_metadata_{label}')
+        post_save.connect(generate_image_variants, sender=apps.get_model(label), dispatch_uid=f'image_variants_save_{label}')
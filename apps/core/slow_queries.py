@@ -0,0 +1,168 @@
+"""
+Slow-query log.
+
+``record_slow_query``, an execute wrapper installed on every database
+connection, times each statement. Anything slower than
+``SLOW_QUERY_THRESHOLD_MS`` is logged with its parameters, the URL name
+and path of the request that ran it (from the request metrics of
+``QueryBudgetMiddleware``) and, for reads, the database's query plan:
+``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` elsewhere. Plans that read a
+whole table (SQLite ``SCAN`` without an index, PostgreSQL ``Seq Scan``)
+are flagged.
+
+Entries go into a ring buffer of ``SLOW_QUERY_LOG_SIZE`` slots in the
+default cache, so with a shared cache every worker writes to the same log;
+the oldest entries are overwritten. The admin shows the log at
+``/admin/slow-queries/``.
+"""
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+from .query_budget import current_metrics
+
+logger = logging.getLogger(__name__)
+
+_INDEX_KEY = 'slow_queries:index'
+_MAX_PARAMS_LENGTH = 2000
+
+# Set while the log is writing an entry, so its own EXPLAIN and cache queries are not timed
+_recording = ContextVar('slow_query_recording', default=False)
+
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+# FTS5 lookups show up as "SCAN <table> VIRTUAL TABLE INDEX ..." and are not table scans
+_FULL_SCAN = re.compile(r'\bSCAN (?!.*\b(USING (COVERING )?INDEX|VIRTUAL TABLE INDEX)\b)|\bSeq Scan\b')
+
+
+def _slot_key(slot):
+    return f'slow_queries:slot:{slot}'
+
+
+def log_size():
+    return max(getattr(settings, 'SLOW_QUERY_LOG_SIZE', 200), 1)
+
+
+def explain(connection, sql, params):
+    """
+    The database's plan for ``sql`` as text, one step per line.
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        # The backend's own cursor: no execute wrappers, same placeholder style as the query
+        cursor.cursor.execute(prefix + sql, params)
+        rows = cursor.cursor.fetchall()
+
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail) rows; indent each step under its parent
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node_id] + detail)
+        return '\n'.join(lines)
+    return '\n'.join(' '.join(str(column) for column in row) for row in rows)
+
+
+def _explain_safely(connection, sql, params):
+    # An error inside a PostgreSQL transaction would abort it; contain it in a savepoint
+    savepoint = connection.savepoint() if connection.in_atomic_block else None
+    try:
+        plan = explain(connection, sql, params)
+    except Exception as e:
+        if savepoint:
+            connection.savepoint_rollback(savepoint)
+        logger.warning(f"Could not explain slow query: {e}")
+        return ''
+    if savepoint:
+        connection.savepoint_commit(savepoint)
+    return plan
+
+
+def record_slow_query(execute, sql, params, many, context):
+    if _recording.get():
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100):
+            token = _recording.set(True)
+            try:
+                log_slow_query(context['connection'], sql, params, many, duration_ms)
+            except Exception as e:
+                logger.error(f"Failed to record slow query: {e}")
+            finally:
+                _recording.reset(token)
+
+
+def log_slow_query(connection, sql, params, many, duration_ms):
+    request = getattr(current_metrics(), 'request', None)
+    match = getattr(request, 'resolver_match', None)
+    plan = ''
+    if not many and _EXPLAINABLE.match(sql) and getattr(settings, 'SLOW_QUERY_EXPLAIN', True):
+        plan = _explain_safely(connection, sql, params)
+
+    entry = {
+        'time': timezone.now(),
+        'duration_ms': duration_ms,
+        'database': connection.alias,
+        'sql': sql,
+        'params': repr(params)[:_MAX_PARAMS_LENGTH],
+        'many': many,
+        'view': match.view_name if match is not None else '',
+        'path': request.get_full_path()[:500] if request is not None else '',
+        'plan': plan,
+        'full_scan': bool(_FULL_SCAN.search(plan)),
+    }
+    logger.warning(
+        f"Slow query ({duration_ms:.0f}ms) in {entry['view'] or 'no view'}"
+        f"{' [full scan]' if entry['full_scan'] else ''}: {sql[:200]}"
+    )
+    store_entry(entry)
+
+
+def store_entry(entry):
+    try:
+        index = cache.incr(_INDEX_KEY)
+    except ValueError:
+        cache.add(_INDEX_KEY, 0, timeout=None)
+        index = cache.incr(_INDEX_KEY)
+    entry['id'] = index
+    cache.set(_slot_key(index % log_size()), entry, timeout=None)
+
+
+def recent_slow_queries():
+    """
+    Logged slow queries, newest first.
+    """
+    entries = cache.get_many([_slot_key(slot) for slot in range(log_size())]).values()
+    return sorted(entries, key=lambda entry: entry['id'], reverse=True)
+
+
+def clear_slow_queries():
+    cache.delete_many([_slot_key(slot) for slot in range(log_size())] + [_INDEX_KEY])
+
+
+def _install_wrapper(connection, **kwargs):
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
+
+
+def install_slow_query_log():
+    """
+    Add ``record_slow_query`` to every database connection, now and as
+    they are opened. Idempotent.
+    """
+    connection_created.connect(_install_wrapper, dispatch_uid='slow_query_install_wrapper')
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
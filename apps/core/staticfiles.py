@@ -0,0 +1,132 @@
+"""
+Fingerprinted, precompressed static files.
+
+With ``STATIC_BUILD`` on, ``collectstatic`` goes through
+``PrecompressedManifestStaticFilesStorage``: every file is copied under a
+content-hashed name (``css/chatbot.3f2a9c1e04b7.css``) recorded in
+``staticfiles.json``, and text assets get ``.gz`` siblings, plus ``.br``
+when the optional ``brotli`` package is installed. ``{% static %}`` then
+renders the hashed names.
+
+Third-party files that used to come from a CDN are listed in
+``STATIC_VENDOR_ASSETS``; ``manage.py build_static`` downloads them into
+``static/vendor/`` before collecting, and ``{% vendor_static %}`` links the
+local copy in build mode and the CDN otherwise.
+
+``PrecompressedStaticMiddleware`` serves the result, picking the ``.br`` or
+``.gz`` file the client accepts.
+"""
+
+import gzip
+import logging
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.ico', '.ttf', '.otf', '.eot',
+)
+
+# Smaller files gain nothing from compression
+MIN_COMPRESS_SIZE = 256
+
+VENDOR_DIR = 'vendor'
+
+
+def is_compressible(name):
+    return name.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def _write_if_smaller(path, data, compressed):
+    # Not worth a separate file (or the Content-Encoding) unless it saves 5%
+    if len(compressed) >= len(data) * 0.95:
+        if os.path.exists(path):
+            os.remove(path)
+        return 0
+    with open(path, 'wb') as f:
+        f.write(compressed)
+    return len(compressed)
+
+
+def compress_file(path):
+    """
+    Write ``.gz`` (and ``.br`` if brotli is installed) siblings of the
+    file at ``path``. Returns the bytes saved by the gzip copy.
+    """
+    source_mtime = os.path.getmtime(path)
+    targets = [path + '.gz'] + ([path + '.br'] if brotli is not None else [])
+    # Hashed names never change content, so siblings from an earlier build are reused
+    if all(os.path.exists(target) and os.path.getmtime(target) >= source_mtime for target in targets):
+        return 0
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return 0
+
+    # mtime=0 keeps the output byte-for-byte stable between builds
+    gzipped = _write_if_smaller(path + '.gz', data, gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_if_smaller(path + '.br', data, brotli.compress(data, quality=11))
+    return len(data) - gzipped if gzipped else 0
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ``ManifestStaticFilesStorage`` that also writes compressed siblings of
+    each collected text file, under both its original and hashed name.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        # A template linking a file that was never collected gets the plain
+        # name (and a 404 for that asset) instead of failing the whole page
+        try:
+            return super().stored_name(name)
+        except ValueError as e:
+            logger.warning(f"Static file missing from the manifest build: {e}")
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths) | set(self.hashed_files.values())
+        saved = 0
+        for name in sorted(names):
+            if not is_compressible(name) or not self.exists(name):
+                continue
+            try:
+                saved += compress_file(self.path(name))
+            except OSError as e:
+                logger.error(f"Failed to precompress static file {name}: {e}")
+        logger.info(f"Precompressed static files, {saved / 1024:.0f} KB saved by gzip")
+
+
+def hashed_names():
+    """
+    Set of the content-hashed names in the static manifest; empty unless
+    the manifest storage is in use.
+    """
+    return set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def vendor_path(name):
+    return f'{VENDOR_DIR}/{name}'
+
+
+def vendor_assets():
+    """
+    ``STATIC_VENDOR_ASSETS``: local name under ``vendor/`` -> CDN URL.
+    """
+    return getattr(settings, 'STATIC_VENDOR_ASSETS', {})
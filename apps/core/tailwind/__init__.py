@@ -0,0 +1,242 @@
+"""
+Build-time Tailwind stylesheet.
+
+Instead of compiling CSS in the browser with the Tailwind CDN script,
+``manage.py build_tailwind`` scans the project's templates, JavaScript and
+Python string literals (forms' widget classes, views such as
+``SolutionDetailView.get_difficulty_css_class``) for class names and
+writes a stylesheet with only the utilities found: preflight, the
+``container`` component, then the utilities in Tailwind's order, with
+state, dark mode and responsive variants after them.
+
+Like Tailwind, extraction is deliberately loose: every token that could
+be a class is a candidate, and tokens that are not utilities are ignored.
+Build classes from whole names (``'bg-red-100'``), never by concatenating
+fragments, or they will not be found.
+"""
+
+import ast
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+
+from . import theme
+from .utilities import resolve
+
+# Same idea as Tailwind's default extractor: anything between quotes,
+# whitespace, tags and template braces, not ending in ':' or punctuation
+CANDIDATE = re.compile(r'[^<>"\'`\s{}]*[^<>"\'`\s{}:,;.]')
+
+# (selector prefix, pseudo-class) in Tailwind's variant order
+STATE_VARIANTS = {
+    'first': ('', ':first-child'),
+    'last': ('', ':last-child'),
+    'odd': ('', ':nth-child(odd)'),
+    'even': ('', ':nth-child(even)'),
+    'focus-within': ('', ':focus-within'),
+    'hover': ('', ':hover'),
+    'focus': ('', ':focus'),
+    'focus-visible': ('', ':focus-visible'),
+    'active': ('', ':active'),
+    'disabled': ('', ':disabled'),
+    'group-hover': ('.group:hover ', ''),
+    'group-focus': ('.group:focus ', ''),
+}
+
+# Tailwind's default darkMode: 'media'
+DARK_MEDIA = '(prefers-color-scheme: dark)'
+
+VARIANT_ORDER = list(STATE_VARIANTS) + ['dark'] + [name for name, _ in theme.SCREENS]
+
+PREFLIGHT = Path(__file__).with_name('preflight.css')
+
+Stylesheet = namedtuple('Stylesheet', ['css', 'utilities', 'unknown'])
+
+
+def _project_paths():
+    base_dir = Path(settings.BASE_DIR).resolve()
+    return [
+        Path(config.path) for config in apps.get_app_configs()
+        if Path(config.path).resolve().is_relative_to(base_dir)
+    ]
+
+
+def source_files(output=None):
+    """
+    Templates, JavaScript and Python files of this project (not of
+    Django or third-party apps) that may contain class names.
+    """
+    app_paths = _project_paths()
+    template_dirs = [Path(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+    template_dirs += [path / 'templates' for path in app_paths]
+    static_dirs = [Path(d) for d in settings.STATICFILES_DIRS] + [path / 'static' for path in app_paths]
+
+    files = set()
+    for directory in template_dirs:
+        files.update(p for p in directory.rglob('*') if p.suffix in ('.html', '.txt', '.js'))
+    for directory in static_dirs:
+        files.update(p for p in directory.rglob('*.js') if 'vendor' not in p.parts)
+    for directory in app_paths:
+        files.update(p for p in directory.rglob('*.py') if 'migrations' not in p.parts)
+    if output is not None:
+        files.discard(Path(output))
+    return sorted(f for f in files if f.is_file())
+
+
+def _python_strings(source):
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return []
+    return [node.value for node in ast.walk(tree) if isinstance(node, ast.Constant) and isinstance(node.value, str)]
+
+
+def extract_candidates(paths):
+    """
+    Every token in ``paths`` that could be a class name.
+    """
+    candidates = set()
+    for path in paths:
+        text = Path(path).read_text(encoding='utf-8', errors='ignore')
+        if Path(path).suffix == '.py':
+            for value in _python_strings(text):
+                candidates.update(value.split())
+        else:
+            candidates.update(CANDIDATE.findall(text))
+    return candidates
+
+
+def split_variants(candidate):
+    """
+    ``'dark:hover:bg-white/10'`` -> ``(['dark', 'hover'], 'bg-white/10')``;
+    colons inside ``[...]`` do not split.
+    """
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(candidate):
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == ':' and depth == 0:
+            parts.append(candidate[start:i])
+            start = i + 1
+    parts.append(candidate[start:])
+    return parts[:-1], parts[-1]
+
+
+def escape_class(name):
+    """
+    ``name`` as a CSS class selector (without the dot).
+    """
+    escaped = []
+    for i, char in enumerate(name):
+        if char.isascii() and (char.isalnum() or char in '-_'):
+            if i == 0 and char.isdigit():
+                escaped.append(f'\\3{char} ')
+            else:
+                escaped.append(char)
+        else:
+            escaped.append('\\' + char)
+    return ''.join(escaped)
+
+
+def _media(variants):
+    conditions = []
+    screens = dict(theme.SCREENS)
+    for variant in variants:
+        if variant in screens:
+            conditions.append(f'(min-width: {screens[variant]})')
+        elif variant == 'dark':
+            conditions.append(DARK_MEDIA)
+    return ' and '.join(conditions)
+
+
+def _selector(candidate, variants, suffix):
+    prefix, pseudo = '', ''
+    for variant in variants:
+        group, pseudo_class = STATE_VARIANTS.get(variant, ('', ''))
+        prefix += group
+        pseudo += pseudo_class
+    return f'{prefix}.{escape_class(candidate)}{pseudo}{suffix}'
+
+
+def _block(declarations, important=False):
+    flag = ' !important' if important else ''
+    return '{' + ';'.join(f'{prop}:{value}{flag}' for prop, value in declarations) + '}'
+
+
+def compile_candidate(candidate):
+    """
+    ``(sort_key, media, css_rule, keyframes)`` for a candidate class name,
+    or None if it is not a utility.
+    """
+    variants, utility = split_variants(candidate)
+    if any(v not in VARIANT_ORDER for v in variants) or len(set(variants)) != len(variants):
+        return None
+    important = utility.startswith('!')
+    resolved = resolve(utility.lstrip('!'))
+    if resolved is None:
+        return None
+    order, rule = resolved
+
+    # Like Tailwind, a variant later in VARIANT_ORDER always sorts after every
+    # combination of earlier ones, so md: beats dark:hover:
+    variant_rank = sum(1 << VARIANT_ORDER.index(v) for v in variants)
+    css = _selector(candidate, variants, rule.suffix) + _block(rule.declarations, important)
+    return (variant_rank, order, rule.rank, candidate), _media(variants), css, rule.keyframes
+
+
+def _container():
+    rules = ['.container{width:100%}']
+    for _, width in theme.SCREENS:
+        rules.append(f'@media (min-width: {width}){{.container{{max-width:{width}}}}}')
+    return rules
+
+
+def build_stylesheet(candidates):
+    """
+    The ``Stylesheet`` (css, utility class names, ignored candidates) for
+    a set of candidate class names.
+    """
+    compiled, unknown = [], []
+    for candidate in candidates:
+        result = compile_candidate(candidate)
+        if result is None:
+            unknown.append(candidate)
+        else:
+            compiled.append(result)
+    compiled.sort(key=lambda item: item[0])
+
+    lines = [PREFLIGHT.read_text(encoding='utf-8').strip()]
+    if 'container' in candidates:
+        lines.extend(_container())
+
+    # Consecutive rules under the same media query share one @media block
+    keyframes, current_media, block = set(), None, []
+
+    def flush():
+        if block:
+            lines.append(f'@media {current_media}{{{"".join(block)}}}' if current_media else '\n'.join(block))
+            block.clear()
+
+    for _, media, css, frames in compiled:
+        if media != current_media:
+            flush()
+            current_media = media
+        block.append(css)
+        if frames:
+            keyframes.add(frames)
+    flush()
+
+    for name in sorted(keyframes):
+        lines.append(f'@keyframes {name}{{{theme.KEYFRAMES[name]}}}')
+
+    utilities = sorted(item[0][3] for item in compiled)
+    return Stylesheet('\n'.join(lines) + '\n', utilities, sorted(unknown))
+
+
+def output_path():
+    return Path(settings.STATICFILES_DIRS[0]) / getattr(settings, 'TAILWIND_OUTPUT', 'css/tailwind.css')
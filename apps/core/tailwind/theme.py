@@ -0,0 +1,194 @@
+"""
+Design tokens for the generated stylesheet: Tailwind v3's default theme
+(the parts this site can use) plus the ``tailwind.config`` extensions
+from ``base.html``. Keep the two in step.
+"""
+
+SCREENS = [
+    ('sm', '640px'),
+    ('md', '768px'),
+    ('lg', '1024px'),
+    ('xl', '1280px'),
+    ('2xl', '1536px'),
+]
+
+_SHADES = ('50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950')
+
+
+def _palette(*values):
+    return dict(zip(_SHADES, values))
+
+
+COLORS = {
+    'black': '#000000',
+    'white': '#ffffff',
+    'slate': _palette('#f8fafc', '#f1f5f9', '#e2e8f0', '#cbd5e1', '#94a3b8', '#64748b',
+                      '#475569', '#334155', '#1e293b', '#0f172a', '#020617'),
+    'gray': _palette('#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280',
+                     '#4b5563', '#374151', '#1f2937', '#111827', '#030712'),
+    'red': _palette('#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444',
+                    '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d', '#450a0a'),
+    'orange': _palette('#fff7ed', '#ffedd5', '#fed7aa', '#fdba74', '#fb923c', '#f97316',
+                       '#ea580c', '#c2410c', '#9a3412', '#7c2d12', '#431407'),
+    'amber': _palette('#fffbeb', '#fef3c7', '#fde68a', '#fcd34d', '#fbbf24', '#f59e0b',
+                      '#d97706', '#b45309', '#92400e', '#78350f', '#451a03'),
+    'yellow': _palette('#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308',
+                       '#ca8a04', '#a16207', '#854d0e', '#713f12', '#422006'),
+    'green': _palette('#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e',
+                      '#16a34a', '#15803d', '#166534', '#14532d', '#052e16'),
+    'emerald': _palette('#ecfdf5', '#d1fae5', '#a7f3d0', '#6ee7b7', '#34d399', '#10b981',
+                        '#059669', '#047857', '#065f46', '#064e3b', '#022c22'),
+    'teal': _palette('#f0fdfa', '#ccfbf1', '#99f6e4', '#5eead4', '#2dd4bf', '#14b8a6',
+                     '#0d9488', '#0f766e', '#115e59', '#134e4a', '#042f2e'),
+    'cyan': _palette('#ecfeff', '#cffafe', '#a5f3fc', '#67e8f9', '#22d3ee', '#06b6d4',
+                     '#0891b2', '#0e7490', '#155e75', '#164e63', '#083344'),
+    'sky': _palette('#f0f9ff', '#e0f2fe', '#bae6fd', '#7dd3fc', '#38bdf8', '#0ea5e9',
+                    '#0284c7', '#0369a1', '#075985', '#0c4a6e', '#082f49'),
+    'blue': _palette('#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6',
+                     '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'),
+    'indigo': _palette('#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1',
+                       '#4f46e5', '#4338ca', '#3730a3', '#312e81', '#1e1b4b'),
+    'violet': _palette('#f5f3ff', '#ede9fe', '#ddd6fe', '#c4b5fd', '#a78bfa', '#8b5cf6',
+                       '#7c3aed', '#6d28d9', '#5b21b6', '#4c1d95', '#2e1065'),
+    'purple': _palette('#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7',
+                       '#9333ea', '#7e22ce', '#6b21a8', '#581c87', '#3b0764'),
+    'pink': _palette('#fdf2f8', '#fce7f3', '#fbcfe8', '#f9a8d4', '#f472b6', '#ec4899',
+                     '#db2777', '#be185d', '#9d174d', '#831843', '#500724'),
+    'rose': _palette('#fff1f2', '#ffe4e6', '#fecdd3', '#fda4af', '#fb7185', '#f43f5e',
+                     '#e11d48', '#be123c', '#9f1239', '#881337', '#4c0519'),
+    # theme.extend.colors.primary in base.html
+    'primary': _palette('#eff6ff', '#dbeafe', '#bfdbfe', '#93bbfd', '#60a5fa', '#3b82f6',
+                        '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'),
+}
+
+# Colors without an rgb() form, so no opacity modifier
+SPECIAL_COLORS = {
+    'transparent': 'transparent',
+    'current': 'currentColor',
+    'inherit': 'inherit',
+}
+
+SPACING_KEYS = (
+    '0', '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8', '9', '10', '11', '12',
+    '14', '16', '20', '24', '28', '32', '36', '40', '44', '48', '52', '56', '60', '64', '72', '80', '96',
+)
+
+SPACING = {key: '0px' if key == '0' else f'{float(key) / 4:g}rem' for key in SPACING_KEYS}
+SPACING['px'] = '1px'
+
+FRACTIONS = {
+    f'{n}/{d}': f'{n / d * 100:.6g}%'
+    for d in (2, 3, 4, 5, 6, 12) for n in range(1, d)
+}
+
+FONT_FAMILY = {
+    # theme.extend.fontFamily.sans in base.html
+    'sans': "Inter, system-ui, -apple-system, sans-serif",
+    'serif': 'ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+    'mono': 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+
+FONT_SIZE = {
+    'xs': ('0.75rem', '1rem'),
+    'sm': ('0.875rem', '1.25rem'),
+    'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'),
+    'xl': ('1.25rem', '1.75rem'),
+    '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'),
+    '4xl': ('2.25rem', '2.5rem'),
+    '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'),
+    '7xl': ('4.5rem', '1'),
+    '8xl': ('6rem', '1'),
+    '9xl': ('8rem', '1'),
+}
+
+FONT_WEIGHT = {
+    'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+    'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900',
+}
+
+LINE_HEIGHT = {
+    'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2',
+    '3': '.75rem', '4': '1rem', '5': '1.25rem', '6': '1.5rem', '7': '1.75rem', '8': '2rem', '9': '2.25rem', '10': '2.5rem',
+}
+
+MAX_WIDTH = {
+    'none': 'none', '0': '0rem', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+    '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem',
+    'full': '100%', 'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content', 'prose': '65ch',
+    **{f'screen-{name}': width for name, width in SCREENS},
+}
+
+BORDER_RADIUS = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+    'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+}
+
+BORDER_WIDTH = {'': '1px', '0': '0px', '2': '2px', '4': '4px', '8': '8px'}
+
+BOX_SHADOW = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+    'none': '0 0 #0000',
+}
+
+BLUR = {
+    'none': '0', 'sm': '4px', '': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px', '2xl': '40px', '3xl': '64px',
+}
+
+OPACITY = {str(n): f'{n / 100:g}' for n in (0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65,
+                                             70, 75, 80, 85, 90, 95, 100)}
+
+Z_INDEX = {'0': '0', '10': '10', '20': '20', '30': '30', '40': '40', '50': '50', 'auto': 'auto'}
+
+SCALE = {str(n): f'{n / 100:g}' for n in (0, 50, 75, 90, 95, 100, 105, 110, 125, 150)}
+
+ROTATE = {str(n): f'{n}deg' for n in (0, 1, 2, 3, 6, 12, 45, 90, 180)}
+
+DURATION = {str(n): f'{n}ms' for n in (0, 75, 100, 150, 200, 300, 500, 700, 1000)}
+
+EASING = {
+    'linear': 'linear',
+    'in': 'cubic-bezier(0.4, 0, 1, 1)',
+    'out': 'cubic-bezier(0, 0, 0.2, 1)',
+    'in-out': 'cubic-bezier(0.4, 0, 0.2, 1)',
+}
+
+TRANSITION_PROPERTY = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, '
+        'transform, filter, backdrop-filter',
+    'all': 'all',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+
+# name -> (animation, keyframes name or None)
+ANIMATION = {
+    'none': ('none', None),
+    'spin': ('spin 1s linear infinite', 'spin'),
+    'ping': ('ping 1s cubic-bezier(0, 0, 0.2, 1) infinite', 'ping'),
+    'pulse': ('pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite', 'pulse'),
+    'bounce': ('bounce 1s infinite', 'bounce'),
+    # theme.extend.animation in base.html
+    'fade-in': ('fadeIn 0.5s ease-in-out', 'fadeIn'),
+    'slide-up': ('slideUp 0.5s ease-out', 'slideUp'),
+}
+
+KEYFRAMES = {
+    'spin': 'to{transform:rotate(360deg)}',
+    'ping': '75%,100%{transform:scale(2);opacity:0}',
+    'pulse': '50%{opacity:.5}',
+    'bounce': ('0%,100%{transform:translateY(-25%);animation-timing-function:cubic-bezier(0.8,0,1,1)}'
+               '50%{transform:none;animation-timing-function:cubic-bezier(0,0,0.2,1)}'),
+    'fadeIn': '0%{opacity:0}100%{opacity:1}',
+    'slideUp': '0%{transform:translateY(20px);opacity:0}100%{transform:translateY(0);opacity:1}',
+}
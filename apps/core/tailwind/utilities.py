@@ -0,0 +1,742 @@
+"""
+Tailwind v3 utility classes as CSS declarations.
+
+``resolve('bg-white/80')`` returns a ``Rule`` for a utility name with its
+variant prefixes (``hover:``, ``md:``...) already stripped, or None when
+the name is not a utility this generator knows. Handlers are listed in
+the order Tailwind emits its core plugins, so later utilities win over
+earlier ones the same way they do in Tailwind's own output (``mt-4``
+overrides ``my-2``).
+"""
+
+import re
+from collections import namedtuple
+
+from . import theme
+
+# ``rank`` orders utilities from the same handler (``p-4`` before ``px-4`` before ``pt-4``)
+Rule = namedtuple('Rule', ['declarations', 'suffix', 'keyframes', 'rank'], defaults=['', None, 0])
+
+CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+
+TRANSFORM = ('translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+
+
+def _prefixed(name, prefix):
+    """
+    What follows ``prefix-`` in ``name``; '' when ``name`` is ``prefix``.
+    """
+    if name == prefix:
+        return ''
+    if name.startswith(prefix + '-'):
+        return name[len(prefix) + 1:]
+    return None
+
+
+def _arbitrary(value):
+    """
+    The CSS value of an arbitrary ``[...]`` key (underscores become spaces,
+    operators in ``calc()`` get the spaces CSS needs), else None.
+    """
+    if not (value.startswith('[') and value.endswith(']')) or len(value) < 3:
+        return None
+    value = value[1:-1].replace('_', ' ')
+    if 'calc(' in value:
+        value = re.sub(r'(?<=[\w)%.])([+-])(?=[\w(.])', r' \1 ', value)
+    return value
+
+
+def _lookup(key, *scales):
+    value = _arbitrary(key)
+    if value is not None:
+        return value
+    for scale in scales:
+        if key in scale:
+            return scale[key]
+    return None
+
+
+def _negate(value):
+    if value[0].isdigit():
+        return '-' + value
+    return f'calc({value} * -1)'
+
+
+def _hex_to_rgb(value):
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    if len(value) != 6 or not re.fullmatch(r'[0-9a-fA-F]{6}', value):
+        return None
+    return ' '.join(str(int(value[i:i + 2], 16)) for i in (0, 2, 4))
+
+
+def _color(key):
+    """
+    ``('rgb', 'r g b')`` or ``('raw', value)`` for a color key such as
+    ``gray-500``, ``white``, ``transparent`` or ``[#0A66C2]``.
+    """
+    if key in theme.SPECIAL_COLORS:
+        return 'raw', theme.SPECIAL_COLORS[key]
+    if key.startswith('[#') and key.endswith(']'):
+        rgb = _hex_to_rgb(key[1:-1])
+        return ('rgb', rgb) if rgb else None
+    value = theme.COLORS.get(key)
+    if value is None:
+        family, _, shade = key.rpartition('-')
+        value = theme.COLORS.get(family)
+        value = value.get(shade) if isinstance(value, dict) else None
+    if not isinstance(value, str):
+        return None
+    return 'rgb', _hex_to_rgb(value)
+
+
+def _alpha(key):
+    value = _arbitrary(key)
+    if value is not None:
+        return value
+    return theme.OPACITY.get(key)
+
+
+def _color_value(key, opacity_var=None):
+    """
+    The CSS color for ``key`` (with an optional ``/<opacity>`` modifier)
+    and the declarations that go with it, or None.
+    """
+    key, _, alpha_key = key.partition('/')
+    color = _color(key)
+    if color is None:
+        return None
+    kind, value = color
+    if kind == 'raw':
+        return value, []
+    if alpha_key:
+        alpha = _alpha(alpha_key)
+        if alpha is None:
+            return None
+        return f'rgb({value} / {alpha})', []
+    if opacity_var:
+        return f'rgb({value} / var({opacity_var}))', [(opacity_var, '1')]
+    return f'rgb({value})', []
+
+
+def _color_utility(key, prop, opacity_var=None):
+    resolved = _color_value(key, opacity_var)
+    if resolved is None:
+        return None
+    value, extra = resolved
+    return extra + [(prop, value)]
+
+
+def _table(table):
+    def handler(name, negative):
+        if negative or name not in table:
+            return None
+        return table[name]
+    return handler
+
+
+# --- Layout ---------------------------------------------------------------
+
+_sr_only = _table({
+    'sr-only': [
+        ('position', 'absolute'), ('width', '1px'), ('height', '1px'), ('padding', '0'), ('margin', '-1px'),
+        ('overflow', 'hidden'), ('clip', 'rect(0, 0, 0, 0)'), ('white-space', 'nowrap'), ('border-width', '0'),
+    ],
+    'not-sr-only': [
+        ('position', 'static'), ('width', 'auto'), ('height', 'auto'), ('padding', '0'), ('margin', '0'),
+        ('overflow', 'visible'), ('clip', 'auto'), ('white-space', 'normal'),
+    ],
+})
+
+_pointer_events = _table({
+    'pointer-events-none': [('pointer-events', 'none')],
+    'pointer-events-auto': [('pointer-events', 'auto')],
+})
+
+_visibility = _table({
+    'visible': [('visibility', 'visible')],
+    'invisible': [('visibility', 'hidden')],
+})
+
+_position = _table({
+    value: [('position', value)] for value in ('static', 'fixed', 'absolute', 'relative', 'sticky')
+})
+
+_INSET_SIDES = {
+    'inset-x': ('left', 'right'),
+    'inset-y': ('top', 'bottom'),
+    'inset': ('inset',),
+    'top': ('top',),
+    'right': ('right',),
+    'bottom': ('bottom',),
+    'left': ('left',),
+}
+
+_INSET_RANK = ('inset', 'inset-x', 'inset-y', 'top', 'right', 'bottom', 'left')
+
+_INSET_SCALE = {**theme.SPACING, **theme.FRACTIONS, 'auto': 'auto', 'full': '100%'}
+
+
+def _inset(name, negative):
+    for prefix, props in _INSET_SIDES.items():
+        key = _prefixed(name, prefix)
+        if not key:
+            continue
+        value = _lookup(key, _INSET_SCALE)
+        if value is None or (negative and value == 'auto'):
+            continue
+        if negative:
+            value = _negate(value)
+        return Rule([(prop, value) for prop in props], rank=_INSET_RANK.index(prefix))
+    return None
+
+
+def _z_index(name, negative):
+    key = _prefixed(name, 'z')
+    value = _lookup(key, theme.Z_INDEX) if key else None
+    if value is None:
+        return None
+    return [('z-index', _negate(value) if negative else value)]
+
+
+def _order(name, negative):
+    key = _prefixed(name, 'order')
+    if not key:
+        return None
+    named = {'first': '-9999', 'last': '9999', 'none': '0'}
+    if key in named and not negative:
+        return [('order', named[key])]
+    if key.isdigit() and 1 <= int(key) <= 12:
+        return [('order', f'-{key}' if negative else key)]
+    return None
+
+
+def _grid_column(name, negative):
+    key = _prefixed(name, 'col-span')
+    if negative or not key:
+        return None
+    if key == 'full':
+        return [('grid-column', '1 / -1')]
+    if key.isdigit() and 1 <= int(key) <= 12:
+        return [('grid-column', f'span {key} / span {key}')]
+    return None
+
+
+_MARGIN_SIDES = {
+    'm': ('margin',),
+    'mx': ('margin-left', 'margin-right'),
+    'my': ('margin-top', 'margin-bottom'),
+    'mt': ('margin-top',),
+    'mr': ('margin-right',),
+    'mb': ('margin-bottom',),
+    'ml': ('margin-left',),
+}
+
+
+def _margin(name, negative):
+    prefix, _, key = name.partition('-')
+    props = _MARGIN_SIDES.get(prefix)
+    if props is None or not key:
+        return None
+    value = _lookup(key, theme.SPACING, {'auto': 'auto'})
+    if value is None or (negative and value == 'auto'):
+        return None
+    if negative:
+        value = _negate(value)
+    return Rule([(prop, value) for prop in props], rank=list(_MARGIN_SIDES).index(prefix))
+
+
+def _line_clamp(name, negative):
+    key = _prefixed(name, 'line-clamp')
+    if negative or not key:
+        return None
+    if key == 'none':
+        return [('overflow', 'visible'), ('display', 'block'), ('-webkit-box-orient', 'horizontal'),
+                ('-webkit-line-clamp', 'none')]
+    if key.isdigit() and 1 <= int(key) <= 6:
+        return [('overflow', 'hidden'), ('display', '-webkit-box'), ('-webkit-box-orient', 'vertical'),
+                ('-webkit-line-clamp', key)]
+    return None
+
+
+_display = _table({
+    **{value: [('display', value)] for value in (
+        'block', 'inline-block', 'inline', 'flex', 'inline-flex', 'table', 'grid', 'inline-grid',
+        'contents', 'flow-root', 'list-item',
+    )},
+    'hidden': [('display', 'none')],
+})
+
+# --- Sizing ---------------------------------------------------------------
+
+_SIZE_SCALE = {**theme.SPACING, **theme.FRACTIONS, 'auto': 'auto', 'full': '100%',
+               'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'}
+
+
+def _sized(prop, prefix, *scales):
+    def handler(name, negative):
+        key = _prefixed(name, prefix)
+        if negative or not key:
+            return None
+        value = _lookup(key, *scales)
+        return [(prop, value)] if value is not None else None
+    return handler
+
+
+_height = _sized('height', 'h', _SIZE_SCALE, {'screen': '100vh'})
+_max_height = _sized('max-height', 'max-h', theme.SPACING, {'none': 'none', 'full': '100%', 'screen': '100vh'})
+_min_height = _sized('min-height', 'min-h', {'0': '0px', 'full': '100%', 'screen': '100vh'})
+_width = _sized('width', 'w', _SIZE_SCALE, {'screen': '100vw'})
+_min_width = _sized('min-width', 'min-w', {'0': '0px', 'full': '100%', 'min': 'min-content', 'max': 'max-content'})
+_max_width = _sized('max-width', 'max-w', theme.MAX_WIDTH)
+
+# --- Flexbox and grid -----------------------------------------------------
+
+_flex = _table({
+    'flex-1': [('flex', '1 1 0%')],
+    'flex-auto': [('flex', '1 1 auto')],
+    'flex-initial': [('flex', '0 1 auto')],
+    'flex-none': [('flex', 'none')],
+    'flex-shrink': [('flex-shrink', '1')],
+    'flex-shrink-0': [('flex-shrink', '0')],
+    'shrink': [('flex-shrink', '1')],
+    'shrink-0': [('flex-shrink', '0')],
+    'flex-grow': [('flex-grow', '1')],
+    'flex-grow-0': [('flex-grow', '0')],
+    'grow': [('flex-grow', '1')],
+    'grow-0': [('flex-grow', '0')],
+})
+
+# --- Transforms -----------------------------------------------------------
+
+_origin = _table({
+    f'origin-{key}': [('transform-origin', key.replace('-', ' '))]
+    for key in ('center', 'top', 'top-right', 'right', 'bottom-right', 'bottom', 'bottom-left', 'left', 'top-left')
+})
+
+_TRANSLATE_SCALE = {**theme.SPACING, **theme.FRACTIONS, 'full': '100%'}
+
+
+def _translate(name, negative):
+    for axis in ('x', 'y'):
+        key = _prefixed(name, f'translate-{axis}')
+        if not key:
+            continue
+        value = _lookup(key, _TRANSLATE_SCALE)
+        if value is None:
+            return None
+        return [(f'--tw-translate-{axis}', _negate(value) if negative else value), ('transform', TRANSFORM)]
+    return None
+
+
+def _rotate(name, negative):
+    key = _prefixed(name, 'rotate')
+    value = _lookup(key, theme.ROTATE) if key else None
+    if value is None:
+        return None
+    return [('--tw-rotate', _negate(value) if negative else value), ('transform', TRANSFORM)]
+
+
+def _scale(name, negative):
+    for prefix, axes in (('scale', ('x', 'y')), ('scale-x', ('x',)), ('scale-y', ('y',))):
+        key = _prefixed(name, prefix)
+        if not key or negative:
+            continue
+        value = _lookup(key, theme.SCALE)
+        if value is not None:
+            return [(f'--tw-scale-{axis}', value) for axis in axes] + [('transform', TRANSFORM)]
+    return None
+
+
+_transform = _table({
+    'transform': [('transform', TRANSFORM)],
+    'transform-gpu': [('transform', TRANSFORM.replace('translate(', 'translate3d(').replace(
+        'var(--tw-translate-y))', 'var(--tw-translate-y), 0)'))],
+    'transform-none': [('transform', 'none')],
+})
+
+
+def _animation(name, negative):
+    key = _prefixed(name, 'animate')
+    if negative or key not in theme.ANIMATION:
+        return None
+    value, keyframes = theme.ANIMATION[key]
+    return Rule([('animation', value)], keyframes=keyframes)
+
+
+_cursor = _table({
+    f'cursor-{value}': [('cursor', value)]
+    for value in ('auto', 'default', 'pointer', 'wait', 'text', 'move', 'help', 'not-allowed', 'none', 'grab')
+})
+
+_list_style = _table({
+    'list-inside': [('list-style-position', 'inside')],
+    'list-outside': [('list-style-position', 'outside')],
+    'list-none': [('list-style-type', 'none')],
+    'list-disc': [('list-style-type', 'disc')],
+    'list-decimal': [('list-style-type', 'decimal')],
+})
+
+
+def _grid_template_columns(name, negative):
+    key = _prefixed(name, 'grid-cols')
+    if negative or not key:
+        return None
+    if key == 'none':
+        return [('grid-template-columns', 'none')]
+    if key.isdigit() and 1 <= int(key) <= 12:
+        return [('grid-template-columns', f'repeat({key}, minmax(0, 1fr))')]
+    return None
+
+
+_flex_direction = _table({
+    'flex-row': [('flex-direction', 'row')],
+    'flex-row-reverse': [('flex-direction', 'row-reverse')],
+    'flex-col': [('flex-direction', 'column')],
+    'flex-col-reverse': [('flex-direction', 'column-reverse')],
+    'flex-wrap': [('flex-wrap', 'wrap')],
+    'flex-wrap-reverse': [('flex-wrap', 'wrap-reverse')],
+    'flex-nowrap': [('flex-wrap', 'nowrap')],
+})
+
+_alignment = _table({
+    'items-start': [('align-items', 'flex-start')],
+    'items-end': [('align-items', 'flex-end')],
+    'items-center': [('align-items', 'center')],
+    'items-baseline': [('align-items', 'baseline')],
+    'items-stretch': [('align-items', 'stretch')],
+    'justify-start': [('justify-content', 'flex-start')],
+    'justify-end': [('justify-content', 'flex-end')],
+    'justify-center': [('justify-content', 'center')],
+    'justify-between': [('justify-content', 'space-between')],
+    'justify-around': [('justify-content', 'space-around')],
+    'justify-evenly': [('justify-content', 'space-evenly')],
+})
+
+
+def _gap(name, negative):
+    for rank, (prefix, prop) in enumerate((('gap', 'gap'), ('gap-x', 'column-gap'), ('gap-y', 'row-gap'))):
+        key = _prefixed(name, prefix)
+        if not key or negative:
+            continue
+        value = _lookup(key, theme.SPACING)
+        if value is not None:
+            return Rule([(prop, value)], rank=rank)
+    return None
+
+
+def _space(name, negative):
+    for axis, prop in (('x', 'margin-left'), ('y', 'margin-top')):
+        key = _prefixed(name, f'space-{axis}')
+        if not key:
+            continue
+        value = _lookup(key, theme.SPACING)
+        if value is None:
+            return None
+        return Rule([(prop, _negate(value) if negative else value)], suffix=CHILDREN)
+    return None
+
+
+_overflow = _table({
+    f'overflow{axis}-{value}': [(f'overflow{axis}', value)]
+    for axis in ('', '-x', '-y') for value in ('auto', 'hidden', 'clip', 'visible', 'scroll')
+})
+
+_whitespace = _table({
+    f'whitespace-{value}': [('white-space', value)]
+    for value in ('normal', 'nowrap', 'pre', 'pre-line', 'pre-wrap', 'break-spaces')
+})
+
+# --- Borders --------------------------------------------------------------
+
+_RADIUS_CORNERS = {
+    '': ('border-radius',),
+    't': ('border-top-left-radius', 'border-top-right-radius'),
+    'r': ('border-top-right-radius', 'border-bottom-right-radius'),
+    'b': ('border-bottom-right-radius', 'border-bottom-left-radius'),
+    'l': ('border-top-left-radius', 'border-bottom-left-radius'),
+    'tl': ('border-top-left-radius',),
+    'tr': ('border-top-right-radius',),
+    'br': ('border-bottom-right-radius',),
+    'bl': ('border-bottom-left-radius',),
+}
+
+
+def _border_radius(name, negative):
+    rest = _prefixed(name, 'rounded')
+    if negative or rest is None:
+        return None
+    corner, _, key = rest.partition('-')
+    if corner not in _RADIUS_CORNERS:
+        corner, key = '', rest
+    value = _lookup(key, theme.BORDER_RADIUS) if key else theme.BORDER_RADIUS['']
+    if value is None:
+        return None
+    return Rule([(prop, value) for prop in _RADIUS_CORNERS[corner]], rank=list(_RADIUS_CORNERS).index(corner))
+
+
+_BORDER_SIDES = {
+    '': ('border-width',),
+    'x': ('border-left-width', 'border-right-width'),
+    'y': ('border-top-width', 'border-bottom-width'),
+    't': ('border-top-width',),
+    'r': ('border-right-width',),
+    'b': ('border-bottom-width',),
+    'l': ('border-left-width',),
+}
+
+
+def _border_width(name, negative):
+    rest = _prefixed(name, 'border')
+    if negative or rest is None:
+        return None
+    side, _, key = rest.partition('-')
+    if side not in _BORDER_SIDES:
+        side, key = '', rest
+    value = _lookup(key, theme.BORDER_WIDTH)
+    if value is None or (key.startswith('[') and not value[0].isdigit()):
+        return None
+    return Rule([(prop, value) for prop in _BORDER_SIDES[side]], rank=list(_BORDER_SIDES).index(side))
+
+
+def _color_handler(prefix, prop, opacity_var=None, suffix=''):
+    def handler(name, negative):
+        key = _prefixed(name, prefix)
+        if negative or not key:
+            return None
+        declarations = _color_utility(key, prop, opacity_var)
+        if declarations is None:
+            return None
+        return Rule(declarations, suffix=suffix) if suffix else declarations
+    return handler
+
+
+def _opacity_handler(prefix, var):
+    def handler(name, negative):
+        key = _prefixed(name, prefix)
+        value = _alpha(key) if key and not negative else None
+        return [(var, value)] if value is not None else None
+    return handler
+
+
+_border_color = _color_handler('border', 'border-color', '--tw-border-opacity')
+_border_opacity = _opacity_handler('border-opacity', '--tw-border-opacity')
+
+# --- Backgrounds ----------------------------------------------------------
+
+_background_color = _color_handler('bg', 'background-color', '--tw-bg-opacity')
+_background_opacity = _opacity_handler('bg-opacity', '--tw-bg-opacity')
+
+_GRADIENT_DIRECTIONS = {
+    't': 'to top', 'tr': 'to top right', 'r': 'to right', 'br': 'to bottom right',
+    'b': 'to bottom', 'bl': 'to bottom left', 'l': 'to left', 'tl': 'to top left',
+}
+
+_background_image = _table({
+    'bg-none': [('background-image', 'none')],
+    **{f'bg-gradient-to-{key}': [('background-image', f'linear-gradient({direction}, var(--tw-gradient-stops))')]
+       for key, direction in _GRADIENT_DIRECTIONS.items()},
+})
+
+
+def _transparent(color):
+    # The faded end of a gradient: same color at zero alpha
+    match = re.fullmatch(r'rgb\(([\d ]+)(?: / .*)?\)', color)
+    return f'rgb({match.group(1)} / 0)' if match else 'rgb(255 255 255 / 0)'
+
+
+def _gradient_stops(name, negative):
+    if negative:
+        return None
+    for prefix in ('from', 'via', 'to'):
+        key = _prefixed(name, prefix)
+        if not key:
+            continue
+        resolved = _color_value(key)
+        if resolved is None:
+            return None
+        color = resolved[0]
+        if prefix == 'from':
+            return [('--tw-gradient-from', color), ('--tw-gradient-to', _transparent(color)),
+                    ('--tw-gradient-stops', 'var(--tw-gradient-from), var(--tw-gradient-to)')]
+        if prefix == 'via':
+            return [('--tw-gradient-to', _transparent(color)),
+                    ('--tw-gradient-stops', f'var(--tw-gradient-from), {color}, var(--tw-gradient-to)')]
+        return [('--tw-gradient-to', color)]
+    return None
+
+
+_background_clip = _table({
+    'bg-clip-border': [('background-clip', 'border-box')],
+    'bg-clip-padding': [('background-clip', 'padding-box')],
+    'bg-clip-content': [('background-clip', 'content-box')],
+    'bg-clip-text': [('-webkit-background-clip', 'text'), ('background-clip', 'text')],
+})
+
+_object_fit = _table({
+    f'object-{value}': [('object-fit', value)] for value in ('contain', 'cover', 'fill', 'none', 'scale-down')
+})
+
+# --- Spacing --------------------------------------------------------------
+
+_PADDING_SIDES = {
+    'p': ('padding',),
+    'px': ('padding-left', 'padding-right'),
+    'py': ('padding-top', 'padding-bottom'),
+    'pt': ('padding-top',),
+    'pr': ('padding-right',),
+    'pb': ('padding-bottom',),
+    'pl': ('padding-left',),
+}
+
+
+def _padding(name, negative):
+    prefix, _, key = name.partition('-')
+    props = _PADDING_SIDES.get(prefix)
+    if negative or props is None or not key:
+        return None
+    value = _lookup(key, theme.SPACING)
+    if value is None:
+        return None
+    return Rule([(prop, value) for prop in props], rank=list(_PADDING_SIDES).index(prefix))
+
+
+# --- Typography -----------------------------------------------------------
+
+_text_align = _table({
+    f'text-{value}': [('text-align', value)] for value in ('left', 'center', 'right', 'justify', 'start', 'end')
+})
+
+_font_family = _table({f'font-{key}': [('font-family', value)] for key, value in theme.FONT_FAMILY.items()})
+
+
+def _font_size(name, negative):
+    key = _prefixed(name, 'text')
+    if negative or key not in theme.FONT_SIZE:
+        return None
+    size, line_height = theme.FONT_SIZE[key]
+    return [('font-size', size), ('line-height', line_height)]
+
+
+_font_weight = _table({f'font-{key}': [('font-weight', value)] for key, value in theme.FONT_WEIGHT.items()})
+
+_font_style = _table({
+    'italic': [('font-style', 'italic')],
+    'not-italic': [('font-style', 'normal')],
+})
+
+_line_height = _sized('line-height', 'leading', theme.LINE_HEIGHT)
+
+_text_color = _color_handler('text', 'color', '--tw-text-opacity')
+_text_opacity = _opacity_handler('text-opacity', '--tw-text-opacity')
+
+_text_decoration = _table({
+    'underline': [('text-decoration-line', 'underline')],
+    'overline': [('text-decoration-line', 'overline')],
+    'line-through': [('text-decoration-line', 'line-through')],
+    'no-underline': [('text-decoration-line', 'none')],
+})
+
+_font_smoothing = _table({
+    'antialiased': [('-webkit-font-smoothing', 'antialiased'), ('-moz-osx-font-smoothing', 'grayscale')],
+    'subpixel-antialiased': [('-webkit-font-smoothing', 'auto'), ('-moz-osx-font-smoothing', 'auto')],
+})
+
+_placeholder_color = _color_handler('placeholder', 'color', '--tw-placeholder-opacity', suffix='::placeholder')
+
+# --- Effects --------------------------------------------------------------
+
+_opacity = _sized('opacity', 'opacity', theme.OPACITY)
+
+
+def _box_shadow(name, negative):
+    key = _prefixed(name, 'shadow')
+    if negative or key not in theme.BOX_SHADOW:
+        return None
+    return [('--tw-shadow', theme.BOX_SHADOW[key]),
+            ('box-shadow', 'var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)')]
+
+
+_outline = _table({
+    'outline-none': [('outline', '2px solid transparent'), ('outline-offset', '2px')],
+    'outline': [('outline-style', 'solid')],
+})
+
+_RING_WIDTH = {'': '3px', '0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'}
+
+
+def _ring_width(name, negative):
+    key = _prefixed(name, 'ring')
+    if negative or key is None or key not in _RING_WIDTH:
+        return None
+    return [
+        ('--tw-ring-offset-shadow', 'var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)'),
+        ('--tw-ring-shadow', f'var(--tw-ring-inset) 0 0 0 calc({_RING_WIDTH[key]} + var(--tw-ring-offset-width)) var(--tw-ring-color)'),
+        ('box-shadow', 'var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)'),
+    ]
+
+
+_ring_color = _color_handler('ring', '--tw-ring-color', '--tw-ring-opacity')
+_ring_opacity = _opacity_handler('ring-opacity', '--tw-ring-opacity')
+
+
+def _backdrop_blur(name, negative):
+    key = _prefixed(name, 'backdrop-blur')
+    if negative or key is None or key not in theme.BLUR:
+        return None
+    value = f'blur({theme.BLUR[key]})'
+    return [('-webkit-backdrop-filter', value), ('backdrop-filter', value)]
+
+
+# --- Transitions and animation --------------------------------------------
+
+def _transition(name, negative):
+    key = _prefixed(name, 'transition')
+    if negative or key is None:
+        return None
+    if key == 'none':
+        return [('transition-property', 'none')]
+    if key not in theme.TRANSITION_PROPERTY:
+        return None
+    return [('transition-property', theme.TRANSITION_PROPERTY[key]),
+            ('transition-timing-function', theme.EASING['in-out']),
+            ('transition-duration', '150ms')]
+
+
+_duration = _sized('transition-duration', 'duration', theme.DURATION)
+_easing = _sized('transition-timing-function', 'ease', theme.EASING)
+
+_scroll_behavior = _table({
+    'scroll-smooth': [('scroll-behavior', 'smooth')],
+    'scroll-auto': [('scroll-behavior', 'auto')],
+})
+
+HANDLERS = [
+    _sr_only, _pointer_events, _visibility, _position, _inset, _z_index, _order, _grid_column, _margin,
+    _line_clamp, _display, _height, _max_height, _min_height, _width, _min_width, _max_width, _flex,
+    _origin, _translate, _rotate, _scale, _transform, _animation, _cursor, _scroll_behavior, _list_style,
+    _grid_template_columns, _flex_direction, _alignment, _gap, _space, _overflow, _whitespace,
+    _border_radius, _border_width, _border_color, _border_opacity, _background_color,
+    _background_opacity, _background_image, _gradient_stops, _background_clip, _object_fit, _padding,
+    _text_align, _font_family, _font_size, _font_weight, _font_style, _line_height, _text_color,
+    _text_opacity, _text_decoration, _font_smoothing, _placeholder_color, _opacity, _box_shadow,
+    _outline, _ring_width, _ring_color, _ring_opacity, _backdrop_blur, _transition, _duration, _easing,
+]
+
+
+def resolve(name):
+    """
+    ``(order, Rule)`` for utility ``name`` (without variants), or None.
+    """
+    negative = name.startswith('-')
+    if negative:
+        name = name[1:]
+    if not name:
+        return None
+    for order, handler in enumerate(HANDLERS):
+        result = handler(name, negative)
+        if result is not None:
+            return order, result if isinstance(result, Rule) else Rule(result)
+    return None
@@ -0,0 +1,68 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+
+from apps.core.images import get_manifest, has_metadata_fields
+
+register = template.Library()
+
+
+def _srcset(storage, variants):
+    return ', '.join(f'{storage.url(path)} {width}w' for width, path in variants)
+
+
+def _stored_metadata(image):
+    """
+    Width, height and placeholder saved on the model next to the image
+    field, if it has them.
+    """
+    instance = getattr(image, 'instance', None)
+    field = getattr(image, 'field', None)
+    if instance is None or field is None or not has_metadata_fields(type(instance), field.name):
+        return None
+    width = getattr(instance, f'{field.name}_width')
+    if width is None:
+        return None
+    return {
+        'width': width,
+        'height': getattr(instance, f'{field.name}_height'),
+        'placeholder': getattr(instance, f'{field.name}_placeholder'),
+    }
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', **attrs):
+    """
+    Render an uploaded image as a ``<picture>`` with WebP and JPEG/PNG
+    ``srcset``s of its resized variants, or a plain ``<img>`` until the
+    variants exist. Width, height and the blurred placeholder come from
+    the model when stored there, so the layout does not shift.
+    Usage: {% responsive_image project.featured_image alt=project.title sizes="(min-width: 1024px) 50vw, 100vw" class="w-full" %}
+    """
+    if not image:
+        return ''
+
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    manifest = get_manifest(image.name)
+    metadata = _stored_metadata(image) or manifest
+    if metadata:
+        attrs.setdefault('width', metadata['width'])
+        attrs.setdefault('height', metadata['height'])
+        if metadata.get('placeholder'):
+            attrs.setdefault('style', f"background: url({metadata['placeholder']}) center / cover no-repeat")
+    extra = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+
+    if manifest is None:
+        return format_html('<img src="{}" alt="{}"{}>', image.url, alt, extra)
+
+    storage = getattr(image, 'storage', default_storage)
+    fallback = manifest['variants'][manifest['fallback']]
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}"{}>'
+        '</picture>',
+        _srcset(storage, manifest['variants']['webp']), sizes,
+        storage.url(fallback[-1][1]), _srcset(storage, fallback), sizes, alt, extra
+    )
@@ -0,0 +1,34 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+
+from apps.core.staticfiles import vendor_assets, vendor_path
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_static(name):
+    """
+    URL of a third-party asset from ``STATIC_VENDOR_ASSETS``: the vendored,
+    fingerprinted copy in static build mode, the CDN otherwise.
+    Usage: <script src="{% vendor_static 'flowbite/flowbite.min.js' %}"></script>
+    """
+    assets = vendor_assets()
+    if name not in assets:
+        raise template.TemplateSyntaxError(f"Unknown vendor asset '{name}'; add it to STATIC_VENDOR_ASSETS")
+    if getattr(settings, 'STATIC_BUILD', False):
+        return static(vendor_path(name))
+    return assets[name]
+
+
+@register.simple_tag
+def tailwind_stylesheet_url():
+    """
+    URL of the stylesheet written by ``build_tailwind`` in static build
+    mode, else '' (the page falls back to the Tailwind CDN script).
+    Usage: {% tailwind_stylesheet_url as tailwind_css %}
+    """
+    if not getattr(settings, 'STATIC_BUILD', False):
+        return ''
+    return static(getattr(settings, 'TAILWIND_OUTPUT', 'css/tailwind.css'))
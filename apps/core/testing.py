@@ -0,0 +1,68 @@
+"""
+Test helpers for query budgets.
+
+``QueryBudgetTestMixin`` requests every argument-free URL of a urlconf and
+fails when a view runs more queries than its budget (``QUERY_BUDGETS``,
+falling back to ``QUERY_BUDGET_DEFAULT``). Timing budgets are not checked
+by default since test machines vary; pass ``keys`` to include them::
+
+    from django.test import TestCase
+    from apps.core.testing import QueryBudgetTestMixin
+
+    class PageBudgetTests(QueryBudgetTestMixin, TestCase):
+        def test_pages_within_budget(self):
+            self.assertQueryBudgets('apps.pages.urls')
+"""
+
+from importlib import import_module
+
+from django.test import override_settings
+from django.urls import URLPattern, reverse
+
+from .query_budget import check_budget
+
+
+def budget_urls(urlconf='apps.pages.urls'):
+    """
+    Yield ``(url_name, path)`` for every named pattern in ``urlconf`` that
+    takes no arguments.
+    """
+    module = import_module(urlconf)
+    namespace = getattr(module, 'app_name', None)
+    for pattern in module.urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name or pattern.pattern.converters:
+            continue
+        name = f'{namespace}:{pattern.name}' if namespace else pattern.name
+        yield name, reverse(name)
+
+
+def measure_url(client, path, **extra):
+    """
+    GET ``path`` with the page cache off and return ``(response,
+    metrics)``; budgets are recorded, not raised.
+    """
+    with override_settings(PAGE_CACHE_ENABLED=False, QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_ACTION='log'):
+        response = client.get(path, **extra)
+    request = getattr(response, 'wsgi_request', None) or getattr(response, 'asgi_request', None)
+    return response, getattr(request, 'query_metrics', None)
+
+
+class QueryBudgetTestMixin:
+    """
+    Assertions for ``django.test.TestCase`` subclasses.
+    """
+    budget_keys = ('queries',)
+
+    def assertWithinBudget(self, path, view_name=None, keys=None, **extra):
+        response, metrics = measure_url(self.client, path, **extra)
+        self.assertLess(response.status_code, 500, f"{path} returned {response.status_code}")
+        self.assertIsNotNone(metrics, 'QueryBudgetMiddleware is not in MIDDLEWARE')
+        view_name = view_name or response.resolver_match.view_name
+        overruns = check_budget(view_name, metrics, keys=keys or self.budget_keys)
+        self.assertFalse(overruns, f"{view_name} ({path}) over budget: {', '.join(overruns)}; {metrics}")
+        return metrics
+
+    def assertQueryBudgets(self, urlconf='apps.pages.urls', keys=None):
+        for view_name, path in budget_urls(urlconf):
+            with self.subTest(view=view_name):
+                self.assertWithinBudget(path, view_name=view_name, keys=keys)
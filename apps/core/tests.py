@@ -1,3 +1,155 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from apps.blog.models import Article, Category
+
+from .cache import payload_timeout
+from .models import EmailOutbox
+from .outbox import claim_batch, enqueue_email, process_outbox
+from .page_cache import page_cache_key, page_timeout
+from .slow_queries import _FULL_SCAN
+from .view_counters import CacheViewCounterBuffer
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP server went away')
+
+
+class CacheViewCounterBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.buffer = CacheViewCounterBuffer()
+
+    def test_hits_after_a_drain_are_kept(self):
+        self.buffer.add(Article, 1)
+        self.buffer.add(Article, 1)
+        self.assertEqual(self.buffer.drain(), {('blog.article', 1): 2})
+
+        for _ in range(3):
+            self.buffer.add(Article, 1)
+        self.assertEqual(self.buffer.size(), 3)
+        self.assertEqual(self.buffer.drain(), {('blog.article', 1): 3})
+        self.assertEqual(self.buffer.drain(), {})
+
+
+class EmailOutboxTests(TestCase):
+    def enqueue(self):
+        return enqueue_email('Subject', 'Body', ['visitor@example.com'], from_email='site@example.com')
+
+    def test_enqueued_email_is_sent(self):
+        email = self.enqueue()
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(process_outbox(), {'sent': 1, 'retrying': 0, 'failed': 0})
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_SENT)
+        self.assertEqual(email.attempts, 1)
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['visitor@example.com'])
+
+    @override_settings(
+        EMAIL_BACKEND='apps.core.tests.FailingEmailBackend',
+        EMAIL_OUTBOX_RETRY_DELAY=60,
+        EMAIL_OUTBOX_MAX_ATTEMPTS=5,
+    )
+    def test_failure_backs_off(self):
+        email = self.enqueue()
+        before = timezone.now()
+
+        self.assertEqual(process_outbox(), {'sent': 0, 'retrying': 1, 'failed': 0})
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('SMTP server went away', email.last_error)
+        self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=60))
+
+        # Not due yet, so the next run leaves it alone
+        self.assertEqual(process_outbox(), {'sent': 0, 'retrying': 0, 'failed': 0})
+
+    @override_settings(EMAIL_BACKEND='apps.core.tests.FailingEmailBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_max_attempts_marks_failed(self):
+        email = self.enqueue()
+        process_outbox()
+        EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+
+        self.assertEqual(process_outbox(), {'sent': 0, 'retrying': 0, 'failed': 1})
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_FAILED)
+        self.assertEqual(email.attempts, 2)
+
+    def test_claimed_rows_are_not_claimed_again(self):
+        first, second = self.enqueue(), self.enqueue()
+
+        claimed = claim_batch(10)
+        self.assertEqual([email.pk for email in claimed], [first.pk, second.pk])
+        self.assertEqual(claim_batch(10), [])
+        self.assertEqual(process_outbox(), {'sent': 0, 'retrying': 0, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 0)
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=600)
+class PageTimeoutTests(TestCase):
+    def schedule_article(self, delay):
+        return Article.objects.create(
+            title='Scheduled', slug='scheduled', excerpt='', content='',
+            author=User.objects.create_user('author'),
+            category=Category.objects.create(name='News', slug='news'),
+            is_published=True, published_at=timezone.now() + delay,
+        )
+
+    def test_default_timeout_without_scheduled_content(self):
+        self.assertEqual(page_timeout({'blog.article', 'blog.article:1'}), 600)
+
+    def test_expires_when_scheduled_content_goes_live(self):
+        self.schedule_article(timedelta(seconds=90))
+        self.assertTrue(85 <= page_timeout({'blog.article'}) <= 90)
+        # Only collection keys count
+        self.assertEqual(page_timeout({'blog.article:1'}), 600)
+
+    def test_later_publication_keeps_the_default(self):
+        self.schedule_article(timedelta(hours=2))
+        self.assertEqual(page_timeout({'blog.article'}), 600)
+
+    @override_settings(DETAIL_CACHE_TIMEOUT=3600)
+    def test_detail_payloads_expire_when_scheduled_content_goes_live(self):
+        self.schedule_article(timedelta(seconds=90))
+        self.assertTrue(85 <= payload_timeout('article') <= 90)
+        self.assertEqual(payload_timeout('project'), 3600)
+
+
+class PageCacheKeyTests(TestCase):
+    def test_encoded_values_do_not_collide_with_other_parameters(self):
+        factory = RequestFactory()
+        encoded = factory.get('/portfolio/?search=foo%26type%3Dweb')
+        filtered = factory.get('/portfolio/?search=foo&type=web')
+        self.assertNotEqual(page_cache_key(encoded), page_cache_key(filtered))
+
+    def test_parameter_order_and_neutral_values_share_a_key(self):
+        factory = RequestFactory()
+        self.assertEqual(
+            page_cache_key(factory.get('/portfolio/?type=web&search=foo&page=1&utm_source=x')),
+            page_cache_key(factory.get('/portfolio/?search=foo&type=web'))
+        )
+
+
+class FullScanPatternTests(TestCase):
+    def test_table_scans_are_flagged(self):
+        self.assertTrue(_FULL_SCAN.search('SCAN blog_article'))
+        self.assertTrue(_FULL_SCAN.search('Seq Scan on blog_article'))
+
+    def test_index_and_full_text_lookups_are_not_flagged(self):
+        for plan in (
+            'SCAN blog_article USING INDEX blog_article_published_at',
+            'SCAN blog_article USING COVERING INDEX blog_article_slug',
+            'SEARCH blog_article USING INTEGER PRIMARY KEY (rowid=?)',
+            'SCAN search_blog_article VIRTUAL TABLE INDEX 0:M2',
+        ):
+            self.assertIsNone(_FULL_SCAN.search(plan), plan)
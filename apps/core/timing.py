@@ -0,0 +1,112 @@
+"""
+Named section timers and the ``Server-Timing`` response header.
+
+Wrap the expensive blocks of a view in ``timed``::
+
+    from apps.core.timing import timed
+
+    with timed('portfolio.facets'):
+        context['facets'] = project_facets(queryset)
+
+    @timed('solutions.filters')
+    def get_solutions(self):
+        ...
+
+Each section's time and query count are added to the current request's
+``RequestMetrics`` (see ``apps.core.query_budget``); outside a request, or
+with ``QUERY_BUDGET_ENABLED`` off, ``timed`` does nothing. The metrics are
+turned into a ``Server-Timing`` header by ``server_timing_header`` so the
+sections show up in the browser's network panel next to the DB, template,
+view and middleware phases. ``SERVER_TIMING`` decides who gets the header:
+'all', 'staff' or 'off'.
+"""
+
+import re
+import time
+from contextlib import ContextDecorator
+
+from django.conf import settings
+
+from .query_budget import current_metrics
+
+# Server-Timing metric names are HTTP tokens
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+class timed(ContextDecorator):
+    """
+    Time a block or function as the named section of the current request.
+    Sections with the same name are summed.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._entry = None
+
+    def _recreate_cm(self):
+        # A fresh instance per call, so a decorated function can run in several threads at once
+        return type(self)(self.name)
+
+    def __enter__(self):
+        metrics = current_metrics()
+        if metrics is not None:
+            self._entry = (metrics, metrics.queries, time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._entry is None:
+            return False
+        metrics, queries_before, started = self._entry
+        self._entry = None
+        section = metrics.sections.setdefault(self.name, {'time': 0.0, 'queries': 0, 'calls': 0})
+        section['time'] += time.perf_counter() - started
+        section['queries'] += metrics.queries - queries_before
+        section['calls'] += 1
+        return False
+
+
+def server_timing_enabled(request):
+    """
+    Whether ``request`` should get a ``Server-Timing`` header.
+    """
+    mode = getattr(settings, 'SERVER_TIMING', 'off')
+    if mode == 'all':
+        return True
+    if mode == 'staff':
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+    return False
+
+
+def _queries(count):
+    return f"{count} quer{'y' if count == 1 else 'ies'}"
+
+
+def _metric(name, ms, desc=None):
+    value = f'{_UNSAFE_NAME.sub("_", name)};dur={ms:.1f}'
+    if desc:
+        value += f';desc="{desc}"'
+    return value
+
+
+def server_timing_header(metrics):
+    """
+    The ``Server-Timing`` value for a finished request: DB, templates, the
+    view (``app``), the middleware around it (``mw``), the total, then each
+    timed section in the order it first ran.
+    """
+    parts = [
+        _metric('db', metrics.db_ms, _queries(metrics.queries)),
+        _metric('tpl', metrics.template_ms, 'templates'),
+    ]
+    if metrics.app_time is not None:
+        app_ms = metrics.app_time * 1000
+        parts.append(_metric('app', app_ms, 'view and render'))
+        parts.append(_metric('mw', max(metrics.total_ms - app_ms, 0), 'middleware'))
+    parts.append(_metric('total', metrics.total_ms))
+    for name, section in metrics.sections.items():
+        desc = _queries(section['queries'])
+        if section['calls'] > 1:
+            desc += f", {section['calls']} calls"
+        parts.append(_metric(name, section['time'] * 1000, desc))
+    return ', '.join(parts)
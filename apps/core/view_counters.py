@@ -0,0 +1,284 @@
+"""
+Buffered view counters for detail pages.
+
+Detail views call ``record_view(obj)`` instead of issuing an
+``UPDATE ... view_count = view_count + 1`` on every hit. Increments are
+collected in a buffer and written back in batched UPDATEs, either every
+``VIEW_COUNTER_FLUSH_INTERVAL`` seconds or as soon as
+``VIEW_COUNTER_FLUSH_THRESHOLD`` hits are pending, so the request path
+stays read-only.
+
+Two buffers are available through ``VIEW_COUNTER_BUFFER``:
+
+* ``memory`` keeps pending hits in process memory (default).
+* ``cache`` keeps them in the default Django cache so several worker
+  processes share one buffer and any of them (or the
+  ``flush_view_counts`` command) can write it back.
+"""
+
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _counter_key(model, pk):
+    return (model._meta.label_lower, pk)
+
+
+class MemoryViewCounterBuffer:
+    """
+    Process-local buffer of pending view increments.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+
+    def add(self, model, pk, amount=1):
+        with self._lock:
+            self._pending[_counter_key(model, pk)] += amount
+            return self._pending[_counter_key(model, pk)]
+
+    def pending(self, model, pk):
+        with self._lock:
+            return self._pending.get(_counter_key(model, pk), 0)
+
+    def size(self):
+        with self._lock:
+            return sum(self._pending.values())
+
+    def drain(self):
+        """
+        Return all pending increments and reset the buffer.
+        """
+        with self._lock:
+            pending, self._pending = dict(self._pending), defaultdict(int)
+        return pending
+
+    def restore(self, pending):
+        """
+        Put increments back after a failed flush so they are not lost.
+        """
+        with self._lock:
+            for key, amount in pending.items():
+                self._pending[key] += amount
+
+
+class CacheViewCounterBuffer:
+    """
+    Buffer shared between processes through the default cache.
+
+    Each object gets its own counter key updated with ``cache.incr``; a
+    registry key lists the counters that have pending hits. Registry
+    updates are best effort: a counter missed by one flush keeps its
+    value and is picked up once it is registered again.
+    """
+
+    registry_key = 'view_counters:registry'
+    key_prefix = 'view_counters:pending'
+
+    def _cache_key(self, label, pk):
+        return f'{self.key_prefix}:{label}:{pk}'
+
+    def add(self, model, pk, amount=1):
+        label, pk = _counter_key(model, pk)
+        key = self._cache_key(label, pk)
+        if cache.add(key, amount, timeout=None):
+            total = amount
+        else:
+            try:
+                total = cache.incr(key, amount)
+            except ValueError:
+                # The key expired or was drained between add() and incr()
+                cache.set(key, amount, timeout=None)
+                total = amount
+        # Drained counters stay behind at 0 and the registry is emptied on
+        # every drain, so register on every hit, not just when the key is new
+        self._register(label, pk)
+        return total
+
+    def _register(self, label, pk):
+        registry = cache.get(self.registry_key) or set()
+        if (label, pk) not in registry:
+            registry.add((label, pk))
+            cache.set(self.registry_key, registry, timeout=None)
+
+    def pending(self, model, pk):
+        return cache.get(self._cache_key(*_counter_key(model, pk)), 0)
+
+    def size(self):
+        registry = cache.get(self.registry_key) or set()
+        keys = [self._cache_key(label, pk) for label, pk in registry]
+        return sum(cache.get_many(keys).values()) if keys else 0
+
+    def drain(self):
+        registry = cache.get(self.registry_key) or set()
+        cache.delete(self.registry_key)
+
+        pending = {}
+        for label, pk in registry:
+            key = self._cache_key(label, pk)
+            amount = cache.get(key, 0)
+            if not amount:
+                continue
+            try:
+                # Subtract what we read rather than deleting, so hits
+                # recorded since the read stay in the buffer.
+                cache.decr(key, amount)
+            except ValueError:
+                continue
+            pending[(label, pk)] = amount
+        return pending
+
+    def restore(self, pending):
+        for (label, pk), amount in pending.items():
+            self.add(apps.get_model(label), pk, amount)
+
+
+BUFFER_CLASSES = {
+    'memory': MemoryViewCounterBuffer,
+    'cache': CacheViewCounterBuffer,
+}
+
+
+class ViewCounter:
+    """
+    Collects view increments and writes them back in batches.
+    """
+
+    def __init__(self, buffer, flush_interval=30, flush_threshold=100):
+        self.buffer = buffer
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._wakeup = threading.Event()
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record_view(self, obj, refresh=False):
+        """
+        Record one view of ``obj`` and return its nearly-current count,
+        i.e. the stored ``view_count`` plus hits not yet written back.
+
+        Pass ``refresh=True`` for objects served from a cache, whose
+        ``view_count`` may predate earlier flushes; the stored count is
+        then re-read with a single primary-key lookup.
+        """
+        pending = self.buffer.add(type(obj), obj.pk)
+        self._ensure_flusher()
+        if self.flush_threshold and self.buffer.size() >= self.flush_threshold:
+            self._wakeup.set()
+
+        stored = obj.view_count
+        if refresh:
+            stored = type(obj)._default_manager.filter(pk=obj.pk).values_list(
+                'view_count', flat=True
+            ).first()
+        return (stored or 0) + pending
+
+    def get_view_count(self, obj):
+        """
+        Return the stored ``view_count`` of ``obj`` plus buffered hits.
+        """
+        return (obj.view_count or 0) + self.buffer.pending(type(obj), obj.pk)
+
+    def flush(self):
+        """
+        Write all buffered increments back to the database.
+
+        Objects with the same pending amount share a single
+        ``UPDATE ... WHERE pk IN (...)`` and the whole flush runs in one
+        transaction. Returns the number of views written.
+        """
+        with self._flush_lock:
+            pending = self.buffer.drain()
+            if not pending:
+                return 0
+
+            batches = defaultdict(list)
+            for (label, pk), amount in pending.items():
+                batches[(label, amount)].append(pk)
+
+            try:
+                with transaction.atomic():
+                    for (label, amount), pks in batches.items():
+                        model = apps.get_model(label)
+                        model._default_manager.filter(pk__in=pks).update(
+                            view_count=F('view_count') + amount
+                        )
+            except Exception as e:
+                logger.error(f"Failed to flush view counts, keeping them buffered: {e}")
+                self.buffer.restore(pending)
+                return 0
+
+            return sum(pending.values())
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._flusher_lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher,
+                name='view-counter-flusher',
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"View counter flusher error: {e}")
+
+
+def _build_view_counter():
+    buffer_name = getattr(settings, 'VIEW_COUNTER_BUFFER', 'memory')
+    try:
+        buffer_class = BUFFER_CLASSES[buffer_name]
+    except KeyError:
+        logger.warning(f"Unknown VIEW_COUNTER_BUFFER '{buffer_name}', falling back to 'memory'")
+        buffer_class = MemoryViewCounterBuffer
+
+    return ViewCounter(
+        buffer_class(),
+        flush_interval=getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 30),
+        flush_threshold=getattr(settings, 'VIEW_COUNTER_FLUSH_THRESHOLD', 100),
+    )
+
+
+view_counter = _build_view_counter()
+
+# A per-process buffer is reported by each worker; the shared one is read at scrape time
+if isinstance(view_counter.buffer, MemoryViewCounterBuffer):
+    metrics.store.register_process_gauge('pulcova_view_counter_pending', view_counter.buffer.size)
+
+# Don't drop buffered hits when a worker shuts down cleanly
+atexit.register(view_counter.flush)
+
+
+def record_view(obj, refresh=False):
+    return view_counter.record_view(obj, refresh=refresh)
+
+
+def get_view_count(obj):
+    return view_counter.get_view_count(obj)
+
+
+def flush_view_counts():
+    return view_counter.flush()
@@ -1,3 +1,82 @@
-from django.shortcuts import render
+import hmac
+import ipaddress
+import logging
 
-# Create your views here.
+import sqlparse
+from django.conf import settings
+from django.contrib import admin
+from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.views.decorators.cache import never_cache
+
+from .metrics import collect
+from .slow_queries import clear_slow_queries, log_size, recent_slow_queries
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _has_metrics_token(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        return False
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), token.encode())
+
+
+def _from_allowed_ip(request):
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    for allowed in getattr(settings, 'METRICS_ALLOWED_IPS', []):
+        try:
+            if address in ipaddress.ip_network(allowed, strict=False):
+                return True
+        except ValueError:
+            logger.warning(f"Ignoring invalid METRICS_ALLOWED_IPS entry '{allowed}'")
+    return False
+
+
+@never_cache
+def metrics(request):
+    """
+    Prometheus metrics, for scrapers with ``METRICS_TOKEN`` or from
+    ``METRICS_ALLOWED_IPS``.
+    """
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        raise Http404
+    if not (_has_metrics_token(request) or _from_allowed_ip(request)):
+        return HttpResponseForbidden('Forbidden', content_type='text/plain')
+    return HttpResponse(collect(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def slow_query_log(request):
+    """
+    The slow-query log, for superusers; wrapped in ``admin_view`` in the
+    URLconf.
+    """
+    if not request.user.is_superuser:
+        return HttpResponseForbidden('Forbidden', content_type='text/plain')
+
+    if request.method == 'POST' and 'clear' in request.POST:
+        clear_slow_queries()
+        return HttpResponseRedirect(request.path)
+
+    full_scans_only = bool(request.GET.get('scans'))
+    entries = recent_slow_queries()
+    if full_scans_only:
+        entries = [entry for entry in entries if entry['full_scan']]
+    for entry in entries:
+        entry['sql_display'] = sqlparse.format(entry['sql'], reindent=True, keyword_case='upper')
+
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Slow queries',
+        'entries': entries,
+        'full_scans_only': full_scans_only,
+        'threshold_ms': getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100),
+        'log_size': log_size(),
+    }
+    return TemplateResponse(request, 'admin/slow_queries.html', context)
@@ -0,0 +1,134 @@
+"""
+Facet indexes behind the portfolio, solutions and blog listings.
+
+Each loader reads the published rows of one listing (plus the labels of
+the taxonomy values they use) in a couple of queries and hands them to
+``apps.core.facets.FacetIndex``. Rows are kept in the listing's default
+order. Rows scheduled for later are left out, and the earliest such
+publish time becomes the snapshot's expiry so they appear on time.
+"""
+
+from collections import defaultdict
+
+from django.utils import timezone
+
+from apps.blog.models import Article
+from apps.core.facets import FacetIndex
+from apps.portfolio.models import Project
+from apps.solutions.models import Solution
+
+
+def _split_scheduled(rows, now):
+    """
+    Drop rows published in the future and return the earliest such time.
+    """
+    visible, valid_until = [], None
+    for row in rows:
+        published_at = row['published_at']
+        if published_at is None:
+            continue
+        if published_at > now:
+            valid_until = published_at if valid_until is None else min(valid_until, published_at)
+            continue
+        visible.append(row)
+    return visible, valid_until
+
+
+def load_project_facets():
+    now = timezone.now()
+    projects, valid_until = _split_scheduled(
+        Project.objects.filter(is_published=True).order_by(
+            '-order_priority', '-is_featured', '-created_at'
+        ).values('pk', 'published_at', 'project_type', 'start_date', 'is_featured'),
+        now
+    )
+
+    tech_by_project = defaultdict(list)
+    tech_labels = {}
+    links = Project.tech_stack.through.objects.filter(
+        project__is_published=True,
+        project__published_at__lte=now
+    ).values_list('project_id', 'technology__slug', 'technology__name')
+    for project_id, slug, name in links:
+        tech_by_project[project_id].append(slug)
+        tech_labels[slug] = name
+
+    rows = []
+    for project in projects:
+        rows.append((project['pk'], {
+            'type': [project['project_type']],
+            'tech': tech_by_project.get(project['pk'], []),
+            'year': [project['start_date'].year] if project['start_date'] else [],
+            'featured': [True] if project['is_featured'] else [],
+        }))
+    return rows, {'tech': tech_labels}, valid_until
+
+
+def load_solution_facets():
+    now = timezone.now()
+    solutions, valid_until = _split_scheduled(
+        Solution.objects.filter(is_published=True).order_by(
+            '-helpful_count', '-created_at'
+        ).values('pk', 'published_at', 'difficulty_level', 'technology__slug', 'technology__name'),
+        now
+    )
+
+    rows = []
+    tech_labels = {}
+    for solution in solutions:
+        tech_labels[solution['technology__slug']] = solution['technology__name']
+        rows.append((solution['pk'], {
+            'tech': [solution['technology__slug']],
+            'difficulty': [solution['difficulty_level']],
+        }))
+    return rows, {'tech': tech_labels, 'difficulty': dict(Solution.DIFFICULTY_CHOICES)}, valid_until
+
+
+def load_article_facets():
+    now = timezone.now()
+    articles, valid_until = _split_scheduled(
+        Article.objects.filter(is_published=True).order_by('-published_at').values(
+            'pk', 'published_at', 'category__slug', 'category__name'
+        ),
+        now
+    )
+
+    tags_by_article = defaultdict(list)
+    tag_labels = {}
+    links = Article.tags.through.objects.filter(
+        article__is_published=True,
+        article__published_at__lte=now
+    ).values_list('article_id', 'tag__slug', 'tag__name')
+    for article_id, slug, name in links:
+        tags_by_article[article_id].append(slug)
+        tag_labels[slug] = name
+
+    rows = []
+    category_labels = {}
+    for article in articles:
+        category_labels[article['category__slug']] = article['category__name']
+        rows.append((article['pk'], {
+            'category': [article['category__slug']],
+            'tag': tags_by_article.get(article['pk'], []),
+        }))
+    return rows, {'category': category_labels, 'tag': tag_labels}, valid_until
+
+
+project_facets = FacetIndex('projects', load_project_facets)
+solution_facets = FacetIndex('solutions', load_solution_facets)
+article_facets = FacetIndex('articles', load_article_facets)
+
+
+def facet_options(snapshot, counts, facet, count_attr='count', include_empty=False):
+    """
+    Labelled ``{'slug', 'name', <count_attr>}`` dicts for one facet, most
+    used first.
+    """
+    labels = snapshot.labels.get(facet, {})
+    options = [
+        {'slug': value, 'name': labels.get(value, value), count_attr: count}
+        for value, count in counts.get(facet, {}).items()
+        if count or include_empty
+    ]
+    options.sort(key=lambda option: (-option[count_attr], option['name']))
+    return options
@@ -0,0 +1,110 @@
+"""
+Site-wide search across articles, projects, solutions, code snippets and
+services.
+
+Matches come from the full-text index (``apps.core.search``) ranked
+across every section in one query. They are then narrowed to what
+visitors may see, one query per section with hits. Highlighted excerpts
+are only cut for the page being shown.
+"""
+
+from django.core.paginator import Paginator
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from apps.blog.models import Article
+from apps.core.search import search_excerpts, search_hits
+from apps.portfolio.models import Project
+from apps.services.models import Service
+from apps.solutions.models import CodeSnippet, Solution
+
+# Index label -> how the section is filtered, named and linked
+SEARCH_SECTIONS = {
+    'blog.article': {
+        'type': 'article',
+        'label': 'Article',
+        'visible': lambda now: Article.objects.filter(is_published=True, published_at__lte=now),
+        'url': lambda obj: obj.get_absolute_url(),
+    },
+    'portfolio.project': {
+        'type': 'project',
+        'label': 'Project',
+        'visible': lambda now: Project.objects.filter(is_published=True, published_at__lte=now),
+        'url': lambda obj: obj.get_absolute_url(),
+    },
+    'solutions.solution': {
+        'type': 'solution',
+        'label': 'Solution',
+        'visible': lambda now: Solution.objects.filter(is_published=True, published_at__lte=now),
+        'url': lambda obj: obj.get_absolute_url(),
+    },
+    'solutions.codesnippet': {
+        'type': 'snippet',
+        'label': 'Code Snippet',
+        'visible': lambda now: CodeSnippet.objects.all(),
+        'url': lambda obj: f"{reverse('pages:solutions')}#snippet-{obj.pk}",
+    },
+    'services.service': {
+        'type': 'service',
+        'label': 'Service',
+        'visible': lambda now: Service.objects.filter(is_active=True, is_published=True, published_at__lte=now),
+        'url': lambda obj: f"{reverse('pages:services')}#services",
+    },
+}
+
+SEARCH_TYPES = {section['type']: label for label, section in SEARCH_SECTIONS.items()}
+
+
+def site_search(query, search_type=None, page=1, per_page=10):
+    """
+    Run a site-wide search and return the page of results asked for.
+
+    Returns a dict with ``results`` (dicts with type, title and excerpt
+    HTML, url), ``page`` (a Paginator page over the visible hits) and
+    ``type_counts`` (visible hits per section, ignoring ``search_type``).
+    """
+    now = timezone.now()
+    hits = search_hits(query)
+
+    pks_by_label = {}
+    for label, pk in hits:
+        pks_by_label.setdefault(label, []).append(pk)
+
+    objects = {}
+    for label, pks in pks_by_label.items():
+        for obj in SEARCH_SECTIONS[label]['visible'](now).filter(pk__in=pks):
+            objects[(label, obj.pk)] = obj
+
+    visible_hits = [hit for hit in hits if hit in objects]
+    type_counts = {section['type']: 0 for section in SEARCH_SECTIONS.values()}
+    for label, _ in visible_hits:
+        type_counts[SEARCH_SECTIONS[label]['type']] += 1
+
+    if search_type in SEARCH_TYPES:
+        visible_hits = [hit for hit in visible_hits if hit[0] == SEARCH_TYPES[search_type]]
+
+    paginator = Paginator(visible_hits, per_page)
+    results_page = paginator.get_page(page)
+    excerpts = search_excerpts(query, list(results_page.object_list))
+
+    results = []
+    for label, pk in results_page.object_list:
+        section = SEARCH_SECTIONS[label]
+        obj = objects[(label, pk)]
+        title_html, excerpt_html = excerpts.get((label, pk), (escape(obj.title), ''))
+        results.append({
+            'type': section['type'],
+            'type_label': section['label'],
+            'title': obj.title,
+            'title_html': title_html,
+            'excerpt_html': excerpt_html,
+            'url': section['url'](obj),
+            'object': obj,
+        })
+
+    return {
+        'results': results,
+        'page': results_page,
+        'type_counts': type_counts,
+    }
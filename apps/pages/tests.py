@@ -1,3 +1,47 @@
+from datetime import date
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.blog.models import Article, Category
+from apps.core.testing import QueryBudgetTestMixin
+from apps.portfolio.models import Project, Technology
+from apps.services.models import Service
+from apps.solutions.models import Solution
+
+
+class PageBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # A few published objects per section, so per-row queries show up as overruns
+        now = timezone.now()
+        author = User.objects.create_user('author')
+        category = Category.objects.create(name='Engineering', slug='engineering')
+        technologies = [
+            Technology.objects.create(name=name, slug=name.lower()) for name in ('Django', 'React', 'Postgres')
+        ]
+        for i in range(3):
+            Article.objects.create(
+                title=f'Article {i}', slug=f'article-{i}', excerpt='Excerpt', content='Content',
+                author=author, category=category, is_featured=i == 0,
+                is_published=True, published_at=now,
+            )
+            project = Project.objects.create(
+                title=f'Project {i}', slug=f'project-{i}', description='Description',
+                detailed_content='Details', start_date=date(2023, 1, 1), is_featured=i == 0,
+                is_published=True, published_at=now,
+            )
+            project.tech_stack.set(technologies)
+            Solution.objects.create(
+                title=f'Solution {i}', slug=f'solution-{i}', problem_description='Problem',
+                root_cause='Cause', solution_content='Fix', technology=technologies[i],
+                is_published=True, published_at=now,
+            )
+            Service.objects.create(
+                title=f'Service {i}', slug=f'service-{i}', description='Description',
+                detailed_content='Details', is_published=True, published_at=now,
+            )
 
-# Create your tests here.
+    def test_pages_within_budget(self):
+        self.assertQueryBudgets('apps.pages.urls')
@@ -1,6 +1,9 @@
 # filepath: /home/priyanshu-sharma/Documents/pulcova/apps/pages/urls.py
 from django.urls import path
-from .views import HomeView, AboutView, PortfolioView, BlogView, SolutionsView, ServicesView, ContactView
+from .views import (
+    HomeView, AboutView, PortfolioView, BlogView, SolutionsView, ServicesView, ContactView, SearchView, SearchAPIView,
+    BlogLoadMoreView, SolutionsLoadMoreView,
+)
 
 app_name = 'pages'
 
@@ -9,7 +12,11 @@ urlpatterns = [
     path('about/', AboutView.as_view(), name='about'),
     path('portfolio/', PortfolioView.as_view(), name='portfolio'),
     path('blog/', BlogView.as_view(), name='blog'),
+    path('blog/more/', BlogLoadMoreView.as_view(), name='blog_more'),
     path('solutions/', SolutionsView.as_view(), name='solutions'),
+    path('solutions/more/', SolutionsLoadMoreView.as_view(), name='solutions_more'),
     path('services/', ServicesView.as_view(), name='services'),
     path('contact/', ContactView.as_view(), name='contact'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('search/api/', SearchAPIView.as_view(), name='search_api'),
 ]
\ No newline at end of file
@@ -1,20 +1,28 @@
 from django.views.generic import TemplateView, FormView
-from django.http import HttpResponseRedirect, JsonResponse
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
 from django.contrib import messages
 from django.urls import reverse
 from django.utils import timezone
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q, Count, Sum
-from django.core.mail import send_mail, BadHeaderError
+from django.db.models import Q, Sum
+from django.core.mail import BadHeaderError
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from apps.blog.models import Article, Category, Tag
 from apps.blog.forms import NewsletterSubscriptionForm
 from apps.portfolio.models import Project, Technology
+from apps.core.outbox import enqueue_email
+from apps.core.page_cache import add_surrogate_keys, collection_key, tag_objects
+from apps.core.pagination import CursorPaginator, InvalidCursor, cursor_pagination_enabled, paginate_listing
+from apps.core.search import search_ids, search_queryset
+from apps.core.timing import timed
+from .facets import article_facets, facet_options, project_facets, solution_facets
+from .search import SEARCH_TYPES, site_search
 from .forms import ContactForm
 import logging
 import traceback
+from datetime import date
 
 logger = logging.getLogger(__name__)
 
@@ -31,88 +39,99 @@ class HomeView(TemplateView):
         """
         context = super().get_context_data(**kwargs)
         
-        try:
-            # Get the latest published blog posts
-            recent_blogs = Article.objects.select_related(
-                'author', 
-                'category'
-            ).prefetch_related(
-                'tags'
-            ).filter(
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).order_by('-published_at')[:3]  # Get latest 3 posts
-            
-            context['recent_blogs'] = recent_blogs
-            
-        except Exception as e:
-            logger.error(f"Error fetching recent blog posts for home page: {e}")
-            # Set empty queryset as fallback
-            context['recent_blogs'] = Article.objects.none()
+        # Page cache: purge when articles, projects or technologies change
+        add_surrogate_keys(
+            self.request,
+            collection_key(Article), collection_key(Project), collection_key(Technology)
+        )
         
-        try:
-            # Get featured projects
-            featured_projects = Project.objects.select_related().prefetch_related(
-                'tech_stack'
-            ).filter(
-                is_featured=True,
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).order_by('-order_priority', '-created_at')[:5]  # Get top 5 featured projects
-            
-            context['featured_projects'] = featured_projects
-            
-        except Exception as e:
-            logger.error(f"Error fetching featured projects for home page: {e}")
-            # Set empty queryset as fallback
-            context['featured_projects'] = Project.objects.none()
+        with timed('home.recent_blogs'):
+            try:
+                # Get the latest published blog posts
+                recent_blogs = list(Article.objects.select_related(
+                    'author', 
+                    'category'
+                ).prefetch_related(
+                    'tags'
+                ).filter(
+                    is_published=True,
+                    published_at__lte=timezone.now()
+                ).order_by('-published_at')[:3])  # Get latest 3 posts
+                
+                context['recent_blogs'] = recent_blogs
+                tag_objects(self.request, recent_blogs)
+                
+            except Exception as e:
+                logger.error(f"Error fetching recent blog posts for home page: {e}")
+                # Set empty queryset as fallback
+                context['recent_blogs'] = Article.objects.none()
         
-        try:
-            # Calculate hero section statistics
-            hero_stats = {}
-            
-            # Calculate total published projects
-            total_projects = Project.objects.filter(
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).count()
-            hero_stats['total_projects'] = total_projects
-            
-            # Calculate years of experience based on earliest project
-            earliest_project = Project.objects.filter(
-                is_published=True,
-                start_date__isnull=False
-            ).order_by('start_date').first()
-            
-            if earliest_project:
-                years_experience = timezone.now().year - earliest_project.start_date.year
-                # Add partial year if we're past the anniversary
-                if timezone.now().date() >= earliest_project.start_date.replace(year=timezone.now().year):
-                    years_experience = max(1, years_experience)
+        with timed('home.featured_projects'):
+            try:
+                # Get featured projects
+                featured_projects = list(Project.objects.select_related().prefetch_related(
+                    'tech_stack'
+                ).filter(
+                    is_featured=True,
+                    is_published=True,
+                    published_at__lte=timezone.now()
+                ).order_by('-order_priority', '-created_at')[:5])  # Get top 5 featured projects
+                
+                context['featured_projects'] = featured_projects
+                tag_objects(self.request, featured_projects)
+                
+            except Exception as e:
+                logger.error(f"Error fetching featured projects for home page: {e}")
+                # Set empty queryset as fallback
+                context['featured_projects'] = Project.objects.none()
+        
+        with timed('home.hero_stats'):
+            try:
+                # Calculate hero section statistics
+                hero_stats = {}
+                
+                # Calculate total published projects
+                total_projects = Project.objects.filter(
+                    is_published=True,
+                    published_at__lte=timezone.now()
+                ).count()
+                hero_stats['total_projects'] = total_projects
+                
+                # Calculate years of experience based on earliest project
+                earliest_project = Project.objects.filter(
+                    is_published=True,
+                    start_date__isnull=False
+                ).order_by('start_date').first()
+                
+                if earliest_project:
+                    years_experience = timezone.now().year - earliest_project.start_date.year
+                    # Add partial year if we're past the anniversary
+                    if timezone.now().date() >= earliest_project.start_date.replace(year=timezone.now().year):
+                        years_experience = max(1, years_experience)
+                    else:
+                        years_experience = max(1, years_experience - 1)
                 else:
-                    years_experience = max(1, years_experience - 1)
-            else:
-                years_experience = 0
-            
-            hero_stats['years_experience'] = years_experience
-            
-            # Count unique technologies used
-            total_technologies = Technology.objects.filter(
-                project__is_published=True,
-                project__published_at__lte=timezone.now()
-            ).distinct().count()
-            hero_stats['total_technologies'] = total_technologies
-            
-            context['hero_stats'] = hero_stats
-            
-        except Exception as e:
-            logger.error(f"Error calculating hero statistics: {e}")
-            # Set safe defaults
-            context['hero_stats'] = {
-                'total_projects': 0,
-                'years_experience': 0,
-                'total_technologies': 0,
-            }
+                    years_experience = 0
+                
+                hero_stats['years_experience'] = years_experience
+                
+                # Count unique technologies used
+                total_technologies = Technology.objects.filter(
+                    project__is_published=True,
+                    project__published_at__lte=timezone.now()
+                ).distinct().count()
+                hero_stats['total_technologies'] = total_technologies
+                
+                context['hero_stats'] = hero_stats
+                
+            except Exception as e:
+                logger.error(f"Error calculating hero statistics: {e}")
+                # Set safe defaults
+                context['hero_stats'] = {
+                    'total_projects': 0,
+                    'years_experience': 0,
+                    'total_technologies': 0,
+                }
         
         return context
     
@@ -135,164 +154,150 @@ class PortfolioView(TemplateView):
         Add portfolio data to the context with proper error handling.
         """
         context = super().get_context_data(**kwargs)
+        add_surrogate_keys(self.request, collection_key(Project), collection_key(Technology))
         
         try:
             # Get all published projects with optimized queries
-            all_projects = Project.objects.select_related().prefetch_related(
-                'tech_stack', 'gallery_images'
-            ).filter(
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).order_by('-order_priority', '-is_featured', '-created_at')
-            
-            # Handle project type filter
-            project_type = self.request.GET.get('type', '').strip()
-            if project_type and project_type != 'all':
-                all_projects = all_projects.filter(project_type=project_type)
-                context['current_type'] = project_type
-            
-            # Handle technology filter
-            tech_filter = self.request.GET.get('tech', '').strip()
-            if tech_filter:
-                try:
-                    technology = Technology.objects.get(slug=tech_filter)
-                    all_projects = all_projects.filter(tech_stack=technology)
-                    context['current_tech'] = tech_filter
-                except Technology.DoesNotExist:
-                    logger.warning(f"Technology with slug '{tech_filter}' not found")
-            
-            # Handle year filter
-            year_filter = self.request.GET.get('year', '').strip()
-            if year_filter:
-                if year_filter == 'older':
-                    all_projects = all_projects.filter(start_date__year__lt=2022)
-                else:
-                    try:
-                        year = int(year_filter)
-                        all_projects = all_projects.filter(start_date__year=year)
-                        context['current_year'] = year_filter
-                    except ValueError:
-                        logger.warning(f"Invalid year filter: {year_filter}")
-            
-            # Handle search query
-            search_query = self.request.GET.get('search', '').strip()
-            if search_query:
-                all_projects = all_projects.filter(
-                    Q(title__icontains=search_query) |
-                    Q(description__icontains=search_query) |
-                    Q(detailed_content__icontains=search_query)
-                )
-                context['current_search'] = search_query
-            
-            # Pagination
-            paginate_by = 12
-            page = self.request.GET.get('page', 1)
-            
-            try:
-                paginator = Paginator(all_projects, paginate_by)
-                projects = paginator.page(page)
-            except PageNotAnInteger:
-                projects = paginator.page(1)
-            except EmptyPage:
-                projects = paginator.page(paginator.num_pages)
-            
-            context['projects'] = projects
-            context['total_projects'] = all_projects.count()
-            
-            # Get featured projects for hero section
-            try:
-                featured_projects = Project.objects.select_related().prefetch_related(
-                    'tech_stack'
+            with timed('portfolio.filters'):
+                all_projects = Project.objects.select_related().prefetch_related(
+                    'tech_stack', 'gallery_images'
                 ).filter(
-                    is_featured=True,
                     is_published=True,
                     published_at__lte=timezone.now()
-                ).order_by('-order_priority', '-created_at')[:3]
+                ).order_by('-order_priority', '-is_featured', '-created_at')
                 
-                context['featured_projects'] = featured_projects
-                context['has_featured'] = featured_projects.exists()
+                # Active filters as facet values, for the bitmap facet index
+                facet_filters = {}
                 
-            except Exception as e:
-                logger.error(f"Error fetching featured projects: {e}")
-                context['featured_projects'] = Project.objects.none()
-                context['has_featured'] = False
-            
-            # Get project types with counts
-            try:
-                project_types = Project.objects.filter(
-                    is_published=True,
-                    published_at__lte=timezone.now()
-                ).values('project_type').annotate(
-                    count=Count('id')
-                ).order_by('project_type')
+                # Handle project type filter
+                project_type = self.request.GET.get('type', '').strip()
+                if project_type and project_type != 'all':
+                    all_projects = all_projects.filter(project_type=project_type)
+                    context['current_type'] = project_type
+                    facet_filters['type'] = [project_type]
                 
-                # Convert to dict for easier template usage
-                project_type_counts = {item['project_type']: item['count'] for item in project_types}
-                context['project_type_counts'] = project_type_counts
+                # Handle technology filter
+                tech_filter = self.request.GET.get('tech', '').strip()
+                if tech_filter:
+                    try:
+                        technology = Technology.objects.get(slug=tech_filter)
+                        all_projects = all_projects.filter(tech_stack=technology)
+                        context['current_tech'] = tech_filter
+                        facet_filters['tech'] = [tech_filter]
+                    except Technology.DoesNotExist:
+                        logger.warning(f"Technology with slug '{tech_filter}' not found")
                 
-                # Get available project types
-                available_types = list(project_type_counts.keys())
-                context['available_types'] = available_types
+                # Handle year filter
+                year_filter = self.request.GET.get('year', '').strip()
+                if year_filter:
+                    # Plain date ranges, so the partial start_date index applies
+                    if year_filter == 'older':
+                        all_projects = all_projects.filter(start_date__lt=date(2022, 1, 1))
+                        facet_filters['year'] = range(2022)
+                    else:
+                        try:
+                            year = int(year_filter)
+                            all_projects = all_projects.filter(
+                                start_date__gte=date(year, 1, 1),
+                                start_date__lt=date(year + 1, 1, 1)
+                            )
+                            context['current_year'] = year_filter
+                            facet_filters['year'] = [year]
+                        except ValueError:
+                            logger.warning(f"Invalid year filter: {year_filter}")
                 
-            except Exception as e:
-                logger.error(f"Error fetching project types: {e}")
-                context['project_type_counts'] = {}
-                context['available_types'] = []
-            
-            # Get technologies with project counts
-            try:
-                technologies = Technology.objects.filter(
-                    project__is_published=True,
-                    project__published_at__lte=timezone.now()
-                ).annotate(
-                    project_count=Count('project', distinct=True)
-                ).filter(
-                    project_count__gt=0
-                ).order_by('-project_count', 'name')[:20]  # Top 20 most used technologies
-                
-                context['technologies'] = technologies
-                context['has_technologies'] = technologies.exists()
+                # Handle search query
+                search_query = self.request.GET.get('search', '').strip()
+                search_matches = None
+                if search_query:
+                    search_matches = search_ids(Project, search_query)
+                    all_projects = search_queryset(all_projects, search_query, ids=search_matches)
+                    context['current_search'] = search_query
+            
+            # Pagination: keyset cursors when enabled, numbered pages otherwise
+            with timed('portfolio.pagination'):
+                paginate_by = 12
+                context['cursor_pagination'] = cursor_pagination_enabled(self.request)
+                if context['cursor_pagination']:
+                    projects = paginate_listing(self.request, all_projects, paginate_by, 'portfolio')
+                    paginator = projects.paginator
+                else:
+                    page = self.request.GET.get('page', 1)
+                    
+                    try:
+                        paginator = Paginator(all_projects, paginate_by)
+                        projects = paginator.page(page)
+                    except PageNotAnInteger:
+                        projects = paginator.page(1)
+                    except EmptyPage:
+                        projects = paginator.page(paginator.num_pages)
+                # Run the page query here rather than while the template renders
+                projects.object_list = list(projects.object_list)
                 
-            except Exception as e:
-                logger.error(f"Error fetching technologies: {e}")
-                context['technologies'] = Technology.objects.none()
-                context['has_technologies'] = False
+                context['projects'] = projects
+                context['total_projects'] = paginator.count
+                tag_objects(self.request, projects)
             
-            # Get available years from project start dates
-            try:
-                years = Project.objects.filter(
-                    is_published=True,
-                    published_at__lte=timezone.now(),
-                    start_date__isnull=False
-                ).dates('start_date', 'year', order='DESC')
-                
-                available_years = [date.year for date in years]
-                context['available_years'] = available_years
-                
-            except Exception as e:
-                logger.error(f"Error fetching available years: {e}")
-                context['available_years'] = []
+            # Get featured projects for hero section
+            with timed('portfolio.featured'):
+                try:
+                    featured_projects = list(Project.objects.select_related().prefetch_related(
+                        'tech_stack'
+                    ).filter(
+                        is_featured=True,
+                        is_published=True,
+                        published_at__lte=timezone.now()
+                    ).order_by('-order_priority', '-created_at')[:3])
+                    
+                    context['featured_projects'] = featured_projects
+                    tag_objects(self.request, featured_projects)
+                    context['has_featured'] = bool(featured_projects)
+                    
+                except Exception as e:
+                    logger.error(f"Error fetching featured projects: {e}")
+                    context['featured_projects'] = Project.objects.none()
+                    context['has_featured'] = False
             
-            # Add statistics for display
-            try:
-                stats = {
-                    'total_projects': Project.objects.filter(is_published=True).count(),
-                    'total_technologies': Technology.objects.filter(
-                        project__is_published=True
-                    ).distinct().count(),
-                    'featured_projects': Project.objects.filter(
-                        is_published=True, is_featured=True
-                    ).count(),
-                }
-                context['stats'] = stats
-                
-            except Exception as e:
-                logger.error(f"Error calculating portfolio statistics: {e}")
-                context['stats'] = {
-                    'total_projects': 0,
-                    'total_technologies': 0,
-                    'featured_projects': 0,
-                }
+            # Facet counts, years and statistics in one pass over the facet index.
+            # Each facet's counts honour every active filter except its own.
+            with timed('portfolio.facets'):
+                try:
+                    facets = project_facets.get()
+                    base = None
+                    if search_matches is not None:
+                        base = facets.mask_for_pks(search_matches)
+                    _, counts = facets.query(facet_filters, base=base)
+                    
+                    project_type_counts = dict(sorted(counts.get('type', {}).items()))
+                    context['project_type_counts'] = project_type_counts
+                    context['available_types'] = list(project_type_counts.keys())
+                    
+                    technologies = facet_options(facets, counts, 'tech', count_attr='project_count')[:20]
+                    context['technologies'] = technologies
+                    context['has_technologies'] = bool(technologies)
+                    
+                    context['available_years'] = sorted(facets.values('year'), reverse=True)
+                    
+                    context['stats'] = {
+                        'total_projects': facets.count(facets.all),
+                        'total_technologies': len(facets.values('tech')),
+                        'featured_projects': facets.count(facets.mask_for('featured', [True])),
+                    }
+                    
+                except Exception as e:
+                    logger.error(f"Error computing portfolio facets: {e}")
+                    context.update({
+                        'project_type_counts': {},
+                        'available_types': [],
+                        'technologies': [],
+                        'has_technologies': False,
+                        'available_years': [],
+                        'stats': {
+                            'total_projects': 0,
+                            'total_technologies': 0,
+                            'featured_projects': 0,
+                        },
+                    })
             
             # Add current filters for template
             context['current_filters'] = {
@@ -321,7 +326,7 @@ class PortfolioView(TemplateView):
                 'has_featured': False,
                 'project_type_counts': {},
                 'available_types': [],
-                'technologies': Technology.objects.none(),
+                'technologies': [],
                 'has_technologies': False,
                 'available_years': [],
                 'stats': {
@@ -346,98 +351,129 @@ class BlogView(TemplateView):
     Class-based view for the blog page with real blog data.
     """
     template_name = 'pages/blog.html'
+    paginate_by = 9
+    
+    def get_articles(self, context):
+        """
+        Return the published articles matching the request's search,
+        category and tag filters, with the search matches and the active
+        facet filters. Records the active filters in ``context``.
+        """
+        # Get all published blog posts
+        all_blogs = Article.objects.select_related(
+            'author', 
+            'category'
+        ).prefetch_related(
+            'tags'
+        ).filter(
+            is_published=True,
+            published_at__lte=timezone.now()
+        ).order_by('-published_at')
+        
+        # Active filters as facet values, for the bitmap facet index
+        facet_filters = {}
+        
+        # Handle search query
+        search_query = self.request.GET.get('search', '').strip()
+        search_matches = None
+        if search_query:
+            search_matches = search_ids(Article, search_query)
+            all_blogs = search_queryset(all_blogs, search_query, ids=search_matches)
+            context['current_search'] = search_query
+        
+        # Handle category filter
+        category_slug = self.request.GET.get('category', '').strip()
+        if category_slug:
+            try:
+                category = Category.objects.get(slug=category_slug)
+                all_blogs = all_blogs.filter(category=category)
+                context['current_category'] = category_slug
+                facet_filters['category'] = [category_slug]
+            except Category.DoesNotExist:
+                logger.warning(f"Category with slug '{category_slug}' not found")
+        
+        # Handle tag filter
+        tag_slug = self.request.GET.get('tag', '').strip()
+        if tag_slug:
+            try:
+                tag = Tag.objects.get(slug=tag_slug)
+                all_blogs = all_blogs.filter(tags=tag)
+                context['current_tag'] = tag_slug
+                facet_filters['tag'] = [tag_slug]
+            except Tag.DoesNotExist:
+                logger.warning(f"Tag with slug '{tag_slug}' not found")
+        
+        return all_blogs, search_matches, facet_filters
+    
+    def get_featured(self, all_blogs):
+        """
+        First 2 featured articles, or the latest 2 if none are featured.
+        """
+        featured_blogs = list(all_blogs.filter(is_featured=True)[:2])
+        if not featured_blogs:
+            featured_blogs = list(all_blogs[:2])
+        return featured_blogs
+    
+    def get_recent(self, all_blogs, featured_blogs):
+        """
+        Articles below the featured ones, in the listing order.
+        """
+        return all_blogs.exclude(id__in=[blog.pk for blog in featured_blogs])
     
     def get_context_data(self, **kwargs):
         """
         Add real blog data to the context with proper error handling.
         """
         context = super().get_context_data(**kwargs)
+        add_surrogate_keys(
+            self.request,
+            collection_key(Article), collection_key(Category), collection_key(Tag)
+        )
         
         try:
-            # Get all published blog posts
-            all_blogs = Article.objects.select_related(
-                'author', 
-                'category'
-            ).prefetch_related(
-                'tags'
-            ).filter(
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).order_by('-published_at')
-            
-            # Handle search query
-            search_query = self.request.GET.get('search', '').strip()
-            if search_query:
-                all_blogs = all_blogs.filter(
-                    Q(title__icontains=search_query) |
-                    Q(excerpt__icontains=search_query) |
-                    Q(content__icontains=search_query)
-                )
-                context['current_search'] = search_query
-            
-            # Handle category filter
-            category_slug = self.request.GET.get('category', '').strip()
-            if category_slug:
-                try:
-                    category = Category.objects.get(slug=category_slug)
-                    all_blogs = all_blogs.filter(category=category)
-                    context['current_category'] = category_slug
-                except Category.DoesNotExist:
-                    logger.warning(f"Category with slug '{category_slug}' not found")
-            
-            # Handle tag filter
-            tag_slug = self.request.GET.get('tag', '').strip()
-            if tag_slug:
-                try:
-                    tag = Tag.objects.get(slug=tag_slug)
-                    all_blogs = all_blogs.filter(tags=tag)
-                    context['current_tag'] = tag_slug
-                except Tag.DoesNotExist:
-                    logger.warning(f"Tag with slug '{tag_slug}' not found")
+            all_blogs, search_matches, facet_filters = self.get_articles(context)
             
             # Get featured articles (first 2 featured or latest 2 if no featured)
             try:
-                featured_blogs = all_blogs.filter(is_featured=True)[:2]
-                if not featured_blogs.exists():
-                    featured_blogs = all_blogs[:2]
+                featured_blogs = self.get_featured(all_blogs)
                 context['featured_blogs'] = featured_blogs
+                tag_objects(self.request, featured_blogs)
             except Exception as e:
                 logger.error(f"Error fetching featured blogs: {e}")
+                featured_blogs = []
                 context['featured_blogs'] = Article.objects.none()
             
-            # Get recent blogs (excluding featured ones)
+            # Get the first page of recent blogs (excluding featured ones);
+            # later pages come from BlogLoadMoreView
             try:
-                featured_ids = list(featured_blogs.values_list('id', flat=True)) if 'featured_blogs' in context else []
-                recent_blogs = all_blogs.exclude(id__in=featured_ids)
+                recent_blogs = paginate_listing(
+                    self.request, self.get_recent(all_blogs, featured_blogs), self.paginate_by, 'blog'
+                )
                 context['recent_blogs'] = recent_blogs
+                tag_objects(self.request, recent_blogs)
             except Exception as e:
                 logger.error(f"Error fetching recent blogs: {e}")
                 context['recent_blogs'] = Article.objects.none()
             
-            # Get categories with article counts
+            # Categories, tags and the total from the facet index; each
+            # facet's counts honour every active filter except its own
             try:
-                categories = Category.objects.filter(
-                    articles__is_published=True,
-                    articles__published_at__lte=timezone.now()
-                ).distinct().order_by('name')
-                context['categories'] = categories
-            except Exception as e:
-                logger.error(f"Error fetching categories: {e}")
-                context['categories'] = Category.objects.none()
-            
-            # Get popular tags
-            try:
-                popular_tags = Tag.objects.filter(
-                    article__is_published=True,
-                    article__published_at__lte=timezone.now()
-                ).distinct().order_by('name')[:20]
-                context['popular_tags'] = popular_tags
+                facets = article_facets.get()
+                base = None
+                if search_matches is not None:
+                    base = facets.mask_for_pks(search_matches)
+                mask, counts = facets.query(facet_filters, base=base)
+                
+                categories = facet_options(facets, counts, 'category', count_attr='article_count', include_empty=True)
+                context['categories'] = sorted(categories, key=lambda category: category['name'])
+                context['popular_tags'] = facet_options(facets, counts, 'tag', count_attr='article_count')[:20]
+                context['total_blogs'] = facets.count(mask)
+                
             except Exception as e:
-                logger.error(f"Error fetching popular tags: {e}")
-                context['popular_tags'] = Tag.objects.none()
-            
-            # Add total count for reference
-            context['total_blogs'] = all_blogs.count() if all_blogs else 0
+                logger.error(f"Error computing blog facets: {e}")
+                context['categories'] = []
+                context['popular_tags'] = []
+                context['total_blogs'] = 0
             
             # Add newsletter subscription form
             context['newsletter_form'] = NewsletterSubscriptionForm()
@@ -448,8 +484,8 @@ class BlogView(TemplateView):
             context.update({
                 'featured_blogs': Article.objects.none(),
                 'recent_blogs': Article.objects.none(),
-                'categories': Category.objects.none(),
-                'popular_tags': Tag.objects.none(),
+                'categories': [],
+                'popular_tags': [],
                 'total_blogs': 0,
                 'newsletter_form': NewsletterSubscriptionForm(),
             })
@@ -462,6 +498,75 @@ class SolutionsView(TemplateView):
     Class-based view for the solutions page with real solutions data.
     """
     template_name = 'pages/solutions.html'
+    paginate_by = 12
+    
+    @timed('solutions.filters')
+    def get_solutions(self):
+        """
+        Return the published solutions matching the request's search,
+        technology and difficulty filters in the requested order, with the
+        search matches, the active facet filters and the filter values.
+        """
+        from apps.solutions.models import Solution
+        
+        # Get all published solutions
+        all_solutions = Solution.objects.select_related(
+            'technology'
+        ).prefetch_related(
+            'related_solutions__technology'
+        ).filter(
+            is_published=True,
+            published_at__lte=timezone.now()
+        ).order_by('-helpful_count', '-created_at')
+        
+        # Active filters as facet values, for the bitmap facet index
+        facet_filters = {}
+        
+        # Handle search query
+        search_query = self.request.GET.get('search', '').strip()
+        search_matches = None
+        if search_query:
+            search_matches = search_ids(Solution, search_query)
+            all_solutions = search_queryset(all_solutions, search_query, ids=search_matches)
+        
+        # Handle technology filter
+        tech_filter = self.request.GET.get('tech', '').strip()
+        if tech_filter:
+            try:
+                all_solutions = all_solutions.filter(technology__slug=tech_filter)
+                facet_filters['tech'] = [tech_filter]
+            except Exception as e:
+                logger.error(f"Error filtering by technology: {e}")
+        
+        # Handle difficulty filter
+        difficulty_filter = self.request.GET.get('difficulty', '').strip()
+        if difficulty_filter and difficulty_filter != 'all':
+            try:
+                all_solutions = all_solutions.filter(difficulty_level=difficulty_filter)
+                facet_filters['difficulty'] = [difficulty_filter]
+            except Exception as e:
+                logger.error(f"Error filtering by difficulty: {e}")
+        
+        # Handle sorting; searches default to relevance order
+        sort_by = self.request.GET.get('sort', '').strip() or ('relevance' if search_query else 'helpful')
+        if sort_by == 'newest':
+            all_solutions = all_solutions.order_by('-created_at')
+        elif sort_by == 'views':
+            all_solutions = all_solutions.order_by('-view_count', '-created_at')
+        elif sort_by == 'title':
+            all_solutions = all_solutions.order_by('title')
+        elif sort_by == 'relevance' and search_query:
+            pass  # already ranked by the search index
+        else:  # default to helpful
+            all_solutions = all_solutions.order_by('-helpful_count', '-created_at')
+        
+        filters = {
+            'search': search_query,
+            'tech': tech_filter,
+            'difficulty': difficulty_filter,
+            'sort': sort_by,
+        }
+        return all_solutions, search_matches, facet_filters, filters
     
     def get_context_data(self, **kwargs):
         """
@@ -473,178 +578,142 @@ class SolutionsView(TemplateView):
             # Import here to avoid circular imports
             from apps.solutions.models import Solution, CodeSnippet
             
-            # Get all published solutions
-            all_solutions = Solution.objects.select_related(
-                'technology'
-            ).prefetch_related(
-                'related_solutions__technology'
-            ).filter(
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).order_by('-helpful_count', '-created_at')
+            add_surrogate_keys(
+                self.request,
+                collection_key(Solution), collection_key(Technology), collection_key(CodeSnippet)
+            )
             
-            # Handle search query
-            search_query = self.request.GET.get('search', '').strip()
-            if search_query:
-                all_solutions = all_solutions.filter(
-                    Q(title__icontains=search_query) |
-                    Q(problem_description__icontains=search_query) |
-                    Q(solution_content__icontains=search_query) |
-                    Q(technology__name__icontains=search_query)
-                )
+            all_solutions, search_matches, facet_filters, filters = self.get_solutions()
+            search_query = filters['search']
+            tech_filter = filters['tech']
+            difficulty_filter = filters['difficulty']
+            sort_by = filters['sort']
+            
+            # Pagination: keyset cursors when enabled, numbered pages otherwise
+            with timed('solutions.pagination'):
+                paginate_by = self.paginate_by
+                context['cursor_pagination'] = cursor_pagination_enabled(self.request)
+                if context['cursor_pagination']:
+                    solutions = paginate_listing(self.request, all_solutions, paginate_by, 'solutions')
+                    paginator = solutions.paginator
+                else:
+                    page = self.request.GET.get('page', 1)
+                    
+                    try:
+                        paginator = Paginator(all_solutions, paginate_by)
+                        solutions = paginator.page(page)
+                    except PageNotAnInteger:
+                        solutions = paginator.page(1)
+                    except EmptyPage:
+                        solutions = paginator.page(paginator.num_pages)
+                # Run the page query here rather than while the template renders
+                solutions.object_list = list(solutions.object_list)
+                
+                context['solutions'] = solutions
+                context['total_solutions'] = paginator.count
+                tag_objects(self.request, solutions)
+                
+                # Cursor after the last card shown, for the "load more" button
+                context['load_more_cursor'] = None
+                if solutions.has_next() and len(solutions):
+                    context['load_more_cursor'] = CursorPaginator(all_solutions, paginate_by).encode_cursor(solutions[-1])
             
-            # Handle technology filter
-            tech_filter = self.request.GET.get('tech', '').strip()
-            if tech_filter:
+            # Get featured solutions for hero section
+            with timed('solutions.featured'):
                 try:
-                    all_solutions = all_solutions.filter(technology__slug=tech_filter)
+                    featured_solutions = list(Solution.objects.select_related(
+                        'technology'
+                    ).filter(
+                        is_published=True,
+                        published_at__lte=timezone.now(),
+                        helpful_count__gte=5  # Consider solutions with 5+ helpful votes as featured
+                    ).order_by('-helpful_count', '-view_count')[:6])
+                    
+                    context['featured_solutions'] = featured_solutions
+                    context['has_featured'] = bool(featured_solutions)
+                    tag_objects(self.request, featured_solutions)
+                    
                 except Exception as e:
-                    logger.error(f"Error filtering by technology: {e}")
+                    logger.error(f"Error fetching featured solutions: {e}")
+                    context['featured_solutions'] = Solution.objects.none()
+                    context['has_featured'] = False
             
-            # Handle difficulty filter
-            difficulty_filter = self.request.GET.get('difficulty', '').strip()
-            if difficulty_filter and difficulty_filter != 'all':
+            # Technology and difficulty counts from the facet index; each
+            # facet's counts honour every active filter except its own
+            with timed('solutions.facets'):
                 try:
-                    all_solutions = all_solutions.filter(difficulty_level=difficulty_filter)
+                    facets = solution_facets.get()
+                    base = None
+                    if search_matches is not None:
+                        base = facets.mask_for_pks(search_matches)
+                    _, counts = facets.query(facet_filters, base=base)
+                    
+                    technologies = facet_options(facets, counts, 'tech', count_attr='solution_count')
+                    context['technologies'] = technologies
+                    context['has_technologies'] = bool(technologies)
+                    
+                    difficulty_counts = {}
+                    level_counts = counts.get('difficulty', {})
+                    for choice_value, choice_label in Solution.DIFFICULTY_CHOICES:
+                        count = level_counts.get(choice_value, 0)
+                        if count > 0:
+                            difficulty_counts[choice_value] = {
+                                'label': choice_label,
+                                'count': count
+                            }
+                    context['difficulty_counts'] = difficulty_counts
+                    
                 except Exception as e:
-                    logger.error(f"Error filtering by difficulty: {e}")
-            
-            # Handle sorting
-            sort_by = self.request.GET.get('sort', 'helpful').strip()
-            if sort_by == 'newest':
-                all_solutions = all_solutions.order_by('-created_at')
-            elif sort_by == 'views':
-                all_solutions = all_solutions.order_by('-view_count', '-created_at')
-            elif sort_by == 'title':
-                all_solutions = all_solutions.order_by('title')
-            else:  # default to helpful
-                all_solutions = all_solutions.order_by('-helpful_count', '-created_at')
-            
-            # Pagination
-            paginate_by = 12
-            page = self.request.GET.get('page', 1)
-            
-            try:
-                paginator = Paginator(all_solutions, paginate_by)
-                solutions = paginator.page(page)
-            except PageNotAnInteger:
-                solutions = paginator.page(1)
-            except EmptyPage:
-                solutions = paginator.page(paginator.num_pages)
-            
-            context['solutions'] = solutions
-            context['total_solutions'] = all_solutions.count()
-            
-            # Get featured solutions for hero section
-            try:
-                featured_solutions = Solution.objects.select_related(
-                    'technology'
-                ).filter(
-                    is_published=True,
-                    published_at__lte=timezone.now(),
-                    helpful_count__gte=5  # Consider solutions with 5+ helpful votes as featured
-                ).order_by('-helpful_count', '-view_count')[:6]
-                
-                context['featured_solutions'] = featured_solutions
-                context['has_featured'] = featured_solutions.exists()
-                
-            except Exception as e:
-                logger.error(f"Error fetching featured solutions: {e}")
-                context['featured_solutions'] = Solution.objects.none()
-                context['has_featured'] = False
-            
-            # Get technologies with solution counts
-            try:
-                from apps.portfolio.models import Technology
-                technologies = Technology.objects.annotate(
-                    solution_count=Count('solutions', filter=Q(
-                        solutions__is_published=True,
-                        solutions__published_at__lte=timezone.now()
-                    ))
-                ).filter(
-                    solution_count__gt=0
-                ).order_by('-solution_count', 'name')
-                
-                context['technologies'] = technologies
-                context['has_technologies'] = technologies.exists()
-                
-            except Exception as e:
-                logger.error(f"Error fetching technologies: {e}")
-                context['technologies'] = []
-                context['has_technologies'] = False
-            
-            # Get difficulty level counts
-            try:
-                difficulty_counts = {}
-                for choice_value, choice_label in Solution.DIFFICULTY_CHOICES:
-                    count = all_solutions.filter(difficulty_level=choice_value).count()
-                    if count > 0:
-                        difficulty_counts[choice_value] = {
-                            'label': choice_label,
-                            'count': count
-                        }
-                
-                context['difficulty_counts'] = difficulty_counts
-                
-            except Exception as e:
-                logger.error(f"Error calculating difficulty counts: {e}")
-                context['difficulty_counts'] = {}
+                    logger.error(f"Error computing solution facets: {e}")
+                    facets = None
+                    context['technologies'] = []
+                    context['has_technologies'] = False
+                    context['difficulty_counts'] = {}
             
             # Get recent code snippets
-            try:
-                code_snippets = CodeSnippet.objects.prefetch_related(
-                    'tags'
-                ).order_by('-created_at')[:6]
-                
-                context['code_snippets'] = code_snippets
-                context['has_code_snippets'] = code_snippets.exists()
-                
-            except Exception as e:
-                logger.error(f"Error fetching code snippets: {e}")
-                context['code_snippets'] = CodeSnippet.objects.none()
-                context['has_code_snippets'] = False
+            with timed('solutions.snippets'):
+                try:
+                    code_snippets = list(CodeSnippet.objects.prefetch_related(
+                        'tags'
+                    ).order_by('-created_at')[:6])
+                    
+                    context['code_snippets'] = code_snippets
+                    context['has_code_snippets'] = bool(code_snippets)
+                    tag_objects(self.request, code_snippets)
+                    
+                except Exception as e:
+                    logger.error(f"Error fetching code snippets: {e}")
+                    context['code_snippets'] = CodeSnippet.objects.none()
+                    context['has_code_snippets'] = False
             
             # Add statistics for display
-            try:
-                total_solutions_count = Solution.objects.filter(
-                    is_published=True,
-                    published_at__lte=timezone.now()
-                ).count()
-                
-                total_technologies_count = Technology.objects.filter(
-                    solutions__is_published=True,
-                    solutions__published_at__lte=timezone.now()
-                ).distinct().count()
-                
-                total_votes = Solution.objects.filter(
-                    is_published=True,
-                    published_at__lte=timezone.now()
-                ).aggregate(
-                    total_helpful=Sum('helpful_count')
-                )['total_helpful'] or 0
-                
-                total_views = Solution.objects.filter(
-                    is_published=True,
-                    published_at__lte=timezone.now()
-                ).aggregate(
-                    total_views=Sum('view_count')
-                )['total_views'] or 0
-                
-                context['stats'] = {
-                    'total_solutions': total_solutions_count,
-                    'total_technologies': total_technologies_count,
-                    'total_votes': total_votes,
-                    'total_views': total_views,
-                }
-                
-            except Exception as e:
-                logger.error(f"Error calculating statistics: {e}")
-                context['stats'] = {
-                    'total_solutions': 0,
-                    'total_technologies': 0,
-                    'total_votes': 0,
-                    'total_views': 0,
-                }
+            with timed('solutions.stats'):
+                try:
+                    totals = Solution.objects.filter(
+                        is_published=True,
+                        published_at__lte=timezone.now()
+                    ).aggregate(
+                        total_helpful=Sum('helpful_count'),
+                        total_views=Sum('view_count')
+                    )
+                    total_votes = totals['total_helpful'] or 0
+                    total_views = totals['total_views'] or 0
+                    
+                    context['stats'] = {
+                        'total_solutions': facets.count(facets.all) if facets else 0,
+                        'total_technologies': len(facets.values('tech')) if facets else 0,
+                        'total_votes': total_votes,
+                        'total_views': total_views,
+                    }
+                    
+                except Exception as e:
+                    logger.error(f"Error calculating statistics: {e}")
+                    context['stats'] = {
+                        'total_solutions': 0,
+                        'total_technologies': 0,
+                        'total_votes': 0,
+                        'total_views': 0,
+                    }
             
             # Add current filters for template
             context['current_filters'] = {
@@ -783,82 +852,85 @@ class ServicesView(TemplateView):
             # Import here to avoid circular imports
             from apps.services.models import Service, ServiceInquiry
             
-            # Get all active and published services
-            all_services = Service.objects.filter(
-                is_active=True,
-                is_published=True,
-                published_at__lte=timezone.now()
-            ).order_by('-order_priority', '-created_at')
-            
-            # Handle search query
-            search_query = self.request.GET.get('search', '').strip()
-            if search_query:
-                all_services = all_services.filter(
-                    Q(title__icontains=search_query) |
-                    Q(description__icontains=search_query) |
-                    Q(detailed_content__icontains=search_query)
-                )
-            
-            # Handle category/type filter (if you want to add categories later)
-            service_type = self.request.GET.get('type', '').strip()
-            if service_type and service_type != 'all':
-                # This can be extended when you add category field to Service model
-                pass
+            add_surrogate_keys(self.request, collection_key(Service), collection_key(ServiceInquiry))
             
-            # Handle price range filter
-            price_filter = self.request.GET.get('price', '').strip()
-            if price_filter and price_filter != 'all':
-                all_services = all_services.filter(price_range__icontains=price_filter)
-            
-            context['services'] = all_services
-            context['total_services'] = all_services.count()
+            # Get all active and published services
+            with timed('services.filters'):
+                all_services = Service.objects.filter(
+                    is_active=True,
+                    is_published=True,
+                    published_at__lte=timezone.now()
+                ).order_by('-order_priority', '-created_at')
+                
+                # Handle search query
+                search_query = self.request.GET.get('search', '').strip()
+                if search_query:
+                    all_services = search_queryset(all_services, search_query)
+                
+                # Handle category/type filter (if you want to add categories later)
+                service_type = self.request.GET.get('type', '').strip()
+                if service_type and service_type != 'all':
+                    # This can be extended when you add category field to Service model
+                    pass
+                
+                # Handle price range filter
+                price_filter = self.request.GET.get('price', '').strip()
+                if price_filter and price_filter != 'all':
+                    all_services = all_services.filter(price_range__icontains=price_filter)
+                
+                context['services'] = list(all_services)
+                context['total_services'] = len(context['services'])
+                tag_objects(self.request, context['services'])
             
             # Get featured services (top 3 by order_priority)
-            try:
-                featured_services = all_services.filter(
-                    order_priority__gt=0
-                )[:3]
-                context['featured_services'] = featured_services
-                context['has_featured'] = featured_services.exists()
-            except Exception as e:
-                logger.error(f"Error fetching featured services: {e}")
-                context['featured_services'] = Service.objects.none()
-                context['has_featured'] = False
+            with timed('services.featured'):
+                try:
+                    featured_services = list(all_services.filter(
+                        order_priority__gt=0
+                    )[:3])
+                    context['featured_services'] = featured_services
+                    context['has_featured'] = bool(featured_services)
+                except Exception as e:
+                    logger.error(f"Error fetching featured services: {e}")
+                    context['featured_services'] = Service.objects.none()
+                    context['has_featured'] = False
             
             # Get service statistics
-            try:
-                total_inquiries = ServiceInquiry.objects.count()
-                new_inquiries = ServiceInquiry.objects.filter(status='new').count()
-                converted_inquiries = ServiceInquiry.objects.filter(status='converted').count()
-                
-                context['stats'] = {
-                    'total_services': all_services.count(),
-                    'total_inquiries': total_inquiries,
-                    'new_inquiries': new_inquiries,
-                    'converted_inquiries': converted_inquiries,
-                    'conversion_rate': round((converted_inquiries / total_inquiries * 100), 1) if total_inquiries > 0 else 0,
-                }
-            except Exception as e:
-                logger.error(f"Error calculating service statistics: {e}")
-                context['stats'] = {
-                    'total_services': 0,
-                    'total_inquiries': 0,
-                    'new_inquiries': 0,
-                    'converted_inquiries': 0,
-                    'conversion_rate': 0,
-                }
+            with timed('services.stats'):
+                try:
+                    total_inquiries = ServiceInquiry.objects.count()
+                    new_inquiries = ServiceInquiry.objects.filter(status='new').count()
+                    converted_inquiries = ServiceInquiry.objects.filter(status='converted').count()
+                    
+                    context['stats'] = {
+                        'total_services': all_services.count(),
+                        'total_inquiries': total_inquiries,
+                        'new_inquiries': new_inquiries,
+                        'converted_inquiries': converted_inquiries,
+                        'conversion_rate': round((converted_inquiries / total_inquiries * 100), 1) if total_inquiries > 0 else 0,
+                    }
+                except Exception as e:
+                    logger.error(f"Error calculating service statistics: {e}")
+                    context['stats'] = {
+                        'total_services': 0,
+                        'total_inquiries': 0,
+                        'new_inquiries': 0,
+                        'converted_inquiries': 0,
+                        'conversion_rate': 0,
+                    }
             
             # Get available price ranges for filtering
-            try:
-                price_ranges = all_services.exclude(
-                    Q(price_range__isnull=True) | Q(price_range__exact='')
-                ).values_list('price_range', flat=True).distinct()
-                context['available_price_ranges'] = list(price_ranges)
-                context['has_price_ranges'] = len(price_ranges) > 0
-            except Exception as e:
-                logger.error(f"Error fetching price ranges: {e}")
-                context['available_price_ranges'] = []
-                context['has_price_ranges'] = False
+            with timed('services.price_ranges'):
+                try:
+                    price_ranges = all_services.exclude(
+                        Q(price_range__isnull=True) | Q(price_range__exact='')
+                    ).values_list('price_range', flat=True).distinct()
+                    context['available_price_ranges'] = list(price_ranges)
+                    context['has_price_ranges'] = len(price_ranges) > 0
+                except Exception as e:
+                    logger.error(f"Error fetching price ranges: {e}")
+                    context['available_price_ranges'] = []
+                    context['has_price_ranges'] = False
             
             # Add current filters for template
             context['current_filters'] = {
@@ -903,6 +975,151 @@ class ServicesView(TemplateView):
         return context
     
     
+def render_load_more(request, template_name, context_name, page):
+    """
+    Render a page of listing cards as an HTML fragment (the next cursor in
+    the ``X-Next-Cursor`` header), or as JSON with ``?format=json``.
+    """
+    html = render_to_string(template_name, {context_name: page.object_list}, request=request)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'html': html,
+            'count': len(page),
+            'has_next': page.has_next(),
+            'next_cursor': page.next_cursor,
+        })
+    response = HttpResponse(html)
+    if page.next_cursor:
+        response['X-Next-Cursor'] = page.next_cursor
+    return response
+
+
+class BlogLoadMoreView(BlogView):
+    """
+    Next page of blog article cards after ``?cursor=``, with the same
+    filters as the blog page, for its "load more" button.
+    """
+    
+    def get(self, request, *args, **kwargs):
+        add_surrogate_keys(request, collection_key(Article), collection_key(Category), collection_key(Tag))
+        try:
+            all_blogs, _, _ = self.get_articles({})
+            recent_blogs = self.get_recent(all_blogs, self.get_featured(all_blogs))
+            page = CursorPaginator(recent_blogs, self.paginate_by).page(request.GET.get('cursor'))
+            tag_objects(request, page)
+            return render_load_more(request, 'pages/partials/article_cards.html', 'articles', page)
+        except InvalidCursor as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error loading more blog articles: {e}")
+            return JsonResponse({'status': 'error', 'message': 'Could not load more articles'}, status=500)
+
+
+class SolutionsLoadMoreView(SolutionsView):
+    """
+    Next page of solution cards after ``?cursor=``, with the same filters
+    and sort order as the solutions page, for its "load more" button.
+    """
+    
+    def get(self, request, *args, **kwargs):
+        from apps.solutions.models import Solution
+        
+        add_surrogate_keys(request, collection_key(Solution), collection_key(Technology))
+        try:
+            all_solutions, _, _, _ = self.get_solutions()
+            page = CursorPaginator(all_solutions, self.paginate_by).page(request.GET.get('cursor'))
+            tag_objects(request, page)
+            return render_load_more(request, 'pages/partials/solution_cards.html', 'solutions', page)
+        except InvalidCursor as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        except Exception as e:
+            logger.error(f"Error loading more solutions: {e}")
+            return JsonResponse({'status': 'error', 'message': 'Could not load more solutions'}, status=500)
+
+
+class SearchView(TemplateView):
+    """
+    Site-wide search across articles, projects, solutions, code snippets
+    and services, merged by relevance.
+    """
+    template_name = 'pages/search.html'
+    paginate_by = 10
+    
+    def get_context_data(self, **kwargs):
+        """
+        Add ranked, highlighted search results to the context.
+        """
+        context = super().get_context_data(**kwargs)
+        
+        from apps.services.models import Service
+        from apps.solutions.models import CodeSnippet, Solution
+        
+        add_surrogate_keys(
+            self.request,
+            collection_key(Article), collection_key(Project), collection_key(Solution),
+            collection_key(CodeSnippet), collection_key(Service)
+        )
+        
+        query = self.request.GET.get('q', '').strip()
+        search_type = self.request.GET.get('type', '').strip()
+        context.update({
+            'query': query,
+            'current_type': search_type if search_type in SEARCH_TYPES else 'all',
+            'results': [],
+            'results_page': None,
+            'type_counts': {},
+            'total_results': 0,
+        })
+        
+        if not query:
+            return context
+        
+        try:
+            search = site_search(
+                query,
+                search_type=search_type,
+                page=self.request.GET.get('page', 1),
+                per_page=self.paginate_by
+            )
+            context['results'] = search['results']
+            context['results_page'] = search['page']
+            context['type_counts'] = search['type_counts']
+            context['total_results'] = search['page'].paginator.count
+            tag_objects(self.request, [result['object'] for result in search['results']])
+        except Exception as e:
+            logger.error(f"Error running site search for '{query}': {e}")
+        
+        return context
+
+
+class SearchAPIView(SearchView):
+    """
+    JSON version of the site-wide search.
+    """
+    
+    def render_to_response(self, context, **response_kwargs):
+        results_page = context['results_page']
+        return JsonResponse({
+            'query': context['query'],
+            'type': context['current_type'],
+            'total': context['total_results'],
+            'page': results_page.number if results_page else 1,
+            'num_pages': results_page.paginator.num_pages if results_page else 0,
+            'type_counts': context['type_counts'],
+            'results': [
+                {
+                    'type': result['type'],
+                    'type_label': result['type_label'],
+                    'title': result['title'],
+                    'title_html': result['title_html'],
+                    'excerpt_html': result['excerpt_html'],
+                    'url': result['url'],
+                }
+                for result in context['results']
+            ],
+        })
+    
+    
 class ContactView(FormView):
     """
     Class-based view for the contact page with form handling.
@@ -1005,17 +1222,16 @@ Submitted: {timezone.now().strftime('%B %d, %Y at %I:%M %p UTC')}
 Source: Pulcova Contact Form
             """
             
-            # Send email to yourself
+            # Queue the email to yourself; run_outbox delivers it
             try:
-                send_mail(
+                enqueue_email(
                     subject=subject,
                     message=plain_message,
                     from_email=settings.DEFAULT_FROM_EMAIL,
                     recipient_list=['hello@pulcova.store'],  # Your email
                     html_message=html_message,
-                    fail_silently=False,
                 )
-                logger.info(f"Contact form email sent successfully for {email}")
+                logger.info(f"Contact form email queued for {email}")
             except BadHeaderError:
                 logger.error("Invalid header found in email.")
                 messages.error(self.request, 'Invalid email format. Please try again.')
@@ -1084,18 +1300,17 @@ Full Stack Software Engineer
 This is an automated confirmation. Please don't reply to this email.
                 """
                 
-                send_mail(
+                enqueue_email(
                     subject=confirmation_subject,
                     message=confirmation_plain,
                     from_email=settings.DEFAULT_FROM_EMAIL,
                     recipient_list=[email],
                     html_message=confirmation_html,
-                    fail_silently=True,  # Don't fail if confirmation email fails
                 )
-                logger.info(f"Confirmation email sent to {email}")
+                logger.info(f"Confirmation email queued for {email}")
             except Exception as e:
                 # Log error but don't fail the form submission
-                logger.warning(f"Failed to send confirmation email to {email}: {e}")
+                logger.warning(f"Failed to queue confirmation email to {email}: {e}")
             
             # Add success message
             messages.success(
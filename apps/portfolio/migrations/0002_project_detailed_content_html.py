@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='detailed_content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-18 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-order_priority', '-is_featured', '-created_at', 'published_at'], name='project_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['-order_priority', '-created_at', 'published_at'], name='project_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['project_type', '-is_featured', '-created_at', 'published_at'], name='project_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['start_date'], name='project_start_date_idx'),
+        ),
+    ]
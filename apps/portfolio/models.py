@@ -1,6 +1,6 @@
 from django.db import models
 from django.urls import reverse
-from apps.core.models import TimeStampedModel, SEOModel, PublishableModel
+from apps.core.models import TimeStampedModel, SEOModel, PublishableModel, RenderedContentModel
 
 
 class Technology(TimeStampedModel):
@@ -18,6 +18,11 @@ class Technology(TimeStampedModel):
     icon = models.ImageField(upload_to='tech_icons/', blank=True, null=True)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other')
     
+    # Filled in from the upload; see apps.core.images
+    icon_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    icon_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    icon_placeholder = models.TextField(blank=True, editable=False)
+    
     def __str__(self):
         return self.name
     
@@ -25,7 +30,7 @@ class Technology(TimeStampedModel):
         verbose_name_plural = "Technologies"
 
 
-class Project(TimeStampedModel, SEOModel, PublishableModel):
+class Project(TimeStampedModel, SEOModel, PublishableModel, RenderedContentModel):
     PROJECT_TYPE_CHOICES = [
         ('web', 'Web Application'),
         ('mobile', 'Mobile Application'),
@@ -49,6 +54,18 @@ class Project(TimeStampedModel, SEOModel, PublishableModel):
     order_priority = models.PositiveIntegerField(default=0)
     view_count = models.PositiveIntegerField(default=0)
     
+    # Filled in from the upload; see apps.core.images
+    featured_image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    featured_image_placeholder = models.TextField(blank=True, editable=False)
+    
+    # Rendered HTML, regenerated on save when detailed_content changes
+    detailed_content_html = models.TextField(blank=True, editable=False)
+    
+    rendered_fields = {
+        'detailed_content': 'linebreaks',
+    }
+    
     def __str__(self):
         return self.title
     
@@ -57,11 +74,39 @@ class Project(TimeStampedModel, SEOModel, PublishableModel):
     
     class Meta:
         ordering = ['-order_priority', '-created_at']
+        # See apps.blog.models.Article for how these are laid out
+        indexes = [
+            # Portfolio listing and project facets
+            models.Index(
+                fields=['-order_priority', '-is_featured', '-created_at', 'published_at'],
+                condition=models.Q(is_published=True), name='project_published_idx'
+            ),
+            # Featured projects on the home and portfolio pages
+            models.Index(
+                fields=['-order_priority', '-created_at', 'published_at'],
+                condition=models.Q(is_published=True, is_featured=True), name='project_featured_idx'
+            ),
+            # Related projects on the detail page
+            models.Index(
+                fields=['project_type', '-is_featured', '-created_at', 'published_at'],
+                condition=models.Q(is_published=True), name='project_type_idx'
+            ),
+            # ?year= ranges and the earliest project for the home page stats
+            models.Index(
+                fields=['start_date'],
+                condition=models.Q(is_published=True), name='project_start_date_idx'
+            ),
+        ]
 
 
 class GalleryImage(TimeStampedModel):
     image = models.ImageField(upload_to='projects/gallery/')
     alt_text = models.CharField(max_length=200, blank=True)
     
+    # Filled in from the upload; see apps.core.images
+    image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
+    
     def __str__(self):
         return f"Gallery Image {self.id}"
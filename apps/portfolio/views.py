@@ -1,17 +1,19 @@
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import TemplateView, ListView, DetailView
 from django.http import Http404
-from django.db import transaction
-from django.db.models import F
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from apps.core.cache import get_detail_payload
+from apps.core.pagination import CursorPaginationMixin
+from apps.core.timing import timed
+from apps.core.view_counters import record_view
 from .models import Project, Technology, GalleryImage
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class ProjectListView(ListView):
+class ProjectListView(CursorPaginationMixin, ListView):
     """List view for portfolio projects"""
     model = Project
     template_name = 'pages/portfolio.html'
@@ -45,7 +47,7 @@ class ProjectDetailView(DetailView):
     
     def get_object(self, queryset=None):
         """
-        Override get_object to add comprehensive error handling and view count increment.
+        Override get_object to add comprehensive error handling and record the view.
         """
         if queryset is None:
             queryset = self.get_queryset()
@@ -57,19 +59,17 @@ class ProjectDetailView(DetailView):
             raise Http404("Project not found")
         
         try:
-            # Get the project object
-            project = get_object_or_404(queryset, **{self.slug_field: slug})
+            # Get the project and its related content, from cache when possible
+            self.payload = get_detail_payload(
+                'project', slug,
+                lambda: self.build_payload(get_object_or_404(queryset, **{self.slug_field: slug}))
+            )
+            project = self.payload['project']
             
-            # Safely increment view count using atomic database operation
-            # This prevents race conditions when multiple users view simultaneously
+            # Buffer the view; counts are written back in batches so the
+            # request itself stays read-only
             try:
-                with transaction.atomic():
-                    Project.objects.filter(pk=project.pk).update(
-                        view_count=F('view_count') + 1
-                    )
-                    # Refresh the object to get updated view_count
-                    project.refresh_from_db(fields=['view_count'])
-                    
+                project.view_count = record_view(project, refresh=True)
             except Exception as e:
                 # Log the error but don't fail the request if view count update fails
                 logger.warning(f"Failed to increment view count for project {project.slug}: {e}")
@@ -89,11 +89,12 @@ class ProjectDetailView(DetailView):
         """
         context = super().get_context_data(**kwargs)
         project = self.object
+        payload = getattr(self, 'payload', None) or self.build_payload(project)
         
         try:
             # Handle tech stack with error handling
             try:
-                tech_stack = project.tech_stack.all().order_by('category', 'name')
+                tech_stack = payload['tech_stack']
                 # Group technologies by category for better template organization
                 tech_by_category = {}
                 for tech in tech_stack:
@@ -104,7 +105,7 @@ class ProjectDetailView(DetailView):
                 
                 context['tech_stack'] = tech_stack
                 context['tech_by_category'] = tech_by_category
-                context['has_tech_stack'] = tech_stack.exists()
+                context['has_tech_stack'] = bool(tech_stack)
                 
             except Exception as e:
                 logger.error(f"Error fetching tech stack for project {project.slug}: {e}")
@@ -114,10 +115,10 @@ class ProjectDetailView(DetailView):
             
             # Handle gallery images with error handling - filter out images without files
             try:
-                gallery_images = project.gallery_images.exclude(image='').filter(image__isnull=False).order_by('created_at')
+                gallery_images = payload['gallery_images']
                 context['gallery_images'] = gallery_images
-                context['has_gallery'] = gallery_images.exists()
-                context['gallery_count'] = gallery_images.count()
+                context['has_gallery'] = bool(gallery_images)
+                context['gallery_count'] = len(gallery_images)
                 
             except Exception as e:
                 logger.error(f"Error fetching gallery images for project {project.slug}: {e}")
@@ -162,21 +163,14 @@ class ProjectDetailView(DetailView):
             else:
                 context['duration_display'] = ""
             
-            # Handle featured image safely
-            context['has_featured_image'] = bool(project.featured_image and hasattr(project.featured_image, 'url'))
+            # Handle featured image safely; checks the stored name only, not storage
+            context['has_featured_image'] = bool(project.featured_image)
             
             # Get related projects (same type, excluding current project)
             try:
-                related_projects = Project.objects.filter(
-                    is_published=True,
-                    published_at__lte=timezone.now(),
-                    project_type=project.project_type
-                ).exclude(
-                    pk=project.pk
-                ).select_related().order_by('-is_featured', '-created_at')[:3]
-                
+                related_projects = payload['related_projects']
                 context['related_projects'] = related_projects
-                context['has_related_projects'] = related_projects.exists()
+                context['has_related_projects'] = bool(related_projects)
                 
             except Exception as e:
                 logger.error(f"Error fetching related projects for {project.slug}: {e}")
@@ -240,6 +234,38 @@ class ProjectDetailView(DetailView):
         
         return context
     
+    def build_payload(self, project):
+        """
+        Build the cacheable detail payload: the project with its prefetched
+        relations plus evaluated tech stack, gallery and related projects.
+        """
+        with timed('project.tech_stack'):
+            tech_stack = sorted(
+                project.tech_stack.all(),
+                key=lambda tech: (tech.category, tech.name)
+            )
+        with timed('project.gallery'):
+            gallery_images = sorted(
+                (image for image in project.gallery_images.all() if image.image),
+                key=lambda image: image.created_at
+            )
+        with timed('project.related'):
+            related_projects = list(
+                Project.objects.filter(
+                    is_published=True,
+                    published_at__lte=timezone.now(),
+                    project_type=project.project_type
+                ).exclude(
+                    pk=project.pk
+                ).order_by('-is_featured', '-created_at')[:3]
+            )
+        return {
+            'project': project,
+            'tech_stack': tech_stack,
+            'gallery_images': gallery_images,
+            'related_projects': related_projects,
+        }
+    
     def handle_no_permission(self):
         """
         Handle cases where user doesn't have permission to view the project.
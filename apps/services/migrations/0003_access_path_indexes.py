@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2026-10-18 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_published', True)), fields=['-order_priority', '-created_at', 'published_at'], name='service_listed_idx'),
+        ),
+    ]
@@ -12,11 +12,24 @@ class Service(TimeStampedModel, PublishableModel):
     is_active = models.BooleanField(default=True)
     order_priority = models.PositiveIntegerField(default=0)
     
+    # Filled in from the upload; see apps.core.images
+    icon_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    icon_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    icon_placeholder = models.TextField(blank=True, editable=False)
+    
     def __str__(self):
         return self.title
     
     class Meta:
         ordering = ['-order_priority', '-created_at']
+        # See apps.blog.models.Article for how these are laid out
+        indexes = [
+            # Services listing and featured services
+            models.Index(
+                fields=['-order_priority', '-created_at', 'published_at'],
+                condition=models.Q(is_active=True, is_published=True), name='service_listed_idx'
+            ),
+        ]
 
 
 class ServiceInquiry(TimeStampedModel):
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-18 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('solutions', '0002_solution_canonical_url_solution_is_published_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solution',
+            name='problem_description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='root_cause_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='solution',
+            name='solution_content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-18 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_access_path_indexes'),
+        ('portfolio', '0004_access_path_indexes'),
+        ('solutions', '0003_solution_rendered_html'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='codesnippet',
+            index=models.Index(fields=['-created_at'], name='codesnippet_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solution',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-helpful_count', '-created_at', 'published_at'], name='solution_helpful_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solution',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', 'published_at'], name='solution_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solution',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-view_count', '-created_at', 'published_at'], name='solution_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solution',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['technology', '-helpful_count', '-created_at', 'published_at'], name='solution_technology_idx'),
+        ),
+    ]
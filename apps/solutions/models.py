@@ -1,11 +1,11 @@
 from django.db import models
 from django.urls import reverse
-from apps.core.models import TimeStampedModel, SEOModel, PublishableModel
+from apps.core.models import TimeStampedModel, SEOModel, PublishableModel, RenderedContentModel
 from apps.portfolio.models import Technology
 from apps.blog.models import Tag
 
 
-class Solution(TimeStampedModel, SEOModel, PublishableModel):
+class Solution(TimeStampedModel, SEOModel, PublishableModel, RenderedContentModel):
     DIFFICULTY_CHOICES = [
         ('beginner', 'Beginner'),
         ('intermediate', 'Intermediate'),
@@ -22,6 +22,17 @@ class Solution(TimeStampedModel, SEOModel, PublishableModel):
     view_count = models.PositiveIntegerField(default=0)
     related_solutions = models.ManyToManyField('self', blank=True, symmetrical=False)
     
+    # Rendered HTML, regenerated on save when the Markdown source changes
+    problem_description_html = models.TextField(blank=True, editable=False)
+    root_cause_html = models.TextField(blank=True, editable=False)
+    solution_content_html = models.TextField(blank=True, editable=False)
+    
+    rendered_fields = {
+        'problem_description': 'markdown',
+        'root_cause': 'markdown',
+        'solution_content': 'markdown',
+    }
+    
     def __str__(self):
         return self.title
     
@@ -30,6 +41,28 @@ class Solution(TimeStampedModel, SEOModel, PublishableModel):
     
     class Meta:
         ordering = ['-helpful_count', '-created_at']
+        # See apps.blog.models.Article for how these are laid out
+        indexes = [
+            # Solutions listing (most helpful), featured solutions and solution facets
+            models.Index(
+                fields=['-helpful_count', '-created_at', 'published_at'],
+                condition=models.Q(is_published=True), name='solution_helpful_idx'
+            ),
+            # ?sort=newest and ?sort=popular
+            models.Index(
+                fields=['-created_at', 'published_at'],
+                condition=models.Q(is_published=True), name='solution_newest_idx'
+            ),
+            models.Index(
+                fields=['-view_count', '-created_at', 'published_at'],
+                condition=models.Q(is_published=True), name='solution_popular_idx'
+            ),
+            # Related solutions on the detail page
+            models.Index(
+                fields=['technology', '-helpful_count', '-created_at', 'published_at'],
+                condition=models.Q(is_published=True), name='solution_technology_idx'
+            ),
+        ]
 
 
 class CodeSnippet(TimeStampedModel):
@@ -41,3 +74,9 @@ class CodeSnippet(TimeStampedModel):
     
     def __str__(self):
         return self.title
+    
+    class Meta:
+        indexes = [
+            # Recent snippets on the solutions page
+            models.Index(fields=['-created_at'], name='codesnippet_created_idx'),
+        ]
@@ -1,29 +1,15 @@
-import markdown as md_module
 from django import template
 from django.template.defaultfilters import stringfilter
 from django.utils.safestring import mark_safe
 
+from apps.core.markdown_renderer import render_markdown
+
 register = template.Library()
 
 @register.filter
 @stringfilter
 def markdown(value):
     """
-    Converts markdown to HTML
+    Converts markdown to HTML using the shared, cached renderer
     """
-    md = md_module.Markdown(
-        extensions=[
-            'markdown.extensions.fenced_code',
-            'markdown.extensions.codehilite',
-            'markdown.extensions.tables',
-            'markdown.extensions.toc',
-            'markdown.extensions.nl2br',
-        ],
-        extension_configs={
-            'markdown.extensions.codehilite': {
-                'css_class': 'highlight',
-                'use_pygments': True,
-            }
-        }
-    )
-    return mark_safe(md.convert(value))
\ No newline at end of file
+    return mark_safe(render_markdown(value))
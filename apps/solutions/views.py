@@ -2,14 +2,15 @@ from django.shortcuts import get_object_or_404
 from django.views.generic import DetailView, ListView
 from django.http import Http404
 from django.core.exceptions import ValidationError
-from django.db.models import F
 from django.utils import timezone
-from django.db import transaction
 import logging
 
 from .models import Solution, CodeSnippet
 from apps.portfolio.models import Technology
 from apps.blog.models import Tag
+from apps.core.cache import get_detail_payload
+from apps.core.timing import timed
+from apps.core.view_counters import record_view
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ class SolutionDetailView(DetailView):
     
     def get_object(self, queryset=None):
         """
-        Override get_object to add comprehensive error handling and view count increment.
+        Override get_object to add comprehensive error handling and record the view.
         """
         if queryset is None:
             queryset = self.get_queryset()
@@ -57,19 +58,17 @@ class SolutionDetailView(DetailView):
                 logger.warning(f"Invalid slug format: {slug}")
                 raise Http404("Invalid solution identifier")
             
-            # Get the solution object
-            solution = get_object_or_404(queryset, **{self.slug_field: slug})
+            # Get the solution and its related content, from cache when possible
+            self.payload = get_detail_payload(
+                'solution', slug,
+                lambda: self.build_payload(get_object_or_404(queryset, **{self.slug_field: slug}))
+            )
+            solution = self.payload['solution']
             
-            # Safely increment view count using atomic database operation
-            # This prevents race conditions when multiple users view simultaneously
+            # Buffer the view; counts are written back in batches so the
+            # request itself stays read-only
             try:
-                with transaction.atomic():
-                    Solution.objects.filter(pk=solution.pk).update(
-                        view_count=F('view_count') + 1
-                    )
-                    # Refresh the object to get updated view_count
-                    solution.refresh_from_db(fields=['view_count'])
-                    
+                solution.view_count = record_view(solution, refresh=True)
             except Exception as e:
                 # Log the error but don't fail the request if view count update fails
                 logger.warning(f"Failed to increment view count for solution {solution.slug}: {e}")
@@ -92,11 +91,12 @@ class SolutionDetailView(DetailView):
         """
         context = super().get_context_data(**kwargs)
         solution = self.object
+        payload = getattr(self, 'payload', None) or self.build_payload(solution)
         
         try:
             # Handle technology information safely
             try:
-                context['technology_info'] = self.get_technology_info(solution)
+                context['technology_info'] = payload['technology_info']
                 context['has_technology'] = solution.technology is not None
             except Exception as e:
                 logger.error(f"Error fetching technology info for solution {solution.slug}: {e}")
@@ -105,10 +105,10 @@ class SolutionDetailView(DetailView):
             
             # Handle related solutions with error handling
             try:
-                related_solutions = self.get_related_solutions(solution)
+                related_solutions = payload['related_solutions']
                 context['related_solutions'] = related_solutions
-                context['has_related_solutions'] = related_solutions.exists()
-                context['related_solutions_count'] = related_solutions.count()
+                context['has_related_solutions'] = bool(related_solutions)
+                context['related_solutions_count'] = len(related_solutions)
             except Exception as e:
                 logger.error(f"Error fetching related solutions for solution {solution.slug}: {e}")
                 context['related_solutions'] = Solution.objects.none()
@@ -117,10 +117,10 @@ class SolutionDetailView(DetailView):
             
             # Handle code snippets related to this solution's technology
             try:
-                code_snippets = self.get_related_code_snippets(solution)
+                code_snippets = payload['code_snippets']
                 context['code_snippets'] = code_snippets
-                context['has_code_snippets'] = code_snippets.exists()
-                context['code_snippets_count'] = code_snippets.count()
+                context['has_code_snippets'] = bool(code_snippets)
+                context['code_snippets_count'] = len(code_snippets)
             except Exception as e:
                 logger.error(f"Error fetching code snippets for solution {solution.slug}: {e}")
                 context['code_snippets'] = CodeSnippet.objects.none()
@@ -151,6 +151,24 @@ class SolutionDetailView(DetailView):
             
         return context
     
+    def build_payload(self, solution):
+        """
+        Build the cacheable detail payload: the solution with its prefetched
+        relations plus evaluated related solutions and code snippets.
+        """
+        with timed('solution.technology'):
+            technology_info = self.get_technology_info(solution)
+        with timed('solution.related'):
+            related_solutions = list(self.get_related_solutions(solution))
+        with timed('solution.snippets'):
+            code_snippets = list(self.get_related_code_snippets(solution))
+        return {
+            'solution': solution,
+            'technology_info': technology_info,
+            'related_solutions': related_solutions,
+            'code_snippets': code_snippets,
+        }
+    
     def get_technology_info(self, solution):
         """
         Safely get technology information with null handling.
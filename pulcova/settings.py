@@ -58,19 +58,25 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.PrecompressedStaticMiddleware',
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
+    'apps.core.middleware.AnonymousPageCacheMiddleware',
+    'apps.core.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'pulcova.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'apps.core.query_budget.TimedDjangoTemplates',  # Django templates, with render timing
         'DIRS': [ BASE_DIR / 'templates' ],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -104,6 +110,64 @@ if DATABASE_URL:
     # You can add other database configurations here (PostgreSQL, MySQL, etc.)
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND selects 'locmem' (default), 'file' or 'db'.
+# The database backend needs `python manage.py createcachetable`.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pulcova',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', 'pulcova_cache'),
+    },
+}
+
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': int(os.getenv('CACHE_TIMEOUT', '300')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '5000')),
+        },
+    }
+}
+
+# How long detail page payloads stay cached (seconds); saves invalidate them sooner
+DETAIL_CACHE_TIMEOUT = int(os.getenv('DETAIL_CACHE_TIMEOUT', '3600'))
+
+# Full-page cache for anonymous visitors, purged by surrogate keys on content changes
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'True').lower() == 'true'
+# Pages showing scheduled content expire sooner: when the next published_at goes live
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', '600'))
+PAGE_CACHE_VIEWS = [
+    'pages:home',
+    'pages:portfolio',
+    'pages:blog',
+    'pages:blog_more',
+    'pages:solutions',
+    'pages:solutions_more',
+    'pages:services',
+    'pages:search',
+    'pages:search_api',
+    'legal:privacy',
+    'legal:terms',
+    'legal:cookies',
+    'legal:gdpr',
+    'legal:refund',
+]
+# Query parameters that change page content; anything else (utm_*, etc.) is ignored
+PAGE_CACHE_QUERY_PARAMS = ['type', 'tech', 'year', 'search', 'q', 'page', 'cursor', 'sort', 'difficulty', 'category', 'tag', 'price', 'format']
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -169,3 +233,144 @@ SECURE_HSTS_PRELOAD = os.getenv('SECURE_HSTS_PRELOAD', 'False').lower() == 'true
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+# View counters
+# Detail page views are buffered and written back in batches.
+# 'memory' buffers per process, 'cache' shares one buffer through the default cache.
+VIEW_COUNTER_BUFFER = os.getenv('VIEW_COUNTER_BUFFER', 'memory')
+VIEW_COUNTER_FLUSH_INTERVAL = int(os.getenv('VIEW_COUNTER_FLUSH_INTERVAL', '30'))  # seconds
+VIEW_COUNTER_FLUSH_THRESHOLD = int(os.getenv('VIEW_COUNTER_FLUSH_THRESHOLD', '100'))  # pending views
+
+# Markdown rendering
+# Size of the per-process LRU of rendered HTML, and an optional cache alias
+# (e.g. 'default') shared between workers.
+MARKDOWN_CACHE_SIZE = int(os.getenv('MARKDOWN_CACHE_SIZE', '256'))
+MARKDOWN_SHARED_CACHE = os.getenv('MARKDOWN_SHARED_CACHE', '') or None
+
+# Listing pagination
+# Keyset (cursor) paging instead of numbered pages; totals are cached per
+# filter set and recounted in the background once they are older than
+# PAGINATION_COUNT_STALE_AFTER seconds.
+CURSOR_PAGINATION = os.getenv('CURSOR_PAGINATION', 'False').lower() == 'true'
+PAGINATION_COUNT_TIMEOUT = int(os.getenv('PAGINATION_COUNT_TIMEOUT', '3600'))
+PAGINATION_COUNT_STALE_AFTER = int(os.getenv('PAGINATION_COUNT_STALE_AFTER', '60'))
+
+# Full-text search
+# SQLite uses FTS5 tables, PostgreSQL tsvector columns; see apps/core/search.py.
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', '500'))
+SEARCH_TEXT_CONFIG = os.getenv('SEARCH_TEXT_CONFIG', 'english')  # PostgreSQL text search configuration
+
+# Email outbox
+# Transactional email is queued in the database and sent by `manage.py run_outbox`.
+# Failed sends are retried after EMAIL_OUTBOX_RETRY_DELAY seconds, doubling each attempt.
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', '60'))  # seconds
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_MAX_RETRY_DELAY', '3600'))  # seconds
+EMAIL_OUTBOX_CLAIM_TIMEOUT = int(os.getenv('EMAIL_OUTBOX_CLAIM_TIMEOUT', '600'))  # seconds before a stuck batch is retried
+EMAIL_OUTBOX_POLL_INTERVAL = int(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', '5'))  # seconds
+
+# Newsletter campaigns
+# `manage.py send_newsletter_campaign <id>` sends over NEWSLETTER_SEND_CONNECTIONS SMTP
+# connections at up to NEWSLETTER_SEND_RATE messages per second (0 = unlimited),
+# checkpointing every NEWSLETTER_SEND_BATCH_SIZE subscribers.
+NEWSLETTER_DIGEST_SIZE = int(os.getenv('NEWSLETTER_DIGEST_SIZE', '5'))
+NEWSLETTER_SEND_CONNECTIONS = int(os.getenv('NEWSLETTER_SEND_CONNECTIONS', '4'))
+NEWSLETTER_SEND_RATE = float(os.getenv('NEWSLETTER_SEND_RATE', '10'))
+NEWSLETTER_SEND_BATCH_SIZE = int(os.getenv('NEWSLETTER_SEND_BATCH_SIZE', '200'))
+
+# Responsive images
+# Uploaded images get WebP and JPEG (PNG when transparent) copies at these widths;
+# see apps/core/images.py and the {% responsive_image %} tag.
+IMAGE_VARIANT_WIDTHS = [int(width) for width in os.getenv('IMAGE_VARIANT_WIDTHS', '320,640,960,1280,1920').split(',')]
+IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', '80'))
+
+# Static build
+# With STATIC_BUILD=True, `manage.py build_static` downloads STATIC_VENDOR_ASSETS into
+# static/vendor/, builds the purged Tailwind stylesheet and runs collectstatic, which writes content-hashed names and .gz/.br
+# copies (.br needs the brotli package). STATIC_SERVE serves STATIC_ROOT from Django with
+# immutable caching; turn it off when a web server or CDN serves /static/.
+STATIC_BUILD = os.getenv('STATIC_BUILD', 'False').lower() == 'true'
+STATIC_SERVE = os.getenv('STATIC_SERVE', str(STATIC_BUILD)).lower() == 'true'
+TAILWIND_OUTPUT = os.getenv('TAILWIND_OUTPUT', 'css/tailwind.css')  # written by `manage.py build_tailwind`
+STATIC_VENDOR_ASSETS = {
+    'flowbite/flowbite.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/flowbite/2.2.0/flowbite.min.css',
+    'flowbite/flowbite.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/flowbite/2.2.0/flowbite.min.js',
+}
+
+if STATIC_BUILD:
+    STORAGES = {
+        'default': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        },
+        'staticfiles': {
+            'BACKEND': 'apps.core.staticfiles.PrecompressedManifestStaticFilesStorage',
+        },
+    }
+
+# Query budgets
+# QueryBudgetMiddleware counts queries, DB time and template time per request and compares
+# them with the view's budget (QUERY_BUDGET_DEFAULT updated with its QUERY_BUDGETS entry,
+# keyed by URL name). Overruns are logged, or raised with QUERY_BUDGET_ACTION=raise.
+# apps.core.testing.QueryBudgetTestMixin asserts the query counts in tests.
+QUERY_BUDGET_ENABLED = os.getenv('QUERY_BUDGET_ENABLED', 'True').lower() == 'true'
+QUERY_BUDGET_ACTION = os.getenv('QUERY_BUDGET_ACTION', 'log')  # 'log' or 'raise'
+QUERY_BUDGET_DEFAULT = {
+    'queries': 20,
+    'db_ms': 250,
+    'template_ms': 250,
+}
+QUERY_BUDGETS = {
+    'pages:home': {'queries': 10},
+    'pages:about': {'queries': 2},
+    'pages:portfolio': {'queries': 12},
+    'pages:blog': {'queries': 10},
+    'pages:blog_more': {'queries': 6},
+    'pages:solutions': {'queries': 12},
+    'pages:solutions_more': {'queries': 6},
+    'pages:services': {'queries': 12},
+    'pages:contact': {'queries': 2},
+    'pages:search': {'queries': 10},
+    'pages:search_api': {'queries': 10},
+}
+
+# Server-Timing
+# Adds a Server-Timing header with DB, template, view and middleware time plus the sections
+# timed with apps.core.timing.timed, for the browser's network panel. Needs QUERY_BUDGET_ENABLED.
+# 'all' sends it on every response, 'staff' only to logged-in staff, 'off' never.
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'all' if DEBUG else 'staff')
+
+# Metrics
+# Prometheus metrics at /metrics: request latency per URL name, query counts, cache hit
+# ratios, outbox depth and pending view counts. Scrapers authenticate with
+# "Authorization: Bearer <METRICS_TOKEN>" or come from one of METRICS_ALLOWED_IPS
+# (addresses or networks, empty by default). The allowlist checks REMOTE_ADDR: behind a
+# reverse proxy on the same host every request comes from 127.0.0.1, so list only
+# addresses the proxy can't be reached through. With several worker processes set
+# METRICS_DIR to a directory the workers share, emptied when the server starts, so every
+# scrape sees all of them.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', '5'))  # seconds between metrics file writes
+
+# Request profiling
+# Staff add ?profile=sample (or cprofile) to a URL; anyone else needs an X-Profile header
+# from "manage.py profile_token". Profiles are kept as collapsed-stack files in PROFILING_DIR
+# (the newest PROFILING_KEEP) and shown as flame graphs under Core > Request profiles in the admin.
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'True').lower() == 'true'
+PROFILING_DIR = os.getenv('PROFILING_DIR', str(BASE_DIR / 'profiles'))
+PROFILING_DEFAULT_MODE = os.getenv('PROFILING_DEFAULT_MODE', 'sample')  # 'sample' or 'cprofile'
+PROFILING_SAMPLE_INTERVAL = float(os.getenv('PROFILING_SAMPLE_INTERVAL', '0.001'))  # seconds
+PROFILING_TOKEN_MAX_AGE = int(os.getenv('PROFILING_TOKEN_MAX_AGE', '3600'))  # seconds
+PROFILING_KEEP = int(os.getenv('PROFILING_KEEP', '50'))
+
+# Slow-query log
+# Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their parameters, the view
+# that ran them and (for reads) the query plan, in a ring buffer of SLOW_QUERY_LOG_SIZE
+# entries in the default cache. Browse it at /admin/slow-queries/.
+SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', 'True').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = int(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', '200'))
+SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'True').lower() == 'true'
@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.contrib.sitemaps.views import sitemap
 from django.conf import settings
 from django.conf.urls.static import static
+from apps.core.views import metrics, slow_query_log
 from .sitemaps import StaticViewSitemap, ArticleSitemap, ProjectSitemap
 
 sitemaps = {
@@ -28,6 +29,7 @@ sitemaps = {
 }
 
 urlpatterns = [
+    path('admin/slow-queries/', admin.site.admin_view(slow_query_log), name='slow_query_log'),
     path('admin/', admin.site.urls),
     path('', include('apps.pages.urls')),
     path('blog/', include('apps.blog.urls')),
@@ -36,6 +38,7 @@ urlpatterns = [
     path('legal/', include('apps.legal.urls')),
     path('chatbot/', include('apps.chatbot.urls')),
     path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('metrics', metrics, name='metrics'),
 ]
 
 # Serve media files during development